@@ -0,0 +1,81 @@
+"""Benchmark of `mstrio.utils.encoder.FastEncoder` against `Encoder`, which
+serializes data frames with `DataFrame.to_json` and base64-encodes the whole
+JSON document at once.
+
+Data frames are generated locally, so no connection to the I-Server is
+required. Tall and wide frames with a mix of float, integer, datetime and
+string columns (object, `str` and `string[pyarrow]`) are encoded by default.
+Run from the repository root with mstrio and pyarrow importable:
+
+    PYTHONPATH=. python benchmarks/encoder_benchmark.py --rows 1000000 --cols 8
+"""
+import argparse
+import base64
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from mstrio.utils.encoder import Encoder, FastEncoder
+
+
+def make_frame(rows, cols, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def labels():
+        return pd.Series(rng.integers(0, 1000, rows)).map("Element {}".format)
+
+    makers = (lambda: rng.random(rows) * 1000,
+              lambda: rng.integers(0, 10 ** 6, rows),
+              lambda: labels().to_numpy(dtype=object),
+              lambda: pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 10 ** 8, rows), unit="s"),
+              lambda: labels().astype("str"),
+              lambda: labels().astype("string[pyarrow]"))
+    df = pd.DataFrame({"col{}".format(i): makers[i % len(makers)]() for i in range(cols)})
+    # frames concatenated from batches hold Arrow-backed strings in chunked arrays
+    half = rows // 2
+    return pd.concat([df[:half], df[half:]])
+
+
+def run(encoder_class, df, dataset_type):
+    start = time.perf_counter()
+    encoded = encoder_class(data_frame=df, dataset_type=dataset_type).encode
+    return encoded, time.perf_counter() - start
+
+
+def same(left, right):
+    # the fast encoder keeps the full precision of floats, the default one rounds them to 10 decimal digits
+    if isinstance(left, float) or isinstance(right, float):
+        return math.isclose(left, right, rel_tol=1e-9, abs_tol=1e-10)
+    if isinstance(left, list):
+        return len(left) == len(right) and all(same(a, b) for a, b in zip(left, right))
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(same(left[key], right[key]) for key in left)
+    return left == right
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--rows", type=int, default=500000, help="rows of the tall frame")
+    arg_parser.add_argument("--cols", type=int, default=8, help="columns of the tall frame")
+    arg_parser.add_argument("--wide-rows", type=int, default=5000, help="rows of the wide frame")
+    arg_parser.add_argument("--wide-cols", type=int, default=400, help="columns of the wide frame")
+    arg_parser.add_argument("--type", choices=("multi", "single"), default="multi",
+                            help="dataset type: 'multi' for the values orientation, 'single' for records")
+    args = arg_parser.parse_args()
+
+    frames = (("tall", make_frame(args.rows, args.cols)), ("wide", make_frame(args.wide_rows, args.wide_cols)))
+    for shape, df in frames:
+        results = {}
+        for name, encoder_class in (("default", Encoder), ("fast", FastEncoder)):
+            encoded, elapsed = run(encoder_class, df, args.type)
+            results[name] = encoded
+            print("{:<5} {:>6} x {:<4} {:<8} {:>8.2f} s {:>12,.0f} cells/s".format(
+                shape, df.shape[0], df.shape[1], name, elapsed, df.size / elapsed))
+        assert same(json.loads(base64.b64decode(results["default"])), json.loads(base64.b64decode(results["fast"])))
+
+
+if __name__ == "__main__":
+    main()
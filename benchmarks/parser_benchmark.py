@@ -0,0 +1,168 @@
+"""Benchmark of `mstrio.utils.parser.Parser` against the previous parser
+implementation, which grew the attribute array with `np.vstack` and mapped
+attribute element indexes with `np.vectorize`.
+
+Cube responses are generated locally, so no connection to the I-Server is
+required. Run from the repository root with mstrio importable:
+
+    PYTHONPATH=. python benchmarks/parser_benchmark.py --rows 1000000 --chunk 50000
+
+Reports with subtotals are parsed with `--subtotals`, e.g. multi-form
+attributes with subtotal elements in the rows:
+
+    PYTHONPATH=. python benchmarks/parser_benchmark.py --forms 3 --cardinality 100000 --subtotals 0.05
+
+Pages of a real cube or report stored with `Cube.to_archive()` or
+`Report.to_archive()` are replayed with `--archive`:
+
+    PYTHONPATH=. python benchmarks/parser_benchmark.py --archive extract.zip
+"""
+import argparse
+import random
+import time
+from functools import partial
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from mstrio.utils.archive import iter_pages, read_manifest
+from mstrio.utils.parser import Parser
+
+
+class LegacyParser:
+    """Previous implementation of `Parser`, kept here as the baseline."""
+
+    AF_COL_SEP = "@"
+
+    def __init__(self, response, parse_cube=True):
+        self.parse_cube = parse_cube
+        self._metric_values_raw = []
+        grid = response["definition"]["grid"]
+        self._metric_col_names = [i['name'] for i in grid["columns"][-1]["elements"]] if grid["columns"] else []
+        self._attribute_names = [i["name"] for i in grid["rows"]]
+        self._attribute_elem_form_names = [[e["name"] for e in i["forms"]] for i in grid["rows"]]
+        self._attribute_col_names = []
+        for attr, forms in zip(self._attribute_names, self._attribute_elem_form_names):
+            if len(forms) == 1:
+                self._attribute_col_names.append(attr)
+            else:
+                self._attribute_col_names.extend(attr + self.AF_COL_SEP + form for form in forms)
+        self.total_rows = response["data"]["paging"]["total"]
+        self._mapped_attributes = np.zeros((0, len(self._attribute_col_names)), dtype=object)
+
+    def parse(self, response):
+        if self.total_rows > 0:
+            if self._attribute_names:
+                self._mapped_attributes = np.vstack((self._mapped_attributes, self.__map_attributes(response)))
+            if self._metric_col_names:
+                self._metric_values_raw.extend(response["data"]["metricValues"]["raw"])
+
+    def __map_attributes(self, response):
+        label_map = self.__create_attribute_element_map(response)
+        row_index = [list(chain.from_iterable([[r for _ in f] for r, f in zip(row, self._attribute_elem_form_names)]))
+                     for row in response["data"]["headers"]["rows"]]
+        row_index_array = np.array(row_index)
+        _, columns = row_index_array.shape
+        vfunc = np.vectorize(lambda attribute_indexes, columns: label_map[columns][attribute_indexes])
+        return vfunc(row_index_array, range(columns))
+
+    def __create_attribute_element_map(self, response):
+        rows = response["definition"]["grid"]["rows"]
+        form_values = [[el['formValues'] for el in row['elements']] for row in rows]
+        if not self.parse_cube:
+            for i, attr in enumerate(self._attribute_elem_form_names):
+                required_len = len(attr)
+                for r in form_values[i]:
+                    if len(r) < required_len:
+                        r.extend(r * (required_len - 1))
+        final_list = []
+        for attr in form_values:
+            final_list.extend(np.array(attr).reshape(len(attr), len(attr[0])).transpose().tolist())
+        return final_list
+
+    @property
+    def dataframe(self):
+        attribute_df = pd.DataFrame(data=self._mapped_attributes, columns=self._attribute_col_names)
+        metric_df = pd.DataFrame(data=self._metric_values_raw, columns=self._metric_col_names)
+        return pd.concat([attribute_df, metric_df], axis=1)
+
+
+def make_responses(rows, chunk, attributes, forms, cardinality, metrics, subtotals=0.0, seed=0):
+    """Generate cube instance responses split into pages of `chunk` rows.
+
+    If `subtotals` is positive, every attribute has a subtotal element with a
+    single form value, like in report instances, and the given share of rows
+    refers to it.
+    """
+    rnd = random.Random(seed)
+    grid_rows = [{"name": "Attribute %d" % a,
+                  "forms": [{"name": "Form %d" % f} for f in range(forms)]} for a in range(attributes)]
+    grid_columns = [{"elements": [{"name": "Metric %d" % m} for m in range(metrics)]}]
+
+    responses = []
+    for offset in range(0, rows, chunk):
+        n = min(chunk, rows - offset)
+        headers = [[cardinality if subtotals and rnd.random() < subtotals else rnd.randrange(cardinality)
+                    for _ in range(attributes)] for _ in range(n)]
+        raw = [[rnd.random() * 1000 for _ in range(metrics)] for _ in range(n)]
+        rows_def = [dict(row, elements=[{"formValues": ["A%d E%d F%d" % (a, e, f) for f in range(forms)]}
+                                        for e in range(cardinality)]
+                         + ([{"formValues": ["Total"]}] if subtotals else []))
+                    for a, row in enumerate(grid_rows)]
+        responses.append({"definition": {"grid": {"rows": rows_def, "columns": grid_columns}},
+                          "data": {"paging": {"total": rows, "current": n, "offset": offset, "limit": chunk},
+                                   "headers": {"rows": headers},
+                                   "metricValues": {"raw": raw}}})
+    return responses
+
+
+def run(parser_class, responses, parse_cube=True):
+    start = time.perf_counter()
+    parser = parser_class(response=responses[0], parse_cube=parse_cube)
+    for response in responses:
+        parser.parse(response)
+    df = parser.dataframe
+    return df, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arg_parser.add_argument("--rows", type=int, default=500000)
+    arg_parser.add_argument("--chunk", type=int, default=50000)
+    arg_parser.add_argument("--attributes", type=int, default=4)
+    arg_parser.add_argument("--forms", type=int, default=1)
+    arg_parser.add_argument("--cardinality", type=int, default=1000)
+    arg_parser.add_argument("--metrics", type=int, default=4)
+    arg_parser.add_argument("--subtotals", type=float, default=0.0,
+                            help="share of rows referring to subtotals; if positive, responses are parsed as reports")
+    arg_parser.add_argument("--archive", help="page archive to replay instead of generated responses")
+    args = arg_parser.parse_args()
+
+    if args.archive:
+        manifest = read_manifest(args.archive)
+        parse_cube, args.rows = manifest["type"] == "cube", manifest["total"]
+    else:
+        parse_cube = not args.subtotals
+
+    results = {}
+    parsers = (("legacy", LegacyParser), ("current", Parser), ("categorical", partial(Parser, categorical=True)))
+    for name, parser_class in parsers:
+        # the legacy parser extends form values of subtotals in place, so every parser gets fresh responses
+        if args.archive:
+            responses = list(iter_pages(args.archive))
+        else:
+            responses = make_responses(args.rows, args.chunk, args.attributes, args.forms, args.cardinality,
+                                       args.metrics, args.subtotals)
+        df, elapsed = run(parser_class, responses, parse_cube=parse_cube)
+        results[name] = df
+        print("{:<12} {:>10.2f} s {:>14,.0f} rows/s".format(name, elapsed, args.rows / elapsed))
+
+    # the legacy parser does not type columns by the data types of attribute forms
+    legacy = results["legacy"].astype(results["current"].dtypes.to_dict())
+    pd.testing.assert_frame_equal(legacy, results["current"], check_dtype=False)
+    pd.testing.assert_frame_equal(results["current"], results["categorical"].astype(object), check_dtype=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,14 @@ ds.add_table(name="Stores", data_frame=stores_df, update_policy="update")
 ds.add_table(name="Sales", data_frame=sales_df, update_policy="upsert")
 ds.update()
 
+# tables which do not fit in memory can be added as a path of a CSV or Parquet file or as an iterable of
+# DataFrames; they are read in batches while uploading, and the model is built from the `schema` if it is given,
+# otherwise from the first batch
+ds = Dataset(connection=connection, name="Sales History")
+ds.add_table(name="Sales", data_frame="sales_history.csv", update_policy="add",
+             schema={"store_id": "int64", "category": "object", "sales": "float64"})
+ds.create(chunk_bytes=20 * 1024 ** 2)
+
 # finally it is possible to certify an existing dataset
 ds.certify()
 
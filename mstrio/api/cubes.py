@@ -1,5 +1,6 @@
 from packaging import version
 
+from mstrio.utils.async_engine import get_json
 from mstrio.utils.helper import response_handler
 
 
@@ -132,10 +133,14 @@ def cube_instance_id(connection, cube_id, instance_id, offset=0, limit=5000):
     return response
 
 
-def cube_instance_id_coroutine(future_session, connection, cube_id, instance_id, offset=0, limit=5000):
+def cube_instance_id_coroutine(future_session, connection, cube_id, instance_id, offset=0, limit=5000, hooks=None):
     """Get the future of a previously created instance for a specific cube
     asynchroneously, using the in-memory instance created by cube_instance().
 
+    Args:
+        hooks (dict, optional): Request hooks, e.g. a 'response' hook run in
+            the worker thread once the response is received.
+
     Returns:
         Complete Future object.
     """
@@ -144,10 +149,26 @@ def cube_instance_id_coroutine(future_session, connection, cube_id, instance_id,
         params['fields'] = '-data.metricValues.extras,-data.metricValues.formatted'
 
     url = connection.base_url + '/api/v2/cubes/' + cube_id + '/instances/' + instance_id
-    future = future_session.get(url, params=params)
+    future = future_session.get(url, params=params, hooks=hooks)
     return future
 
 
+async def cube_instance_id_async(async_session, connection, cube_id, instance_id, offset=0, limit=5000):
+    """Get the results of a previously created instance for a specific cube
+    asynchronously with the `aiohttp` session of the "async" engine, using the
+    in-memory instance created by cube_instance().
+
+    Returns:
+        JSON content of the response.
+    """
+    params = {'offset': offset, 'limit': limit}
+    if version.parse(connection.iserver_version) >= version.parse("11.2.0200"):
+        params['fields'] = '-data.metricValues.extras,-data.metricValues.formatted'
+
+    url = connection.base_url + '/api/v2/cubes/' + cube_id + '/instances/' + instance_id
+    return await get_json(async_session, connection, url, params, "Error getting cube contents.")
+
+
 def cube_single_attribute_elements(connection, cube_id, attribute_id, offset=0, limit=200000):
     """Get elements of a specific attribute of a specific cube.
 
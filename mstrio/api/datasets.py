@@ -157,11 +157,35 @@ def upload(connection, dataset_id, session_id, body):
     response = connection.session.put(url=connection.base_url + '/api/datasets/' + dataset_id + '/uploadSessions/' +
                                       session_id,
                                       json=body)
-    if not response.ok:
+    if not response.ok and response.status_code != 413:   # chunks too large are split by `Dataset.update()`
         response_handler(response, "Error uploading data.", throw_error=False)
     return response
 
 
+def upload_coroutine(future_session, connection, dataset_id, session_id, body):
+    """Upload data to a multi-table dataset asynchronously, in a worker thread
+    of `future_session`.
+
+    Args:
+        future_session (object): `FuturesSession` sharing the session of the
+            connection.
+        connection (object): MicroStrategy connection object returned by
+            `connection.Connection()`.
+        dataset_id (str): Identifier of a pre-existing dataset. Used when
+            updating a pre-existing dataset.
+        session_id (str): Identifer of the server session used for collecting
+            uploaded data.
+        body (dict): JSON-formatted payload containing the body of the request.
+
+    Returns:
+        Future of the HTTP response object returned by the MicroStrategy REST
+        server.
+    """
+    url = connection.base_url + '/api/datasets/' + dataset_id + '/uploadSessions/' + session_id
+    future = future_session.put(url, json=body)
+    return future
+
+
 def publish(connection, dataset_id, session_id):
     """Publish a multi-table dataset.
 
@@ -1,5 +1,6 @@
 from packaging import version
 
+from mstrio.utils.async_engine import get_json
 from mstrio.utils.helper import response_handler
 
 
@@ -91,10 +92,14 @@ def report_instance_id(connection, report_id, instance_id, offset=0, limit=5000)
     return response
 
 
-def report_instance_id_coroutine(future_session, connection, report_id, instance_id, offset=0, limit=5000):
+def report_instance_id_coroutine(future_session, connection, report_id, instance_id, offset=0, limit=5000, hooks=None):
     """Get the future of a previously created instance for a specific report
     asynchroneously, using the in-memory instance created by report_instance().
 
+    Args:
+        hooks (dict, optional): Request hooks, e.g. a 'response' hook run in
+            the worker thread once the response is received.
+
     Returns:
         Complete Future object.
     """
@@ -103,10 +108,26 @@ def report_instance_id_coroutine(future_session, connection, report_id, instance
         params['fields'] = '-data.metricValues.extras,-data.metricValues.formatted'
 
     url = connection.base_url + '/api/v2/reports/' + report_id + '/instances/' + instance_id
-    future = future_session.get(url, params=params)
+    future = future_session.get(url, params=params, hooks=hooks)
     return future
 
 
+async def report_instance_id_async(async_session, connection, report_id, instance_id, offset=0, limit=5000):
+    """Get the results of a previously created instance for a specific report
+    asynchronously with the `aiohttp` session of the "async" engine, using the
+    in-memory instance created by report_instance().
+
+    Returns:
+        JSON content of the response.
+    """
+    params = {'offset': offset, 'limit': limit}
+    if version.parse(connection.iserver_version) >= version.parse("11.2.0200"):
+        params['fields'] = '-data.metricValues.extras,-data.metricValues.formatted'
+
+    url = connection.base_url + '/api/v2/reports/' + report_id + '/instances/' + instance_id
+    return await get_json(async_session, connection, url, params, "Error getting report contents.")
+
+
 def report_single_attribute_elements(connection, report_id, attribute_id, offset=0, limit=200000):
     """Get elements of a specific attribute of a specific report.
 
@@ -9,6 +9,22 @@ options.display.max_rows = max(250, options.display.max_rows)  # Sets number of
 options.display.max_colwidth = max(100, options.display.max_colwidth)
 print_warnings = 'always'   # Warning setting, one of "error", "ignore", "always", "default", "module", or "once"
 save_responses = False      # Used to save REST API responses for mocking
+async_concurrency = 32      # Maximum number of concurrent requests sent by the "async" download engine
+page_size_min = 1000        # Lower bound of the number of rows per page chosen by the adaptive page size controller
+page_size_max = 500000      # Upper bound of the number of rows per page chosen by the adaptive page size controller
+page_target_bytes = 10000000    # Desired size of a single page in bytes
+page_target_seconds = 10    # Desired latency of a single page request in seconds
+page_retries = 3            # Maximum number of retries of a page request after transient errors
+page_retry_backoff = 1      # Delay before the first retry of a page request in seconds, doubled with every retry
+cache_dir = None            # Directory of the local cache of cube extracts, caching is disabled if None
+cache_max_size = 5 * 1024 ** 3  # Maximum size of the local cache of cube extracts in bytes
+attr_elements_cache_size = 10000000   # Maximum number of attribute elements cached in memory by the process
+memory_budget = None        # Maximum estimated size of an extracted data frame in bytes, unlimited if None
+memory_budget_policy = 'raise'  # If the estimate exceeds the budget: 'raise' MemoryError or 'spill' to disk
+upload_prefetch = 2         # Number of chunks encoded ahead of the upload of dataset data
+upload_batch_rows = 100000  # Number of rows read at once from CSV and Parquet files uploaded to datasets
+checkpoint_dir = None       # Directory of checkpoints of cube downloads, checkpointing is disabled if None
+spill_dir = None            # Directory of memory-mapped columns of spilled data frames, system temp dir if None
 
 
 def custom_formatwarning(msg, category, *args, **kwargs):
@@ -1,17 +1,26 @@
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from math import ceil
 from operator import itemgetter
 
+import numpy as np
+import pandas as pd
 import requests
-from requests_futures.sessions import FuturesSession
+from pandas.api.types import union_categoricals
 from tqdm.auto import tqdm
 
 import mstrio.config as config
 import mstrio.utils.helper as helper
 from mstrio.api import cubes, datasets
 from mstrio.dataset import Dataset
+from mstrio.utils.archive import PageArchive
+from mstrio.utils.cache import ResultCache
+from mstrio.utils.checkpoint import Checkpoint
+from mstrio.utils.chunks import ChunkFetcher
+from mstrio.utils.elements import get_attr_elements
+from mstrio.utils.expression import Expression
 from mstrio.utils.filter import Filter
-from mstrio.utils.helper import fallback_on_timeout
-from mstrio.utils.parser import Parser
+from mstrio.utils.parser import ArrowParser, Parser, check_memory_budget
 
 CUBE_STATES = {
     0: "DssCubeReserved",
@@ -50,6 +59,8 @@ class Cube:
             progress bar.
     """
 
+    __ENGINES = ['threads', 'async']
+
     def __init__(self, connection, cube_id, instance_id=None, parallel=True, progress_bar=True):
         """Initialize an instance of a cube.
 
@@ -77,6 +88,7 @@ class Cube:
 
         self._size_limit = 10000000      # this sets desired chunk size in bytes
         self._initial_limit = 1000    # initial limit for the cube_instance request
+        self.__preview_instance = None   # (instance id, filter body) of the last `head()` call
         self._table_definition = {}
         self._dataframe = None
         self._dataframes = []
@@ -89,9 +101,11 @@ class Cube:
 
         self.__filter = Filter(attributes=self.attributes,
                                metrics=self.metrics,
-                               row_count_metrics=self._row_counts)
+                               row_count_metrics=self._row_counts,
+                               attribute_forms=self._attribute_forms)
 
-    def to_dataframe(self, limit=None, multi_df=False):
+    def to_dataframe(self, limit=None, multi_df=False, categorical=False, engine='threads', partition_by=None,
+                     partitions=None, columns=None, downcast=False, resume=False):
         """Extract contents of a cube into a Pandas `DataFrame`.
 
         Args:
@@ -103,61 +117,137 @@ class Cube:
                 reduce the total time required to extract the entire dataset.
             multi_df (bool, optional): If True, return a list of data frames
                 resembling the table structure of the cube. If False (default),
-                returns one data frame.
+                returns one data frame. Data frames of the tables are built
+                directly from the fetched columns, so the data frame of all
+                columns (`Cube.dataframe`) is not set, unless the cube is
+                partitioned or cached.
+            categorical (bool, optional): If True, attribute columns are
+                returned as `pandas.Categorical` built directly from the
+                attribute elements, which reduces memory usage and parsing time
+                for attributes with repetitive values. False by default.
+            engine (str, optional): Download engine used to fetch the chunks.
+                'threads' (default) uses a pool of threads limited by the
+                `parallel` setting. 'async' schedules all requests on an
+                `asyncio` event loop with up to `config.async_concurrency`
+                concurrent requests; it requires the optional `aiohttp` package
+                and can be used from inside a running event loop (e.g. Jupyter).
+            partition_by (str, optional): Identifier of an attribute selected
+                in the filter. If given, elements of the attribute are split
+                into `partitions` view filter partitions, which are extracted
+                concurrently, each from its own instance of the cube, so that
+                the work is spread across the intelligence server(s). Rows are
+                ordered by partition.
+            partitions (int, optional): Number of partitions if `partition_by`
+                is given. By default, it is the optimal number of threads.
+                At most the optimal number of threads extract partitions at
+                once.
+            columns (list, optional): Names of attributes, attribute forms
+                (e.g. 'Attribute@Form') and metrics to extract. Only these
+                objects are requested from the server, regardless of the
+                attributes and metrics selected with `apply_filters()`; the
+                filter on attribute elements still applies. An attribute with
+                a single selected form is returned in a column named after the
+                attribute. By default (None) all selected columns are extracted.
+            downcast (bool, optional): If True, numeric metric columns are
+                stored as 32-bit numbers (`float32`, or `int32` if the values
+                fit). False by default.
+            resume (bool, optional): If True, resume an interrupted extraction
+                from the checkpoint in `config.checkpoint_dir`: the chunks
+                stored there are parsed and only the missing rows are fetched
+                from the same instance of the cube, as long as it still exists.
+                False by default.
+
+        Columns are typed by the data types of the cube's attribute forms and
+        metrics, e.g. date forms become `datetime64` and numeric ID forms
+        `int64` columns.
+
+        If `config.cache_dir` is set, the extracted data frame is stored in a
+        local cache and a repeated extraction with the same filter reads it
+        from the cache as long as the cube has not been modified (requires the
+        optional `pyarrow` package).
+
+        If `config.memory_budget` is set and the size of the data frame
+        estimated after the first page exceeds it, a `MemoryError` is raised
+        before the download, or if `config.memory_budget_policy` is 'spill',
+        columns are written to memory-mapped files in `config.spill_dir` and
+        attribute columns are categorical.
+
+        Failed page requests are retried with a backoff after transient errors,
+        up to `config.page_retries` times. If `config.checkpoint_dir` is set,
+        fetched chunks are stored there until the extraction completes, so an
+        extraction which failed anyway can be resumed with `resume=True`.
+        Extractions partitioned with `partition_by` are not checkpointed.
 
         Returns:
             Pandas Data Frame containing the cube contents
         """
-        if limit:
-            self._initial_limit = limit
-
-        if self.instance_id is None:
-            res = self.__initialize_cube(self._initial_limit)
-        else:
-            # try to get first chunk from already initialized instance of cube,
-            # if not possible, initialize new instance
+        if engine not in self.__ENGINES:
+            helper.exception_handler("Engine has to be one of {}.".format(self.__ENGINES), ValueError)
+        if columns is not None:
+            if multi_df:
+                helper.exception_handler("Parameters `columns` and `multi_df` cannot be used together.", ValueError)
+            # select the columns for this extraction only, an existing instance would not respect the selection
+            selected = self.__filter.attr_selected, self.__filter.metr_selected, self.instance_id
+            self.__filter._select_columns(columns)
+            self.instance_id = None
             try:
-                res = self.__get_chunk(instance_id=self.instance_id, offset=0, limit=self._initial_limit)
-            except requests.HTTPError:
-                res = self.__initialize_cube(self._initial_limit)
+                return self.to_dataframe(limit=limit, categorical=categorical, engine=engine,
+                                         partition_by=partition_by, partitions=partitions, downcast=downcast,
+                                         resume=resume)
+            finally:
+                self.__filter.attr_selected, self.__filter.metr_selected, self.instance_id = selected
+        helper.validate_param_value('partitions', partitions, int, min_val=1, special_values=[None])
+        if partition_by is not None and partition_by not in [attr[0] for attr in self.__filter.attr_selected]:
+            helper.exception_handler("Attribute to partition by has to be selected in the filter.", ValueError)
+        if resume and (config.checkpoint_dir is None or partition_by is not None):
+            helper.exception_handler("Resuming requires `config.checkpoint_dir` and no `partition_by`.", ValueError)
+
+        cache = ResultCache() if config.cache_dir else None
+        cache_key = self.__cache_key(categorical, downcast) if cache else None
+        self._dataframe = cache.get(cache_key) if cache else None
 
-        # Gets the pagination totals and instance_id from the response object
-        _instance = res.json()
-        _instance_id = _instance['instanceId']
-        _pagination = _instance['data']['paging']
-
-        # initialize parser and process first response
-        p = Parser(response=res.json(), parse_cube=True)
-        p.parse(response=_instance)
-
-        # If there are more rows to fetch, fetch them
-        if _pagination['current'] != _pagination['total']:
-            if not limit:
-                limit = max(1000, int((self._initial_limit * self._size_limit) / len(res.content)))
-            # Count the number of additional iterations
-            it_total = int((_pagination['total'] - self._initial_limit) / limit) + \
-                ((_pagination['total'] - self._initial_limit) % limit != 0)
-
-            if self.parallel and it_total > 1:
-                threads = helper.get_parallel_number(it_total)
-                with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
-                                    session=self._connection.session) as session:
-                    fetch_pbar = tqdm(desc="Downloading", total=it_total + 1, disable=(not self.progress_bar))
-                    future = self.__fetch_chunks_future(session, _pagination, _instance_id, limit)
-                    fetch_pbar.update()
-                    for i, f in enumerate(future, start=1):
-                        response = f.result()
-                        if not response.ok:
-                            helper.response_handler(response, "Error getting cube contents.")
-                        fetch_pbar.update()
-                        fetch_pbar.set_postfix(rows=str(min(self._initial_limit + i * limit, _pagination['total'])))
-                        p.parse(response.json())
-                    fetch_pbar.close()
+        if self._dataframe is None:
+            if partition_by is not None:
+                self._dataframe = self.__extract_partitions(partition_by, partitions, limit, categorical, downcast)
             else:
-                self.__fetch_chunks(p, _pagination, it_total, _instance_id, limit)
+                checkpoint = None
+                if config.checkpoint_dir:
+                    checkpoint = Checkpoint(config.checkpoint_dir, self.__checkpoint_key())
+                    if not resume:
+                        checkpoint.clear()
+                res = self.__get_first_chunk(limit, checkpoint.instance_id if resume else None)
+                _instance = res.json()
+                # chunks stored for another instance are discarded
+                fetched = checkpoint.start(_instance['instanceId']) if checkpoint else []
+
+                # initialize parser and process all responses
+                p = Parser(response=_instance, parse_cube=True, categorical=categorical, downcast=downcast)
+                # estimate the size of the data frame only if it is limited
+                spill_dir = None
+                if config.memory_budget is not None:
+                    spill_dir = check_memory_budget(p.estimate_size(_instance))
+                if spill_dir is not None:
+                    p = Parser(response=_instance, parse_cube=True, spill_dir=spill_dir, downcast=downcast)
+                for offset, rows in fetched:
+                    p.parse(response=checkpoint.load(offset, rows))
+                for response in self.__fetch_responses(_instance, len(res.content), limit, engine, ordered=False,
+                                                       fetched=fetched):
+                    if checkpoint and response is not _instance:
+                        checkpoint.save(response)
+                    p.parse(response=response)
+                if checkpoint:
+                    checkpoint.remove()
+
+                if multi_df and not cache:
+                    # build data frames of the tables directly, without the data frame of all columns
+                    self._dataframes = p.to_dataframes(self.__multitable_definition())
+                    return self._dataframes
+
+                # return parsed data as a data frame
+                self._dataframe = p.dataframe
+            if cache:
+                cache.put(cache_key, self._dataframe)
 
-        # return parsed data as a data frame
-        self._dataframe = p.dataframe
         # split dataframe to dataframes matching tables in Cube
         if multi_df:
             # split dataframe to dataframes matching tables in Cube
@@ -167,25 +257,295 @@ class Cube:
         else:
             return self._dataframe
 
-    def __fetch_chunks_future(self, future_session, pagination, instance_id, limit):
-        # Fetch add'l rows from this object instance from the intelligence server
-        return [cubes.cube_instance_id_coroutine(future_session, connection=self._connection,
-                                                 cube_id=self._cube_id,
-                                                 instance_id=instance_id,
-                                                 offset=_offset,
-                                                 limit=limit)
-                for _offset in range(self._initial_limit, pagination['total'], limit)]
-
-    def __fetch_chunks(self, parser, pagination, it_total, instance_id, limit):
-
-        # Fetch add'l rows from this object instance from the intelligence server
-        with tqdm(desc="Downloading", total=it_total + 1, disable=(not self.progress_bar)) as fetch_pbar:
-            fetch_pbar.update()
-            for _offset in range(self._initial_limit, pagination['total'], limit):
-                response = self.__get_chunk(instance_id=instance_id, offset=_offset, limit=limit)
-                fetch_pbar.update()
-                fetch_pbar.set_postfix(rows=str(min(_offset + limit, pagination['total'])))
-                parser.parse(response=response.json())
+    def head(self, n=5, categorical=False):
+        """Extract the first `n` rows of the cube into a Pandas `DataFrame`.
+
+        Only a single page of `n` rows is requested and parsed, which makes it
+        a cheap preview of large cubes. The instance of the cube is kept, so
+        the next extraction with the same filter reuses it instead of
+        initializing a new one.
+
+        Args:
+            n (int, optional): Number of rows to extract. Defaults to 5.
+            categorical (bool, optional): If True, attribute columns are
+                returned as `pandas.Categorical`. False by default.
+
+        Returns:
+            Pandas Data Frame containing the first `n` rows of the cube.
+        """
+        helper.validate_param_value('n', n, int, min_val=1)
+        _instance = self.__get_preview_chunk(n).json()
+
+        p = Parser(response=_instance, parse_cube=True, categorical=categorical)
+        return p.chunk_to_dataframe(response=_instance)
+
+    def estimate_size(self, categorical=False):
+        """Estimate the memory footprint in bytes of the data frame returned
+        by `to_dataframe()` with the current filter.
+
+        The estimate is based on the total number of rows and on the first
+        page of the cube, which is fetched with a single request. The
+        instance of the cube is kept for the next extraction, like in `head()`.
+
+        Args:
+            categorical (bool, optional): If True, estimate the size with
+                attribute columns returned as `pandas.Categorical`.
+
+        Returns:
+            Estimated size of the data frame in bytes.
+        """
+        _instance = self.__get_preview_chunk(self._initial_limit).json()
+        return Parser(response=_instance, parse_cube=True, categorical=categorical).estimate_size(_instance)
+
+    def to_arrow(self, limit=None):
+        """Extract contents of a cube into a `pyarrow.Table`.
+
+        Every fetched chunk is appended to the table as a record batch.
+        Attribute columns are dictionary-encoded and metric columns are
+        numeric. Requires the optional `pyarrow` package.
+
+        Args:
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk.
+
+        Returns:
+            `pyarrow.Table` containing the cube contents.
+        """
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        p = ArrowParser(response=_instance, parse_cube=True)
+        for response in self.__fetch_responses(_instance, len(res.content), limit, ordered=False):
+            p.parse(response=response)
+        return p.table
+
+    def to_parquet(self, path, limit=None):
+        """Write contents of a cube into a Parquet file.
+
+        Every chunk is written as a row group as soon as it is fetched, while
+        the download of the following chunks continues, so the whole cube is
+        never held in memory. Integer metric columns are stored as integers
+        unless a chunk brings non-integer values. Requires the optional
+        `pyarrow` package.
+
+        Args:
+            path (str): Path of the Parquet file to write.
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk
+                and thus per row group.
+        """
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        p = ArrowParser(response=_instance, parse_cube=True)
+        responses = self.__fetch_responses(_instance, len(res.content), limit)
+        p.write_parquet(path, (p.chunk_to_table(response=response) for response in responses))
+
+    def to_archive(self, path, limit=None, engine='threads'):
+        """Write raw pages of the cube into a compressed archive file.
+
+        Pages are stored as they are returned by the intelligence server, as
+        soon as they are fetched, together with the definition of the
+        instance. Nothing is parsed, so the download is not slowed down by
+        parsing, and the data frame can be rebuilt later, e.g. on another
+        machine, with `mstrio.utils.archive.read_archive()`.
+
+        Args:
+            path (str): Path of the archive file to write.
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk.
+            engine (str, optional): Download engine used to fetch the chunks,
+                'threads' (default) or 'async', like in `to_dataframe()`.
+        """
+        if engine not in self.__ENGINES:
+            helper.exception_handler("Engine has to be one of {}.".format(self.__ENGINES), ValueError)
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        with PageArchive(path, 'cube', self._cube_id) as archive:
+            for response in self.__fetch_responses(_instance, len(res.content), limit, engine, ordered=False):
+                archive.write(response)
+
+    def iter_chunks(self, limit=None, categorical=False):
+        """Iterate over contents of a cube, one Pandas `DataFrame` per fetched
+        chunk.
+
+        Only a bounded number of chunks is kept in memory at any time, so
+        cubes larger than the available memory can be processed chunk by
+        chunk. The index of each data frame reflects the position of its rows
+        within the whole cube.
+
+        Args:
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk.
+            categorical (bool, optional): If True, attribute columns are
+                returned as `pandas.Categorical`. False by default.
+
+        Yields:
+            Pandas Data Frame containing one chunk of the cube contents.
+        """
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        p = Parser(response=_instance, parse_cube=True, categorical=categorical)
+        for response in self.__fetch_responses(_instance, len(res.content), limit):
+            yield p.chunk_to_dataframe(response=response)
+
+    def __cache_key(self, categorical, downcast):
+        # The key identifies the data visible to the user: filter of the cube and its version. The cube info is
+        # refreshed to get the current modification time.
+        self.__info()
+        return ResultCache.key(base_url=self._connection.base_url,
+                               project_id=self._connection.project_id,
+                               user_id=self._connection.user_id,
+                               cube_id=self._cube_id,
+                               filter_body=self.__filter._filter_body(),
+                               last_modified=self._last_modified,
+                               categorical=categorical,
+                               downcast=downcast)
+
+    def __checkpoint_key(self):
+        # Chunks of the cube fetched with the current filter, regardless of how they are parsed
+        return ResultCache.key(base_url=self._connection.base_url,
+                               project_id=self._connection.project_id,
+                               user_id=self._connection.user_id,
+                               cube_id=self._cube_id,
+                               filter_body=self.__filter._filter_body())
+
+    def __get_first_chunk(self, limit, instance_id=None):
+        if limit:
+            self._initial_limit = limit
+        instance_id = instance_id or self.__reusable_instance_id()
+        self.__preview_instance = None
+        return self.__get_instance_chunk(instance_id, self._initial_limit)
+
+    def __get_preview_chunk(self, limit):
+        # Get the first rows of a reusable instance or of a new one, which is kept for the next extraction
+        res = self.__get_instance_chunk(self.__reusable_instance_id(), limit)
+        if self.instance_id is None:
+            self.__preview_instance = res.json()['instanceId'], self.__filter._filter_body()
+        return res
+
+    def __reusable_instance_id(self):
+        # Instance given by the user, or of the last preview if it was created with the current filter
+        if self.instance_id is None and self.__preview_instance is not None:
+            preview_id, preview_body = self.__preview_instance
+            if preview_body == self.__filter._filter_body():
+                return preview_id
+        return self.instance_id
+
+    def __get_instance_chunk(self, instance_id, limit):
+        if instance_id is None:
+            return self.__initialize_cube(limit)
+        # try to get first chunk from already initialized instance of cube,
+        # if not possible, initialize new instance
+        try:
+            return self.__get_chunk(instance_id=instance_id, offset=0, limit=limit)
+        except requests.HTTPError:
+            return self.__initialize_cube(limit)
+
+    def __fetch_responses(self, instance, content_size, limit, engine='threads', ordered=True, fetched=None):
+        # Yield JSON content of the first chunk and of all add'l chunks of the cube instance, except of the `fetched`
+        # (offset, rows) chunks. Chunks are yielded in order of offsets if `ordered`, otherwise in order of completion
+        # (always for the 'async' engine)
+        return self.__fetcher().fetch(instance, content_size, limit, engine, ordered, fetched)
+
+    def __fetcher(self):
+        return ChunkFetcher(self._connection,
+                            get_chunk=self.__get_chunk,
+                            get_chunk_future=partial(cubes.cube_instance_id_coroutine, connection=self._connection,
+                                                     cube_id=self._cube_id),
+                            get_chunk_async=partial(cubes.cube_instance_id_async, connection=self._connection,
+                                                    cube_id=self._cube_id),
+                            error_msg="Error getting cube contents.",
+                            initial_limit=self._initial_limit,
+                            size_limit=self._size_limit,
+                            parallel=self.parallel,
+                            progress_bar=self.progress_bar)
+
+    def __extract_partitions(self, attribute_id, partitions, limit, categorical, downcast):
+        # Split elements of the attribute into view filter partitions, extract every partition from its own instance
+        # of the cube concurrently and concatenate the results. Without elements, a single instance is extracted with
+        # the filter of the cube, so that the result has the columns of the cube.
+        elements = [element['id'] for element in
+                    self.__get_attr_elements([self.__attribute(attribute_id)])[0]['elements']]
+        partitions = min(partitions or helper.get_parallel_number(len(elements)), max(1, len(elements)))
+        size = ceil(len(elements) / partitions) if elements else 1
+        bodies = [self.__partition_body(attribute_id, elements[i:i + size]) for i in range(0, len(elements), size)]
+        bodies = bodies or [self.__filter._filter_body()]
+        if limit:
+            self._initial_limit = limit
+
+        with ThreadPoolExecutor(max_workers=helper.get_parallel_number(len(bodies))) as executor:
+            with tqdm(desc="Downloading", total=0, unit="rows", disable=(not self.progress_bar)) as fetch_pbar:
+                futures = [executor.submit(self.__extract_partition, body, limit, categorical, downcast, fetch_pbar)
+                           for body in bodies]
+                dataframes = [future.result() for future in futures]
+        return self.__concat_partitions(dataframes)
+
+    def __extract_partition(self, body, limit, categorical, downcast, fetch_pbar):
+        # Create an instance for a single partition and fetch its rows sequentially
+        response = cubes.cube_instance(connection=self._connection,
+                                       cube_id=self._cube_id,
+                                       body=body,
+                                       offset=0,
+                                       limit=self._initial_limit)
+        _instance = response.json()
+        _pagination = _instance['data']['paging']
+        fetch_pbar.total += _pagination['total']
+        fetch_pbar.update(_pagination['current'])
+
+        p = Parser(response=_instance, parse_cube=True, categorical=categorical, downcast=downcast)
+        p.parse(response=_instance)
+        if _pagination['current'] != _pagination['total']:
+            fetcher = self.__fetcher()
+            pages = fetcher.pages(_pagination['total'], len(response.content), limit)
+            for chunk in fetcher.fetch_pages(pages, _instance['instanceId'], fetch_pbar):
+                p.parse(response=chunk)
+        return p.dataframe
+
+    def __partition_body(self, attribute_id, elements):
+        body = self.__filter._filter_body()
+        partition = {"operator": "In",
+                     "operands": [{"type": "attribute", "id": attribute_id},
+                                  {"type": "elements", "elements": [{"id": element} for element in elements]}]}
+        body["viewFilter"] = {"operator": "And", "operands": [body["viewFilter"], partition]} \
+            if body.get("viewFilter") else partition
+        return body
+
+    def __attribute(self, attribute_id):
+        return next(attr for attr in self.attributes if attr['id'] == attribute_id)
+
+    @staticmethod
+    def __concat_partitions(dataframes):
+        # concatenate positionally, as column names are not guaranteed to be unique, and merge the categories of
+        # categorical columns, so that they stay categorical
+        if not dataframes:
+            return pd.DataFrame()
+        non_empty = [df for df in dataframes if len(df)] or dataframes[:1]
+        n_rows = sum(len(df) for df in non_empty)
+        columns = {}
+        for i in range(len(non_empty[0].columns)):
+            values = [df.iloc[:, i].values for df in non_empty]
+            if all(isinstance(v, pd.Categorical) for v in values):
+                if len({v.categories.dtype for v in values}) > 1:
+                    # categories of different types (e.g. integers in one partition and strings in another) are
+                    # merged as objects
+                    values = [v.rename_categories(v.categories.astype(object)) for v in values]
+                columns[i] = union_categoricals(values)
+            else:
+                columns[i] = np.concatenate(values)
+        df = pd.DataFrame(columns, index=pd.RangeIndex(n_rows))
+        df.columns = non_empty[0].columns
+        return df
 
     def __initialize_cube(self, limit):
         inst_pbar = tqdm(desc='Initializing an instance of a cube. Please wait...',
@@ -195,7 +555,7 @@ class Cube:
                                        cube_id=self._cube_id,
                                        body=self.__filter._filter_body(),
                                        offset=0,
-                                       limit=self._initial_limit)
+                                       limit=limit)
         inst_pbar.close()
         return response
 
@@ -256,11 +616,37 @@ class Cube:
         attribute elements to be retrieved."""
 
         self.__filter._clear()
+        self.__filter.expression = None
 
         # once again remove Row Count metrics
         metrics_ids = [metric_id['id'] for metric_id in self.metrics]
         self.__filter._select(metrics_ids)
 
+    def __getitem__(self, column):
+        """Return the column of the cube named `column`, e.g. 'Metric',
+        'Attribute' or 'Attribute@Form', to build expressions for `where()`."""
+        return self.__filter._column(column)
+
+    def where(self, expression):
+        """Filter rows of the cube on the I-Server with an expression of its
+        columns, e.g.
+        `cube.where((cube["Region"] == "East") & (cube["Revenue"] > 1e6))`.
+
+        Columns are compared with numbers or strings using `==`, `!=`, `<`,
+        `<=`, `>`, `>=`, `isin()` and `between()`, and comparisons are
+        combined with `&`, `|` and `~`. The expression is sent as a view
+        filter, combined with attribute elements selected by `apply_filters()`,
+        so filtered rows are never transferred.
+
+        Args:
+            expression (Expression or None): Expression of the rows to keep.
+                If None, previously set expression is removed.
+        """
+        if expression is not None and not isinstance(expression, Expression):
+            helper.exception_handler("Expression has to be built from columns of the cube, e.g. "
+                                     "cube['Metric'] > 0.", TypeError)
+        self.__filter.expression = expression
+
     def update(self, update_policy='upsert'):
         """Update single-table cube easily with the data frame stored in the
         Cube instance (cube.dataframe).
@@ -357,100 +743,24 @@ class Cube:
         full_attributes = _definition["definition"]["availableObjects"]["attributes"]
         full_metrics = _definition["definition"]["availableObjects"]["metrics"]
         self._attributes = [{'name': attr['name'], 'id': attr['id']} for attr in full_attributes]
+        self._attribute_forms = {attr['id']: [{'name': form['name'], 'id': form['id']}
+                                              for form in attr.get('forms', [])] for attr in full_attributes}
         self._metrics = [{'name': metr['name'], 'id': metr['id']} for metr in full_metrics]
 
         self._tables = self.__multitable_definition().keys()
         row_counts = ['Row Count - {}'.format(table_name) for table_name in self._tables]
         self._row_counts = list(filter(lambda x: x['name'] in row_counts, self.metrics))
 
-    def __get_attr_elements(self, limit=50000):
-        """Get elements of report attributes synchronously.
-
-        Implements GET /reports/<report_id>/attributes/<attribute_id>/elements.
-        """
-        def fetch_for_attribute(attribute):
-            @fallback_on_timeout()
-            def fetch_for_attribute_given_limit(limit):
-                response = cubes.cube_single_attribute_elements(connection=self._connection,
-                                                                cube_id=self._cube_id,
-                                                                attribute_id=attribute['id'],
-                                                                offset=0,
-                                                                limit=limit)
-                # Get total number of rows from headers.
-                total = int(response.headers['x-mstr-total-count'])
-                # Get attribute elements from the response.
-                elements = response.json()
-
-                # If total number of elements is bigger than the chunk size (limit), fetch them incrementally.
-                for _offset in range(limit, total, limit):
-                    response = cubes.cube_single_attribute_elements(connection=self._connection,
-                                                                    cube_id=self._cube_id,
-                                                                    attribute_id=attribute['id'],
-                                                                    offset=_offset,
-                                                                    limit=limit)
-                    elements.extend(response.json())
-
-                # Return attribute data.
-                return {"attribute_name": attribute['name'],
-                        "attribute_id": attribute['id'],
-                        "elements": elements}
-            return fetch_for_attribute_given_limit(limit)[0]
-
-        attr_elements = []
-        if self.attributes:
-            pbar = tqdm(self.attributes, desc="Loading attribute elements",
-                        leave=False, disable=(not self.progress_bar))
-            attr_elements = [fetch_for_attribute(attribute) for attribute in pbar]
-            pbar.close()
-
-        return attr_elements
-
-    def __get_attr_elements_async(self, limit=50000):
-        """Get attribute elements.
+    def __get_attr_elements(self, attributes=None, limit=50000):
+        """Get elements of cube attributes, all of them by default.
 
         Implements GET /cubes/<cube_id>/attributes/<attribute_id>/elements.
         """
-
-        attr_elements = []
-        if self.attributes:
-            threads = helper.get_parallel_number(len(self.attributes))
-            with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
-                                session=self._connection.session) as session:
-                # Fetch first chunk of attribute elements.
-                futures = self.__fetch_attribute_elements_chunks(session, limit)
-                pbar = tqdm(futures, desc="Loading attribute elements", leave=False, disable=(not self.progress_bar))
-                for i, future in enumerate(pbar):
-                    attr = self.attributes[i]
-                    response = future.result()
-                    if not response.ok:
-                        helper.response_handler(response, "Error getting attribute " + attr["name"] + " elements")
-                    elements = response.json()
-                    # Get total number of rows from headers.
-                    total = int(response.headers['x-mstr-total-count'])
-                    for _offset in range(limit, total, limit):
-                        response = cubes.cube_single_attribute_elements(connection=self._connection,
-                                                                        cube_id=self._cube_id,
-                                                                        attribute_id=attr["id"],
-                                                                        offset=_offset,
-                                                                        limit=limit)
-                        elements.extend(response.json())
-                    # Append attribute data to the list of attributes.
-                    attr_elements.append({"attribute_name": attr['name'],
-                                          "attribute_id": attr['id'],
-                                          "elements": elements})
-                pbar.close()
-
-            return attr_elements
-
-    def __fetch_attribute_elements_chunks(self, future_session, limit):
-        # Fetch add'l rows from this object instance from the intelligence server
-        return [cubes.cube_single_attribute_elements_coroutine(future_session,
-                                                               connection=self._connection,
-                                                               cube_id=self._cube_id,
-                                                               attribute_id=attribute['id'],
-                                                               offset=0,
-                                                               limit=limit)
-                for attribute in self.attributes]
+        coroutine = partial(cubes.cube_single_attribute_elements_coroutine, connection=self._connection,
+                            cube_id=self._cube_id)
+        return get_attr_elements(self._connection, self._cube_id, self._last_modified,
+                                 self.attributes if attributes is None else attributes, coroutine, limit=limit,
+                                 parallel=self.parallel, progress_bar=self.progress_bar)
 
     @property
     def name(self):
@@ -487,11 +797,7 @@ class Cube:
     @property
     def attr_elements(self):
         if not self._attr_elements:
-            if self.parallel is True:
-                # TODO: move the fallback inside the function to apply per-attribute, like with non-async version.
-                self._attr_elements = fallback_on_timeout()(self.__get_attr_elements_async)(50000)[0]
-            else:
-                self._attr_elements = self.__get_attr_elements()
+            self._attr_elements = self.__get_attr_elements()
             self.__filter.attr_elem_selected = self._attr_elements
         return self._attr_elements
 
@@ -1,12 +1,21 @@
+import itertools
+import warnings
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from math import ceil
+
 import pandas as pd
 from packaging import version
+from requests_futures.sessions import FuturesSession
 from tqdm.auto import tqdm
 
 import mstrio.config as config
 import mstrio.utils.helper as helper
 from mstrio.api import datasets
-from mstrio.utils.encoder import Encoder
+from mstrio.utils.batches import check_batch, open_batches
+from mstrio.utils.encoder import Encoder, FastEncoder
 from mstrio.utils.model import Model
+from mstrio.utils.paging import PageSizeController
 
 
 class Dataset:
@@ -33,9 +42,12 @@ class Dataset:
     """
 
     __VALID_POLICY = ['add', 'update', 'replace', 'upsert']
+    __ENCODERS = {'default': Encoder, 'fast': FastEncoder}
     __MAX_DESC_LEN = 250
+    __SAMPLE_ROWS = 1000    # rows encoded to estimate the encoded size of a row in the `chunk_bytes` mode
 
-    def __init__(self, connection, name=None, description=None, dataset_id=None, progress_bar=True, verbose=True):
+    def __init__(self, connection, name=None, description=None, dataset_id=None, progress_bar=True, verbose=True,
+                 encoder='default'):
         """Interface for creating, updating, and deleting MicroStrategy in-
         memory datasets. When creating a new dataset, provide a dataset name
         and an optional description. When updating a pre-existing dataset,
@@ -54,7 +66,13 @@ class Dataset:
                 progress bar.
             verbose: Setting to control the amount of feedback from
                 the I-Server.
+            encoder (str, optional): Encoder of the uploaded data. 'default'
+                serializes chunks with `DataFrame.to_json()`. 'fast' builds the
+                JSON column by column with Apache Arrow, which is faster and
+                uses less memory; it requires the optional `pyarrow` package.
         """
+        if encoder not in self.__ENCODERS:
+            helper.exception_handler("Encoder has to be one of {}.".format(list(self.__ENCODERS)), ValueError)
 
         if name is not None:
             self.__check_param_str(name, msg="Dataset name should be a string.")
@@ -82,21 +100,30 @@ class Dataset:
         self._session_id = None
         self._folder_id = None
         self.__upload_body = None
+        self.__encoder = self.__ENCODERS[encoder]
         self.verbose = verbose
 
         if dataset_id is not None:
             self.__check_param_str(dataset_id, "Dataset ID should be a string.")
             self.__load_definition()
 
-    def add_table(self, name, data_frame, update_policy, to_metric=None, to_attribute=None):
+    def add_table(self, name, data_frame, update_policy, to_metric=None, to_attribute=None, schema=None):
         """Add a `Pandas.DataFrame` to a collection of tables which are later
         used to populate the MicroStrategy dataset with data.
 
+        Tables which do not fit in memory can be added as an iterable of
+        DataFrames or as a path of a CSV or Parquet file. Their batches are
+        read only during the upload, see `update()`, so such a table can be
+        uploaded just once.
+
         Args:
             name (str): Logical name of the table that is visible to users of
                 the dataset in MicroStrategy.
-            data_frame (:obj:`pandas.DataFrame`): Pandas DataFrame to add or
-                update.
+            data_frame (:obj:`pandas.DataFrame`, iterable or str): Pandas
+                DataFrame to add or update, an iterable of DataFrames which are
+                batches of rows of the table, or a path of a CSV or Parquet
+                file ('.parquet' or '.pq' suffix) read in batches of
+                `config.upload_batch_rows` rows.
             update_policy (str): Update operation to perform. One of 'add'
                 (inserts new, unique rows), 'update' (updates data in existing
                 rows and columns), 'upsert' (updates existing data and inserts
@@ -113,17 +140,22 @@ class Dataset:
             to_attribute (optional, :obj:`list` of str): Logical opposite of
                 `to_metric`. Helpful for formatting an integer-based row
                 identifier as a primary key in the dataset.
+            schema (dict, optional): Mapping of column names to Pandas data
+                types of the table, e.g. `{"id": "int64", "name": "object"}`.
+                The dataset is modeled from the schema and the data is
+                restricted to its columns and cast to its types. By default,
+                the model is built from the DataFrame, the metadata of a
+                Parquet file or the first batch of the table.
         """
         update_policy = update_policy.lower()
         version_ok = version.parse(self._connection.iserver_version) >= version.parse("11.2.0300")
 
-        if not isinstance(data_frame, pd.DataFrame):
-            raise TypeError("`data_frame` parameter must be a valid `Pandas.DataFrame`.")
+        if update_policy not in self.__VALID_POLICY:
+            raise ValueError(f"Update policy must be one of {self.__VALID_POLICY}.")
+        data_frame, batches, rows = open_batches(data_frame, schema)
         if not helper.check_duplicated_column_names(data_frame):
             raise ValueError(
                 "`DataFrame` column names need to be unique for each table in the Dataset.")
-        if update_policy not in self.__VALID_POLICY:
-            raise ValueError(f"Update policy must be one of {self.__VALID_POLICY}.")
         if self._dataset_id is None and update_policy != "replace" and version_ok:
             raise ValueError(
                 "Update policy has to be 'replace' if a dataset is created or overwritten.")
@@ -131,7 +163,8 @@ class Dataset:
             raise ValueError(
                 "Column name(s) present in `to_attribute` also present in `to_metric`.")
 
-        table = {"table_name": name, "data_frame": data_frame, "update_policy": update_policy}
+        table = {"table_name": name, "data_frame": data_frame, "batches": batches, "rows": rows,
+                 "update_policy": update_policy}
 
         if to_attribute is not None:
             if any((col for col in to_attribute if col not in data_frame.columns)):
@@ -149,7 +182,8 @@ class Dataset:
 
         self._tables.append(table)
 
-    def create(self, folder_id=None, auto_upload=True, auto_publish=True, chunksize=100000):
+    def create(self, folder_id=None, auto_upload=True, auto_publish=True, chunksize=100000, parallel=False,
+               max_workers=None, chunk_bytes=None):
         """Creates a new dataset.
 
         Args:
@@ -165,6 +199,12 @@ class Dataset:
                 dataset, data has to be uploaded first.
             chunksize (int, optional): Number of rows to transmit to the
                 I-Server with each request when uploading.
+            parallel (bool, optional): If True, chunks are uploaded
+                concurrently, see `update()`. False by default.
+            max_workers (int, optional): Maximum number of concurrent upload
+                requests if `parallel`.
+            chunk_bytes (int, optional): Desired size of the encoded data of a
+                request in bytes, used instead of `chunksize`, see `update()`.
         """
         if auto_publish and not auto_upload:
             helper.exception_handler(
@@ -188,9 +228,10 @@ class Dataset:
             print("Created dataset '{}' with ID: '{}'.".format(*[self._name, self._dataset_id]))
 
         if auto_upload:
-            self.update(chunksize=chunksize, auto_publish=auto_publish)
+            self.update(chunksize=chunksize, auto_publish=auto_publish, parallel=parallel, max_workers=max_workers,
+                        chunk_bytes=chunk_bytes)
 
-    def update(self, chunksize=100000, auto_publish=True):
+    def update(self, chunksize=100000, auto_publish=True, parallel=False, max_workers=None, chunk_bytes=None):
         """Updates a dataset with new data.
 
         Args:
@@ -199,7 +240,35 @@ class Dataset:
             auto_publish: If True, automatically publishes the data used to
                 update the dataset definition to the dataset. If False, simply
                 updates the dataset but does not publish it.
+            parallel (bool, optional): If True, chunks of a table are uploaded
+                concurrently on the session of the connection, with at most
+                `max_workers` requests in flight. False by default.
+            max_workers (int, optional): Maximum number of concurrent upload
+                requests if `parallel`. By default, it is the optimal number of
+                threads.
+            chunk_bytes (int, optional): Desired size of the encoded data of a
+                request in bytes. If given, `chunksize` is ignored and the
+                number of rows of a chunk is derived from the encoded size of
+                a row, measured on a sample of the first rows of a table and
+                on every encoded chunk.
+
+        Chunks are encoded on a worker thread while the previous chunks are
+        uploaded, at most `config.upload_prefetch` chunks ahead of the upload.
+        Tables added as iterables of DataFrames or as files are read batch by
+        batch while they are uploaded, so only the rows of the chunks in
+        progress are held in memory.
+
+        A chunk rejected by the server as too large (413 response) is split
+        in halves, which are uploaded instead. Sequential uploads keep the
+        halves at adjacent indexes. If `parallel`, the chunks after it may be
+        in flight already, so the second half is uploaded with the next free
+        index and its rows follow the rows of those chunks in the dataset.
+
+        If an upload fails for another reason, the upload session is
+        cancelled and an error is raised.
         """
+        helper.validate_param_value('max_workers', max_workers, int, min_val=1, special_values=[None])
+        helper.validate_param_value('chunk_bytes', chunk_bytes, int, min_val=1, special_values=[None])
 
         # form request body and create a session for data uploads
         self.__form_upload_body()
@@ -213,49 +282,166 @@ class Dataset:
         # upload each table
         for ix, _table in enumerate(self._tables):
 
-            _df, _name = _table["data_frame"], _table["table_name"]
-
-            # break the data up into chunks using a generator
-            chunks = (_df[i:i + chunksize] for i in range(0, _df.shape[0], chunksize))
-
-            total = _df.shape[0]
-
-            # Count the number of iterations
-            it_total = int(total / chunksize) + (total % chunksize != 0)
-
-            pbar = tqdm(chunks, total=it_total, disable=(not self.progress_bar))
-            for index, chunk in enumerate(pbar):
-                pbar.set_description("Uploading {}/{}".format(ix + 1, len(self._tables)))
-
-                # base64 encode the data
-                encoder = Encoder(data_frame=chunk, dataset_type='multi')
-                b64_enc = encoder.encode
-
-                # form body of the request
-                body = {"tableName": _name,
-                        "index": index + 1,
-                        "data": b64_enc}
-
-                # make request to upload the data
-                response = datasets.upload(connection=self._connection,
-                                           dataset_id=self._dataset_id,
-                                           session_id=self._session_id,
-                                           body=body)
-
-                if not response.ok:
-                    # on error, cancel the previously uploaded data
-                    datasets.publish_cancel(connection=self._connection,
-                                            dataset_id=self._dataset_id,
-                                            session_id=self._session_id)
-
-                pbar.set_postfix(rows=min((index + 1) * chunksize, total))
-            pbar.close()
+            _name, total = _table["table_name"], _table["rows"]
+
+            # the first batch is read ahead to sample the encoded size of a row
+            first = next(_table["batches"], None)
+            if first is None:
+                continue
+            batches = itertools.chain([first], _table["batches"])
+
+            # re-split the batches into chunks and encode them on a worker thread, while the previous chunks are
+            # uploaded
+            pages = self.__chunk_sizes(first, total, chunksize, chunk_bytes)
+            chunks = helper.iter_prefetched(self.__encode_chunks(batches, pages), config.upload_prefetch)
+
+            with tqdm(desc="Uploading {}/{}".format(ix + 1, len(self._tables)), total=total, unit='rows',
+                      disable=(not self.progress_bar)) as pbar:
+                if parallel:
+                    workers = max_workers or helper.get_parallel_number(ceil((total or 0) / pages.limit))
+                    self.__upload_chunks_future(_name, chunks, pages, workers, pbar)
+                else:
+                    index = 0
+                    for chunk, data in chunks:
+                        index += self.__upload_chunk(_name, index + 1, chunk, data, pages, pbar)
         self._tables = []
 
         # if desired, automatically publish the data to the new dataset
         if auto_publish:
             self.publish()
 
+    def __chunk_sizes(self, first_batch, total, chunksize, chunk_bytes):
+        # Return the controller of the number of rows of the chunks of a table. In the `chunk_bytes` mode the first
+        # estimate of the encoded size of a row is taken from a sample of the first rows.
+        if chunk_bytes is None:
+            return PageSizeController.fixed(total, 0, chunksize)
+        sample = first_batch[:self.__SAMPLE_ROWS]
+        bytes_per_row = len(self.__encode(sample)) / len(sample) if len(sample) else 1
+        limit = max(int(chunk_bytes / bytes_per_row), 1)
+        return PageSizeController(total, 0, limit, min_limit=1, max_limit=None if total is None else max(total, 1),
+                                  target_bytes=chunk_bytes, target_seconds=float('inf'), bytes_per_row=bytes_per_row)
+
+    def __encode_chunks(self, batches, pages):
+        # Split the batches of a table into chunks of `pages.limit` rows, where rows left at the end of a batch are
+        # joined with the next batches. Pending batches are concatenated only once a chunk is cut from them, so small
+        # batches are not copied over and over. The controller adjusts the limit to the encoded size of the previous
+        # chunks.
+        pending = deque()   # batches and remainders of batches not cut into chunks yet
+        n_pending = 0       # number of their rows
+        for batch in itertools.chain(batches, [None]):
+            if batch is not None:
+                check_batch(batch)
+                if not batch.empty:
+                    pending.append(batch)
+                    n_pending += len(batch)
+            while n_pending >= pages.limit or (batch is None and n_pending):
+                chunk = self.__cut_chunk(pending, pages.limit)
+                n_pending -= len(chunk)
+                data = self.__encode(chunk)
+                pages.update(len(chunk), 0, len(data))
+                yield chunk, data
+
+    @staticmethod
+    def __cut_chunk(pending, limit):
+        # Remove the first `limit` rows of the `pending` batches and return them as a single data frame
+        parts, rows = [], 0
+        while pending and rows < limit:
+            batch = pending.popleft()
+            if len(batch) > limit - rows:
+                batch, rest = batch.iloc[:limit - rows], batch.iloc[limit - rows:]
+                pending.appendleft(rest)
+            parts.append(batch)
+            rows += len(batch)
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    def __encode(self, chunk):
+        # base64 encode the data
+        return self.__encoder(data_frame=chunk, dataset_type='multi').encode
+
+    def __split_chunk(self, chunk, data, pages):
+        # Split a chunk rejected as too large in encoded halves. The following chunks are kept below the rejected
+        # size, which matters only in the `chunk_bytes` mode, as the size of the chunks is fixed otherwise.
+        half = len(chunk) // 2
+        warnings.warn("Chunk of {} rows is too large for the I-Server, uploading it in 2 parts.".format(len(chunk)))
+        pages.target_bytes = min(pages.target_bytes, len(data) // 2)
+        return [(part, self.__encode(part)) for part in (chunk[:half], chunk[half:])]
+
+    def __upload_chunk(self, table_name, index, chunk, data, pages, pbar):
+        # Upload an encoded chunk with `index`. Returns the number of uploaded parts, which is more than one if the
+        # chunk was split.
+        response = datasets.upload(connection=self._connection,
+                                   dataset_id=self._dataset_id,
+                                   session_id=self._session_id,
+                                   body={"tableName": table_name, "index": index, "data": data})
+
+        if response.status_code == 413 and len(chunk) > 1:
+            uploaded = 0
+            for part, part_data in self.__split_chunk(chunk, data, pages):
+                uploaded += self.__upload_chunk(table_name, index + uploaded, part, part_data, pages, pbar)
+            return uploaded
+        if not response.ok:
+            # errors other than 413 are reported by `datasets.upload()` already
+            self.__fail_upload(response, verbose=response.status_code == 413)
+        pbar.update(len(chunk))
+        return 1
+
+    def __upload_chunks_future(self, table_name, chunks, pages, max_workers, pbar):
+        # Upload encoded chunks of a table concurrently. The next chunk is taken only when a request slot is free, so
+        # that encoded chunks do not pile up in memory while waiting for the network. A chunk rejected as too large is
+        # split in halves: the first one is uploaded with the index of the chunk and the second with the next free
+        # index, as the following indexes may be taken by chunks in flight.
+        chunks = iter(chunks)
+        pending = deque()   # (index, chunk, data) waiting for a request slot
+        in_flight = {}      # future: (index, chunk, data)
+        last_index = 0
+        with FuturesSession(executor=ThreadPoolExecutor(max_workers=max_workers),
+                            session=self._connection.session) as session:
+            while True:
+                if not pending:
+                    item = next(chunks, None)
+                    if item is not None:
+                        last_index += 1
+                        pending.append((last_index,) + item)
+                if pending and len(in_flight) < max_workers:
+                    index, chunk, data = pending.popleft()
+                    future = datasets.upload_coroutine(session, connection=self._connection,
+                                                       dataset_id=self._dataset_id,
+                                                       session_id=self._session_id,
+                                                       body={"tableName": table_name, "index": index, "data": data})
+                    in_flight[future] = (index, chunk, data)
+                    continue
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for index, chunk, data in self.__check_uploads(done, in_flight, pbar):
+                    first, second = self.__split_chunk(chunk, data, pages)
+                    last_index += 1
+                    pending.extend([(index,) + first, (last_index,) + second])
+
+    def __fail_upload(self, response, verbose=True):
+        # on error, cancel the previously uploaded data and raise the error
+        datasets.publish_cancel(connection=self._connection,
+                                dataset_id=self._dataset_id,
+                                session_id=self._session_id)
+        helper.response_handler(response, "Error uploading data.", verbose=verbose)
+        response.raise_for_status()
+
+    def __check_uploads(self, done, in_flight, pbar):
+        # Remove finished uploads from `in_flight` and return the chunks rejected as too large.
+        rejected = []
+        for future in done:
+            index, chunk, data = in_flight.pop(future)
+            response = future.result()
+            if response.status_code == 413 and len(chunk) > 1:
+                rejected.append((index, chunk, data))
+            elif not response.ok:
+                for pending in in_flight:
+                    pending.cancel()
+                self.__fail_upload(response)
+            else:
+                pbar.update(len(chunk))
+        return rejected
+
     def publish(self):
         """Publish the uploaded data to the selected dataset.
 
@@ -1,18 +1,19 @@
-from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import pandas as pd
 import requests
 from packaging import version
-
-from requests_futures.sessions import FuturesSession
 from tqdm.auto import tqdm
 
 import mstrio.config as config
 import mstrio.utils.helper as helper
 from mstrio.api import reports
+from mstrio.utils.archive import PageArchive
+from mstrio.utils.chunks import ChunkFetcher
+from mstrio.utils.elements import get_attr_elements
+from mstrio.utils.expression import Expression
 from mstrio.utils.filter import Filter
-from mstrio.utils.helper import fallback_on_timeout
-from mstrio.utils.parser import Parser
+from mstrio.utils.parser import ArrowParser, Parser, check_memory_budget
 
 
 class Report:
@@ -37,6 +38,8 @@ class Report:
             progress bar.
     """
 
+    __ENGINES = ['threads', 'async']
+
     def __init__(self, connection, report_id, instance_id=None, parallel=True, progress_bar=True):
         """Initialize an instance of a report.
 
@@ -67,15 +70,17 @@ class Report:
         self.cross_tab_filter = {}
         self._size_limit = 10000000    # this sets desired chunk size in bytes
         self._initial_limit = 1000     # initial limit for the report_instance request
+        self.__preview_instance = None   # (instance id, filter body) of the last `head()` call
         self._dataframe = None
         self._attr_elements = None
 
         # load report information
         self.__definition()
         self.__filter = Filter(attributes=self.attributes,
-                               metrics=self.metrics)
+                               metrics=self.metrics,
+                               attribute_forms=self._attribute_forms)
 
-    def to_dataframe(self, limit=None):
+    def to_dataframe(self, limit=None, categorical=False, engine='threads', columns=None, downcast=False):
         """Extract contents of a report instance into a Pandas `DataFrame`.
 
         Args:
@@ -85,123 +90,337 @@ class Report:
                 Setting limit manually will force the number of rows per chunk.
                 Depending on system resources, a higher limit (e.g. 50,000) may
                 reduce the total time required to extract the entire dataset.
+            categorical (bool, optional): If True, attribute columns are
+                returned as `pandas.Categorical` built directly from the
+                attribute elements, which reduces memory usage and parsing time
+                for attributes with repetitive values. False by default.
+            engine (str, optional): Download engine used to fetch the chunks.
+                'threads' (default) uses a pool of threads limited by the
+                `parallel` setting. 'async' schedules all requests on an
+                `asyncio` event loop with up to `config.async_concurrency`
+                concurrent requests; it requires the optional `aiohttp` package
+                and can be used from inside a running event loop (e.g. Jupyter).
+            columns (list, optional): Names of attributes, attribute forms
+                (e.g. 'Attribute@Form') and metrics to extract. Only these
+                objects are requested from the server, regardless of the
+                attributes and metrics selected with `apply_filters()`; the
+                filter on attribute elements still applies. An attribute with
+                a single selected form is returned in a column named after the
+                attribute. Cross tab reports are filtered locally, so their
+                columns are selected after the extraction. By default (None)
+                all selected columns are extracted.
+            downcast (bool, optional): If True, numeric metric columns are
+                stored as 32-bit numbers (`float32`, or `int32` if the values
+                fit). False by default.
+
+        Columns are typed by the data types of the report's attribute forms
+        and metrics, e.g. date forms become `datetime64` and numeric ID forms
+        `int64` columns, unless subtotals do not fit the type.
+
+        If `config.memory_budget` is set and the size of the data frame
+        estimated after the first page exceeds it, a `MemoryError` is raised
+        before the download, or if `config.memory_budget_policy` is 'spill',
+        columns are written to memory-mapped files in `config.spill_dir` and
+        attribute columns are categorical.
 
         Returns:
             Pandas Data Frame containing the report contents.
         """
-        if limit:
-            self._initial_limit = limit
-
-        if self.instance_id is None:
-            res = self.__initialize_report(self._initial_limit)
-        else:
-            # try to get first chunk from already initialized instance of report,
-            # if not possible, initialize new instance
+        if engine not in self.__ENGINES:
+            helper.exception_handler("Engine has to be one of {}.".format(self.__ENGINES), ValueError)
+        if columns is not None:
+            # select the columns for this extraction only, an existing instance would not respect the selection
+            selected = self.__filter.attr_selected, self.__filter.metr_selected, self.instance_id
+            self.__filter._select_columns(columns)
+            if self.cross_tab:
+                self.__filter.attr_selected, self.__filter.metr_selected = selected[:2]
+            self.instance_id = None
             try:
-                res = self.__get_chunk(instance_id=self.instance_id, offset=0, limit=self._initial_limit)
-            except requests.HTTPError:
-                res = self.__initialize_report(self._initial_limit)
-
-        # Gets the pagination totals from the response object
+                dataframe = self.to_dataframe(limit=limit, categorical=categorical, engine=engine, downcast=downcast)
+            finally:
+                self.__filter.attr_selected, self.__filter.metr_selected, self.instance_id = selected
+            if self.cross_tab:
+                self._dataframe = dataframe[self.__expand_columns(columns, dataframe.columns)]
+            return self._dataframe
+
+        res = self.__get_first_chunk(limit)
         _instance = res.json()
-        _instance_id = _instance['instanceId']
-        _pagination = _instance['data']['paging']
-
-        # initialize parser and process first response
-        p = Parser(response=_instance, parse_cube=False)
-        p.parse(response=_instance)
-
-        # If there are more rows to fetch, fetch them
-        if _pagination['current'] != _pagination['total']:
-            if not limit:
-                limit = max(1000, int((self._initial_limit * self._size_limit) / len(res.content)))
-            # Count the number of additional iterations
-            it_total = int((_pagination['total'] - self._initial_limit) / limit) + \
-                ((_pagination['total'] - self._initial_limit) % limit != 0)
-
-            if self.parallel and it_total > 1:
-                threads = helper.get_parallel_number(it_total)
-                with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
-                                    session=self._connection.session) as session:
-                    fetch_pbar = tqdm(desc="Downloading", total=it_total + 1, disable=(not self.progress_bar))
-                    future = self.__fetch_chunks_future(session, _pagination, _instance_id, limit)
-                    fetch_pbar.update()
-                    for i, f in enumerate(future, start=1):
-                        response = f.result()
-                        if not response.ok:
-                            helper.response_handler(response, "Error getting report contents.")
-                        fetch_pbar.update()
-                        fetch_pbar.set_postfix(rows=str(min(self._initial_limit + i * limit, _pagination['total'])))
-                        p.parse(response.json())
-                    fetch_pbar.close()
-            else:
-                self.__fetch_chunks(p, _pagination, it_total, _instance_id, limit)
+
+        # initialize parser and process all responses
+        p = Parser(response=_instance, parse_cube=False, categorical=categorical, downcast=downcast)
+        # estimate the size of the data frame only if it is limited
+        spill_dir = None
+        if config.memory_budget is not None:
+            spill_dir = check_memory_budget(p.estimate_size(_instance))
+        if spill_dir is not None:
+            p = Parser(response=_instance, parse_cube=False, spill_dir=spill_dir, downcast=downcast)
+        for response in self.__fetch_responses(_instance, len(res.content), limit, engine, ordered=False):
+            p.parse(response=response)
 
         # return parsed data as a data frame
-        self._dataframe = p.dataframe
+        self._dataframe = self.__filter_cross_tab(p.dataframe, p)
+        return self._dataframe
 
-        # filter received dataframe if report had crosstabs and filters were applied
-        if self.cross_tab_filter != {}:
-            if self.cross_tab_filter['metrics'] is not None:
-                # drop metrics columns from dataframe
-                metr_names = [el['name'] for el in list(
-                    filter(lambda x: x['id'] not in self.cross_tab_filter['metrics'], self.metrics))]
-                self._dataframe = self._dataframe.drop(metr_names, axis=1)
+    def head(self, n=5, categorical=False):
+        """Extract the first `n` rows of the report into a Pandas `DataFrame`.
+
+        Only a single page of `n` rows is requested and parsed, which makes it
+        a cheap preview of large reports. The instance of the report is kept, so
+        the next extraction with the same filter reuses it instead of
+        initializing a new one.
 
+        Args:
+            n (int, optional): Number of rows to extract. Defaults to 5.
+            categorical (bool, optional): If True, attribute columns are
+                returned as `pandas.Categorical`. False by default.
+
+        Returns:
+            Pandas Data Frame containing the first `n` rows of the report.
+        """
+        helper.validate_param_value('n', n, int, min_val=1)
+        _instance = self.__get_preview_chunk(n).json()
+
+        p = Parser(response=_instance, parse_cube=False, categorical=categorical)
+        return self.__filter_cross_tab(p.chunk_to_dataframe(response=_instance), p)
+
+    def estimate_size(self, categorical=False):
+        """Estimate the memory footprint in bytes of the data frame returned
+        by `to_dataframe()` with the current filter.
+
+        The estimate is based on the total number of rows and on the first
+        page of the report, which is fetched with a single request. The
+        instance of the report is kept for the next extraction, like in `head()`.
+
+        Args:
+            categorical (bool, optional): If True, estimate the size with
+                attribute columns returned as `pandas.Categorical`.
+
+        Returns:
+            Estimated size of the data frame in bytes.
+        """
+        _instance = self.__get_preview_chunk(self._initial_limit).json()
+        return Parser(response=_instance, parse_cube=False, categorical=categorical).estimate_size(_instance)
+
+    def to_arrow(self, limit=None):
+        """Extract contents of a report into a `pyarrow.Table`.
+
+        Every fetched chunk is appended to the table as a record batch.
+        Attribute columns are dictionary-encoded and metric columns are
+        numeric. Requires the optional `pyarrow` package.
+
+        Args:
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk.
+
+        Returns:
+            `pyarrow.Table` containing the report contents.
+        """
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        p = ArrowParser(response=_instance, parse_cube=False)
+        for response in self.__fetch_responses(_instance, len(res.content), limit, ordered=False):
+            p.parse(response=response)
+        return self.__filter_cross_tab_arrow(p.table, p)
+
+    def to_parquet(self, path, limit=None):
+        """Write contents of a report into a Parquet file.
+
+        Every chunk is written as a row group as soon as it is fetched, while
+        the download of the following chunks continues, so the whole report is
+        never held in memory. Integer metric columns are stored as integers
+        unless a chunk brings non-integer values. Requires the optional
+        `pyarrow` package.
+
+        Args:
+            path (str): Path of the Parquet file to write.
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk
+                and thus per row group.
+        """
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        p = ArrowParser(response=_instance, parse_cube=False)
+        responses = self.__fetch_responses(_instance, len(res.content), limit)
+        tables = (self.__filter_cross_tab_arrow(p.chunk_to_table(response=response), p) for response in responses)
+        p.write_parquet(path, tables)
+
+    def to_archive(self, path, limit=None, engine='threads'):
+        """Write raw pages of the report into a compressed archive file.
+
+        Pages are stored as they are returned by the intelligence server, as
+        soon as they are fetched, together with the definition of the
+        instance. Nothing is parsed, so the download is not slowed down by
+        parsing, and the data frame can be rebuilt later, e.g. on another
+        machine, with `mstrio.utils.archive.read_archive()`.
+
+        Args:
+            path (str): Path of the archive file to write.
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk.
+            engine (str, optional): Download engine used to fetch the chunks,
+                'threads' (default) or 'async', like in `to_dataframe()`.
+        """
+        if engine not in self.__ENGINES:
+            helper.exception_handler("Engine has to be one of {}.".format(self.__ENGINES), ValueError)
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        with PageArchive(path, 'report', self._report_id) as archive:
+            for response in self.__fetch_responses(_instance, len(res.content), limit, engine, ordered=False):
+                archive.write(response)
+
+    def iter_chunks(self, limit=None, categorical=False):
+        """Iterate over contents of a report instance, one Pandas `DataFrame`
+        per fetched chunk.
+
+        Only a bounded number of chunks is kept in memory at any time, so
+        reports larger than the available memory can be processed chunk by
+        chunk. The index of each data frame reflects the position of its rows
+        within the whole report.
+
+        Args:
+            limit (None or int, optional): Used to control data extract
+                behavior. By default (None) the limit is calculated
+                automatically, based on an optimized physical size of one chunk.
+                Setting limit manually will force the number of rows per chunk.
+            categorical (bool, optional): If True, attribute columns are
+                returned as `pandas.Categorical`. False by default.
+
+        Yields:
+            Pandas Data Frame containing one chunk of the report contents.
+        """
+        res = self.__get_first_chunk(limit)
+        _instance = res.json()
+
+        p = Parser(response=_instance, parse_cube=False, categorical=categorical)
+        for response in self.__fetch_responses(_instance, len(res.content), limit):
+            yield self.__filter_cross_tab(p.chunk_to_dataframe(response=response), p)
+
+    def __filter_cross_tab(self, dataframe, parser):
+        # filter received dataframe if report had crosstabs and filters were applied, element labels are compared
+        # with the elements typed like the labels by the parser
+        if self.cross_tab_filter != {}:
             if self.cross_tab_filter['attr_elements'] is not None:
-                # create dict of attributes and elements to iterate through
-                attr_dict = {}
-                for attribute in self.cross_tab_filter['attr_elements']:
-                    key = attribute[:32]
-                    attr_dict.setdefault(key, []).append(attribute[33:])
                 # initialize indexes series for filter
-                indexes = pd.Series([False] * len(self._dataframe))
+                indexes = pd.Series(False, index=dataframe.index)
 
                 # logical OR for filtered attribute elements
-                for attribute in attr_dict:
-                    attr_name = list(filter(lambda x: x['id'] in attribute, self.attributes))[0]['name']
-                    elements = attr_dict[attribute]
-                    indexes = indexes | self._dataframe[attr_name].isin(elements)
+                for attr_name, elements in self.__cross_tab_elements().items():
+                    indexes = indexes | dataframe[attr_name].isin(parser.typed_elements(attr_name, elements))
                 # select datframe indexes with
-                self._dataframe = self._dataframe[indexes]
+                dataframe = dataframe[indexes]
+
+            # drop filtered out columns
+            dataframe = dataframe.drop(self.__cross_tab_dropped_columns(dataframe.columns), axis=1)
+        return dataframe
+
+    @staticmethod
+    def __expand_columns(columns, dataframe_columns):
+        # replace names of attributes with multiple forms by names of their form columns
+        expanded = []
+        for column in columns:
+            forms = [c for c in dataframe_columns if c.startswith(column + Parser.AF_COL_SEP)]
+            expanded.extend(forms if column not in dataframe_columns and forms else [column])
+        return list(dict.fromkeys(expanded))
+
+    def __filter_cross_tab_arrow(self, table, parser):
+        # filter received table if report had crosstabs and filters were applied
+        if self.cross_tab_filter != {}:
+            import pyarrow as pa
+            import pyarrow.compute as pc
 
-            if self.cross_tab_filter['attributes'] is not None:
-                attr_names = [el['name'] for el in list(
-                    filter(lambda x: x['id'] not in self.cross_tab_filter['attributes'], self.attributes))]
+            if self.cross_tab_filter['attr_elements'] is not None:
+                # logical OR for filtered attribute elements
+                mask = pa.array([False] * table.num_rows)
+                for attr_name, elements in self.__cross_tab_elements().items():
+                    value_set = parser.arrow_elements(attr_name, elements, table.schema.field(attr_name).type)
+                    mask = pc.or_(mask, pc.is_in(table[attr_name], value_set=value_set))
+                table = table.filter(mask)
+
+            # drop filtered out columns
+            dropped = self.__cross_tab_dropped_columns(table.column_names)
+            table = table.select([i for i, name in enumerate(table.column_names) if name not in dropped])
+        return table
+
+    def __cross_tab_elements(self):
+        # create dict of attribute names and elements selected in the cross tab filter
+        attr_dict = {}
+        for attribute in self.cross_tab_filter['attr_elements']:
+            attr_name = list(filter(lambda x: x['id'] in attribute[:32], self.attributes))[0]['name']
+            attr_dict.setdefault(attr_name, []).append(attribute[33:])
+        return attr_dict
+
+    def __cross_tab_dropped_columns(self, columns):
+        # list names of metric and attribute columns filtered out by the cross tab filter
+        dropped = []
+        if self.cross_tab_filter['metrics'] is not None:
+            dropped.extend(el['name'] for el in self.metrics if el['id'] not in self.cross_tab_filter['metrics'])
+
+        if self.cross_tab_filter['attributes'] is not None:
+            attr_names = [el['name'] for el in self.attributes if el['id'] not in self.cross_tab_filter['attributes']]
+            for attr in attr_names:
                 # filtering out attribute forms cloumns
-                to_be_removed = []
-                to_be_added = []
-                for attr in attr_names:
-                    forms = [column for column in self._dataframe.columns if column.startswith(attr + '@')]
-                    if forms:
-                        to_be_removed.append(attr)
-                        to_be_added.extend(forms)
-                for elem in to_be_removed:
-                    attr_names.remove(elem)
-                attr_names.extend(to_be_added)
-                # drop filtered out columns
-                self._dataframe = self._dataframe.drop(attr_names, axis=1)
-        return self._dataframe
+                forms = [column for column in columns if column.startswith(attr + '@')]
+                dropped.extend(forms if forms else [attr])
+        return dropped
+
+    def __get_first_chunk(self, limit):
+        if limit:
+            self._initial_limit = limit
+        instance_id = self.__reusable_instance_id()
+        self.__preview_instance = None
+        return self.__get_instance_chunk(instance_id, self._initial_limit)
 
-    def __fetch_chunks_future(self, future_session, pagination, instance_id, limit):
-        # Fetch add'l rows from this object instance from the intelligence server
-        return [reports.report_instance_id_coroutine(future_session, connection=self._connection,
-                                                     report_id=self._report_id,
-                                                     instance_id=instance_id,
-                                                     offset=_offset,
-                                                     limit=limit)
-                for _offset in range(self._initial_limit, pagination['total'], limit)]
-
-    def __fetch_chunks(self, parser, pagination, it_total, instance_id, limit):
-
-        # Fetch add'l rows from this object instance from the intelligence server
-        with tqdm(desc="Downloading", total=it_total + 1, disable=(not self.progress_bar)) as fetch_pbar:
-            fetch_pbar.update()
-            for _offset in range(self._initial_limit, pagination['total'], limit):
-                response = self.__get_chunk(instance_id=instance_id, offset=_offset, limit=limit)
-                fetch_pbar.update()
-                fetch_pbar.set_postfix(rows=str(min(_offset + limit, pagination['total'])))
-                parser.parse(response=response.json())
+    def __get_preview_chunk(self, limit):
+        # Get the first rows of a reusable instance or of a new one, which is kept for the next extraction
+        res = self.__get_instance_chunk(self.__reusable_instance_id(), limit)
+        if self.instance_id is None:
+            self.__preview_instance = res.json()['instanceId'], self.__filter._filter_body()
+        return res
+
+    def __reusable_instance_id(self):
+        # Instance given by the user, or of the last preview if it was created with the current filter
+        if self.instance_id is None and self.__preview_instance is not None:
+            preview_id, preview_body = self.__preview_instance
+            if preview_body == self.__filter._filter_body():
+                return preview_id
+        return self.instance_id
+
+    def __get_instance_chunk(self, instance_id, limit):
+        if instance_id is None:
+            return self.__initialize_report(limit)
+        # try to get first chunk from already initialized instance of report,
+        # if not possible, initialize new instance
+        try:
+            return self.__get_chunk(instance_id=instance_id, offset=0, limit=limit)
+        except requests.HTTPError:
+            return self.__initialize_report(limit)
+
+    def __fetch_responses(self, instance, content_size, limit, engine='threads', ordered=True):
+        # Yield JSON content of the first chunk and of all add'l chunks of the report instance. Chunks are yielded in
+        # order of offsets if `ordered`, otherwise in order of completion (always for the 'async' engine)
+        return self.__fetcher().fetch(instance, content_size, limit, engine, ordered)
+
+    def __fetcher(self):
+        return ChunkFetcher(self._connection,
+                            get_chunk=self.__get_chunk,
+                            get_chunk_future=partial(reports.report_instance_id_coroutine,
+                                                     connection=self._connection, report_id=self._report_id),
+                            get_chunk_async=partial(reports.report_instance_id_async, connection=self._connection,
+                                                    report_id=self._report_id),
+                            error_msg="Error getting report contents.",
+                            initial_limit=self._initial_limit,
+                            size_limit=self._size_limit,
+                            parallel=self.parallel,
+                            progress_bar=self.progress_bar)
 
     def __initialize_report(self, limit):
         inst_pbar = tqdm(desc='Initializing an instance of a report. Please wait...',
@@ -218,7 +437,7 @@ class Report:
                                            report_id=self._report_id,
                                            body=body,
                                            offset=0,
-                                           limit=self._initial_limit)
+                                           limit=limit)
         inst_pbar.close()
         return response
 
@@ -278,10 +497,38 @@ class Report:
         attribute elements to be retrieved."""
 
         self.__filter._clear()
+        self.__filter.expression = None
         if self.cross_tab:
             self.__filter._select(object_id=[el['id'] for el in self.attributes])
             self.__filter._select(object_id=[el['id'] for el in self.metrics])
 
+    def __getitem__(self, column):
+        """Return the column of the report named `column`, e.g. 'Metric',
+        'Attribute' or 'Attribute@Form', to build expressions for `where()`."""
+        return self.__filter._column(column)
+
+    def where(self, expression):
+        """Filter rows of the report on the I-Server with an expression of its
+        columns, e.g.
+        `report.where((report["Region"] == "East") & (report["Revenue"] > 1e6))`.
+
+        Columns are compared with numbers or strings using `==`, `!=`, `<`,
+        `<=`, `>`, `>=`, `isin()` and `between()`, and comparisons are
+        combined with `&`, `|` and `~`. The expression is sent as a view
+        filter, combined with attribute elements selected by `apply_filters()`,
+        so filtered rows are never transferred.
+
+        Args:
+            expression (Expression or None): Expression of the rows to keep.
+                If None, previously set expression is removed.
+        """
+        if self.cross_tab and expression is not None:
+            helper.exception_handler("Expressions are not supported for cross-tabbed reports.", ValueError)
+        if expression is not None and not isinstance(expression, Expression):
+            helper.exception_handler("Expression has to be built from columns of the report, e.g. "
+                                     "report['Metric'] > 0.", TypeError)
+        self.__filter.expression = expression
+
     def __definition(self):
         """Get the definition of a report, including attributes and metrics.
 
@@ -313,6 +560,8 @@ class Report:
             if column["type"] == "attribute":
                 full_attributes.append(column)
         self._attributes = [{'name': attr['name'], 'id': attr['id']} for attr in full_attributes]
+        self._attribute_forms = {attr['id']: [{'name': form['name'], 'id': form['id']}
+                                              for form in attr.get('forms', [])] for attr in full_attributes}
 
         # Retrieve metrics from the report grid (metrics selected only in the report)
         metrics_position = grid.get("metricsPosition")
@@ -322,94 +571,22 @@ class Report:
             full_metrics = grid[metrics_position["axis"]][metrics_position["index"]]["elements"]
             self._metrics = [{'name': metr['name'], 'id': metr['id']} for metr in full_metrics]
 
-    def __get_attr_elements(self, limit=50000):
-        """Get elements of report attributes synchronously.
+    def __get_attr_elements(self, attributes=None, limit=50000):
+        """Get elements of report attributes, all of them by default.
 
-        Implements GET /reports/<report_id>/attributes/<attribute_id>/elements.
-        """
-        def fetch_for_attribute(attribute):
-            @fallback_on_timeout()
-            def fetch_for_attribute_given_limit(limit):
-                response = reports.report_single_attribute_elements(connection=self._connection,
-                                                                    report_id=self._report_id,
-                                                                    attribute_id=attribute['id'],
-                                                                    offset=0,
-                                                                    limit=limit)
-                # Get total number of rows from headers.
-                total = int(response.headers['x-mstr-total-count'])
-                # Get attribute elements from the response.
-                elements = response.json()
-
-                # If total number of elements is bigger than the chunk size (limit), fetch them incrementally.
-                for _offset in range(limit, total, limit):
-                    response = reports.report_single_attribute_elements(connection=self._connection,
-                                                                        report_id=self._report_id,
-                                                                        attribute_id=attribute['id'],
-                                                                        offset=_offset,
-                                                                        limit=limit)
-                    elements.extend(response.json())
-
-                # Return attribute data.
-                return {"attribute_name": attribute['name'],
-                        "attribute_id": attribute['id'],
-                        "elements": elements}
-            return fetch_for_attribute_given_limit(limit)[0]
-
-        attr_elements = []
-        if self.attributes:
-            pbar = tqdm(self.attributes, desc="Loading attribute elements",
-                        leave=False, disable=(not self.progress_bar))
-            attr_elements = [fetch_for_attribute(attribute) for attribute in pbar]
-            pbar.close()
-
-        return attr_elements
-
-    def __get_attr_elements_async(self, limit=50000):
-        """Get elements of report attributes asynchronously.
+        Report data has no modification time, so elements are cached for the
+        I-Server session of the connection, i.e. until the user logs in
+        again, or until `mstrio.utils.elements.attr_elements_cache` is
+        cleared.
 
         Implements GET /reports/<report_id>/attributes/<attribute_id>/elements.
         """
-
-        attr_elements = []
-        if self.attributes:
-            threads = helper.get_parallel_number(len(self.attributes))
-            with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
-                                session=self._connection.session) as session:
-                # Fetch first chunk of attribute elements.
-                futures = self.__fetch_attribute_elements_chunks(session, limit)
-                pbar = tqdm(futures, desc="Loading attribute elements", leave=False, disable=(not self.progress_bar))
-                for i, future in enumerate(pbar):
-                    attr = self.attributes[i]
-                    response = future.result()
-                    if not response.ok:
-                        helper.response_handler(response, "Error getting attribute " + attr['name'] + " elements")
-                    elements = response.json()
-                    # Get total number of rows from headers.
-                    total = int(response.headers['x-mstr-total-count'])
-                    for _offset in range(limit, total, limit):
-                        response = reports.report_single_attribute_elements(connection=self._connection,
-                                                                            report_id=self._report_id,
-                                                                            attribute_id=attr["id"],
-                                                                            offset=_offset,
-                                                                            limit=limit)
-                        elements.extend(response.json())
-                    # Append attribute data to the list of attributes.
-                    attr_elements.append({"attribute_name": attr['name'],
-                                          "attribute_id": attr['id'],
-                                          "elements": elements})
-                pbar.close()
-
-            return attr_elements
-
-    def __fetch_attribute_elements_chunks(self, future_session, limit):
-        # Fetch add'l rows from this object instance from the intelligence server
-        return [reports.report_single_attribute_elements_coroutine(future_session,
-                                                                   connection=self._connection,
-                                                                   report_id=self._report_id,
-                                                                   attribute_id=attribute['id'],
-                                                                   offset=0,
-                                                                   limit=limit)
-                for attribute in self.attributes]
+        coroutine = partial(reports.report_single_attribute_elements_coroutine, connection=self._connection,
+                            report_id=self._report_id)
+        version = self._connection.session.headers.get('X-MSTR-AuthToken')
+        return get_attr_elements(self._connection, self._report_id, version,
+                                 self.attributes if attributes is None else attributes, coroutine, limit=limit,
+                                 parallel=self.parallel, progress_bar=self.progress_bar)
 
     @property
     def name(self):
@@ -426,11 +603,7 @@ class Report:
     @property
     def attr_elements(self):
         if not self._attr_elements:
-            if self.parallel is True:
-                # TODO: move the fallback inside the function to apply per-attribute, like with non-async version.
-                self._attr_elements = fallback_on_timeout()(self.__get_attr_elements_async)(50000)[0]
-            else:
-                self._attr_elements = self.__get_attr_elements()
+            self._attr_elements = self.__get_attr_elements()
             self.__filter.attr_elem_selected = self._attr_elements
         return self._attr_elements
 
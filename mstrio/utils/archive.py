@@ -0,0 +1,141 @@
+"""Archives of raw pages of cube and report instances.
+
+Pages returned by the I-Server are stored unchanged as compressed JSON entries
+of a ZIP file as soon as they are fetched, together with a manifest holding
+the definition of the instance. The data frame can be rebuilt from the archive
+later, e.g. on another machine, without a connection to the I-Server, and the
+stored pages can be replayed to benchmark the parser.
+"""
+import json
+import os
+import re
+import sys
+import tempfile
+import zipfile
+
+from mstrio.utils.helper import exception_handler
+from mstrio.utils.parser import Parser
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+_PAGE = 'pages/{:012d}.json'
+_PAGE_PATTERN = re.compile(r'^pages/(\d+)\.json$')
+
+
+class PageArchive:
+    """Writer of an archive of the raw pages of a cube or report instance.
+
+    Pages are written to a temporary file next to `path`, which replaces
+    `path` only when the archive is closed after all pages were written, so an
+    interrupted download never leaves an incomplete archive behind. Use it as
+    a context manager::
+
+        with PageArchive(path, 'cube', cube_id) as archive:
+            for page in pages:
+                archive.write(page)
+
+    Args:
+        path (str): Path of the archive file to write.
+        object_type (str): Type of the archived object, 'cube' or 'report'.
+        object_id (str): Identifier of the archived object.
+        compresslevel (int, optional): Level of the deflate compression of
+            the pages, from 0 to 9. Defaults to 1, which is the fastest.
+            Ignored on Python 3.6, which always uses the default level.
+    """
+
+    def __init__(self, path, object_type, object_id, compresslevel=1):
+        self.path = path
+        self.manifest = {'version': FORMAT_VERSION, 'type': object_type, 'id': object_id}
+        fd, self.__tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        os.close(fd)
+        options = {'compresslevel': compresslevel} if sys.version_info >= (3, 7) else {}
+        self.__zip = zipfile.ZipFile(self.__tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, **options)
+        self.__offsets = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(commit=exc_type is None)
+
+    def write(self, page):
+        """Store JSON content of a fetched page. The instance definition is
+        taken from the first page written."""
+        paging = page['data']['paging']
+        if not self.__offsets:
+            self.manifest.update(instanceId=page.get('instanceId'), total=paging['total'],
+                                 definition=page['definition'])
+        self.__zip.writestr(_PAGE.format(paging['offset']), json.dumps(page))
+        self.__offsets.append(paging['offset'])
+
+    def close(self, commit=True):
+        """Write the manifest and move the archive to its path, or discard
+        it if not `commit`."""
+        try:
+            if commit:
+                self.manifest['offsets'] = sorted(self.__offsets)
+                self.__zip.writestr(MANIFEST, json.dumps(self.manifest))
+            self.__zip.close()
+            if commit:
+                os.replace(self.__tmp_path, self.path)
+        finally:
+            if os.path.exists(self.__tmp_path):
+                os.remove(self.__tmp_path)
+
+
+def read_manifest(path):
+    """Return the manifest of an archive: type and id of the archived object,
+    id, definition and total number of rows of its instance, and offsets of
+    the stored pages."""
+    with zipfile.ZipFile(path) as archive:
+        return _load_manifest(archive)
+
+
+def iter_pages(path):
+    """Iterate over JSON content of the pages stored in an archive, in order
+    of offsets."""
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name in archive.namelist() if _PAGE_PATTERN.match(name)]
+        for name in sorted(names):
+            yield json.loads(archive.read(name))
+
+
+def read_archive(path, categorical=False, downcast=False):
+    """Rebuild the data frame of an archived cube or report instance.
+
+    The stored pages are parsed like during `to_dataframe()` of the cube or
+    report, without a connection to the I-Server. Filters of cross-tab
+    reports applied locally by `Report` are not applied.
+
+    Args:
+        path (str): Path of an archive written by `Cube.to_archive()` or
+            `Report.to_archive()`.
+        categorical (bool, optional): If True, attribute columns are
+            returned as `pandas.Categorical`. False by default.
+        downcast (bool, optional): If True, numeric metric columns are stored
+            as 32-bit numbers. False by default.
+
+    Returns:
+        Pandas Data Frame containing the archived contents.
+    """
+    manifest = read_manifest(path)
+    parser = None
+    for page in iter_pages(path):
+        if parser is None:
+            parser = Parser(response=page, parse_cube=manifest['type'] == 'cube', categorical=categorical,
+                            downcast=downcast)
+        parser.parse(response=page)
+    if parser is None:
+        exception_handler("Archive '{}' does not contain any pages.".format(path), ValueError)
+    return parser.dataframe
+
+
+def _load_manifest(archive):
+    try:
+        manifest = json.loads(archive.read(MANIFEST))
+    except KeyError:
+        exception_handler("File '{}' is not a complete page archive.".format(archive.filename), ValueError)
+    if manifest.get('version', 0) > FORMAT_VERSION:
+        exception_handler("Page archive format version {} is not supported, upgrade mstrio-py to read it.".format(
+            manifest['version']), ValueError)
+    return manifest
@@ -0,0 +1,154 @@
+"""Download engine based on `asyncio` and `aiohttp`.
+
+Requests are scheduled as coroutines on an event loop running in a background
+thread, so the engine can be used from inside a running event loop (e.g. in
+Jupyter) and its concurrency is not bound by the number of threads.
+"""
+import asyncio
+import json
+import queue
+import ssl
+import threading
+
+import requests
+
+import mstrio.config as config
+from mstrio.utils.helper import exception_handler, response_handler
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is an optional dependency, required only for the "async" engine
+    aiohttp = None
+
+_DONE = object()
+
+
+def async_session(connection, concurrency=None):
+    """Create an `aiohttp.ClientSession` sharing the authentication headers,
+    cookies and SSL configuration of the connection's `requests.Session`.
+
+    Args:
+        connection: MicroStrategy REST API connection object.
+        concurrency (int, optional): Maximum number of pooled connections.
+            Defaults to `config.async_concurrency`.
+    """
+    if aiohttp is None:
+        exception_handler("Package 'aiohttp' is required for the 'async' engine. Install it with "
+                          "`pip install mstrio-py[async]`.", ImportError)
+
+    verify = connection.session.verify
+    if isinstance(verify, str):
+        ssl_context = ssl.create_default_context(cafile=verify)
+    else:
+        ssl_context = None if verify else False
+
+    connector = aiohttp.TCPConnector(limit=concurrency or config.async_concurrency, ssl=ssl_context)
+    return aiohttp.ClientSession(connector=connector,
+                                 headers=dict(connection.session.headers),
+                                 cookies=connection.session.cookies.get_dict())
+
+
+def proxy(connection):
+    """Return the proxy URL configured for the scheme of the connection."""
+    proxies = connection.session.proxies or {}
+    return proxies.get(connection.base_url.split(':', 1)[0])
+
+
+async def get_json(async_session, connection, url, params, error_msg):
+    """Send a GET request and return the decoded JSON content of the response.
+
+    Errors are handled with `helper.response_handler()`, like for responses
+    of the `requests` library.
+    """
+    async with async_session.get(url, params=params, proxy=proxy(connection)) as response:
+        content = await response.read()
+        if response.status >= 400:
+            res = requests.Response()
+            res.status_code = response.status
+            res.reason = response.reason
+            res.url = str(response.url)
+            res._content = content
+            response_handler(res, error_msg)
+        return json.loads(content)
+
+
+def iter_completed(connection, fetch, args, concurrency=None):
+    """Run `fetch(async_session, arg)` coroutines for all `args` and yield
+    their results in order of completion.
+
+    The coroutines run on an event loop in a background thread. At most
+    `concurrency` requests are in flight and at most `concurrency` results
+    wait to be consumed, so memory usage stays bounded. `args` are consumed
+    lazily, one by one as requests complete, so they can be generated based on
+    the results of the requests which are already done.
+
+    Args:
+        connection: MicroStrategy REST API connection object.
+        fetch: Coroutine function taking an `aiohttp.ClientSession` and one
+            of `args`.
+        args: Iterable of arguments, e.g. offsets of chunks to fetch.
+        concurrency (int, optional): Maximum number of concurrent requests.
+            Defaults to `config.async_concurrency`.
+    """
+    concurrency = concurrency or config.async_concurrency
+    results = queue.Queue(maxsize=concurrency)
+    stop = threading.Event()
+    args = iter(args)
+
+    async def put(item):
+        # wait for the consumer without blocking the event loop
+        while not stop.is_set():
+            try:
+                results.put_nowait(item)
+                return
+            except queue.Full:
+                await asyncio.sleep(0.005)
+
+    async def run():
+
+        async def fetch_all(session):
+            # all tasks share the `args` iterator, which is safe as they run on a single thread
+            for arg in args:
+                if stop.is_set():
+                    return
+                await put(await fetch(session, arg))
+
+        async with async_session(connection, concurrency) as session:
+            tasks = [asyncio.ensure_future(fetch_all(session)) for _ in range(concurrency)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    def worker():
+        try:
+            # a loop of its own, as `asyncio.run()` is not available on Python 3.6
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(run())
+            finally:
+                loop.close()
+            item = _DONE
+        except BaseException as err:
+            item = err
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    thread = threading.Thread(target=worker, name="mstrio-async-engine", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            elif isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,154 @@
+"""Tables of datasets read in batches.
+
+A table is uploaded to a dataset from a Pandas DataFrame, from an iterable of
+DataFrames, or from a CSV or Parquet file read in batches of
+`config.upload_batch_rows` rows, so tables larger than the available memory can
+be uploaded without loading them at once. The model of the table is built
+from a schema mapping column names to Pandas data types, from the metadata of
+a Parquet file, or from the first batch. Every batch is conformed to the
+columns and data types of the model.
+"""
+import itertools
+import os
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_integer_dtype
+
+import mstrio.config as config
+from mstrio.utils.helper import exception_handler
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is an optional dependency, required only for Parquet files
+    pq = None
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+
+def open_batches(source, schema=None, batch_rows=None):
+    """Open a table source for a batched upload.
+
+    Args:
+        source: Pandas DataFrame, iterable of Pandas DataFrames, or path of a
+            CSV or Parquet file. Files with a '.parquet' or '.pq' suffix are
+            read as Parquet, other files as CSV.
+        schema (dict, optional): Mapping of column names to Pandas data types
+            of the table. Batches are restricted to these columns and cast to
+            these types. If None, the schema is taken from the metadata of a
+            Parquet file or from the first batch, and every batch has to have
+            the same columns, castable to the same types. Integer and boolean
+            columns of a Parquet file with missing values are declared as
+            float and object columns, the way Pandas reads them.
+        batch_rows (int, optional): Number of rows read at once from a file.
+            Defaults to `config.upload_batch_rows`.
+
+    Returns:
+        Tuple of a DataFrame with the columns and data types of the table (the
+        whole table if `source` is a DataFrame), an iterator of the batches of
+        the table and the number of rows of the table, or None if it is not
+        known before reading the batches.
+    """
+    batch_rows = config.upload_batch_rows if batch_rows is None else batch_rows
+    frame = None if schema is None else schema_frame(schema)
+
+    if isinstance(source, pd.DataFrame):
+        if frame is not None:
+            source = conform(source, frame)
+        return source, iter([source]), source.shape[0]
+
+    if isinstance(source, (str, os.PathLike)):
+        if os.fspath(source).lower().endswith(PARQUET_SUFFIXES):
+            return _read_parquet(source, frame, batch_rows)
+        batches = _read_csv(source, frame, batch_rows)
+    else:
+        try:
+            batches = iter(source)
+        except TypeError:
+            exception_handler("Table has to be a Pandas DataFrame, an iterable of DataFrames or a path of a CSV or "
+                              "Parquet file.", TypeError)
+
+    if frame is None:
+        first = next(batches, None)
+        if first is None:
+            exception_handler("Table does not contain any batches, provide its `schema`.", ValueError)
+        check_batch(first)
+        return first, itertools.chain([first], (conform(batch, first, strict=True) for batch in batches)), None
+    return frame, (conform(batch, frame) for batch in batches), None
+
+
+def schema_frame(schema):
+    """Return an empty DataFrame with the columns and data types of `schema`,
+    a mapping of column names to Pandas data types."""
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in schema.items()})
+
+
+def check_batch(batch):
+    """Check that a batch of a table is a Pandas DataFrame."""
+    if not isinstance(batch, pd.DataFrame):
+        exception_handler("Batches of a table have to be Pandas DataFrames.", TypeError)
+
+
+def conform(batch, frame, strict=False):
+    """Restrict a batch to the columns of `frame`, in the same order, and cast
+    it to their data types.
+
+    Args:
+        batch (DataFrame): Batch of a table.
+        frame (DataFrame): Frame with the columns and data types of the table.
+        strict (bool, optional): If True, the batch must not have columns
+            which are not in `frame` either.
+    """
+    check_batch(batch)
+    missing = [name for name in frame.columns if name not in batch.columns]
+    if missing:
+        exception_handler("Columns {} of the table were not found in the batch.".format(missing), ValueError)
+    extra = [name for name in batch.columns if name not in frame.columns] if strict else []
+    if extra:
+        exception_handler("Columns {} of the batch are not in the first batch of the table, provide the `schema` "
+                          "of the table.".format(extra), ValueError)
+    try:
+        return batch[list(frame.columns)].astype(frame.dtypes.to_dict())
+    except (TypeError, ValueError) as err:
+        exception_handler("Batch cannot be cast to the data types of the table ({}), provide the `schema` of the "
+                          "table.".format(err), ValueError)
+
+
+def _read_csv(path, frame, batch_rows):
+    options = {}
+    if frame is not None:
+        dates = [name for name, dtype in frame.dtypes.items() if is_datetime64_any_dtype(dtype)]
+        options = {'usecols': list(frame.columns), 'parse_dates': dates,
+                   'dtype': {name: dtype for name, dtype in frame.dtypes.items() if name not in dates}}
+    return iter(pd.read_csv(path, chunksize=batch_rows, **options))
+
+
+def _read_parquet(path, frame, batch_rows):
+    if pq is None:
+        exception_handler("Package 'pyarrow' is required to read Parquet files. Install it with "
+                          "`pip install mstrio-py[arrow]`.", ImportError)
+    file = pq.ParquetFile(path)
+    if frame is None:
+        frame = _parquet_frame(file)
+    batches = (conform(batch.to_pandas(), frame)
+               for batch in file.iter_batches(batch_size=batch_rows, columns=list(frame.columns)))
+    return frame, batches, file.metadata.num_rows
+
+
+def _parquet_frame(file):
+    # Pandas reads integer and boolean columns with missing values as float and object columns, so such columns are
+    # declared with these types for all batches. Columns without null counts in the metadata may have missing values.
+    frame = file.schema_arrow.empty_table().to_pandas()
+    nullable = set()
+    for i in range(file.metadata.num_row_groups):
+        row_group = file.metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            if column.statistics is None or not column.statistics.has_null_count or column.statistics.null_count:
+                nullable.add(column.path_in_schema)
+    types = {}
+    for name, dtype in frame.dtypes.items():
+        if name in nullable and is_integer_dtype(dtype):
+            types[name] = 'float64'
+        elif name in nullable and is_bool_dtype(dtype):
+            types[name] = object
+    return frame.astype(types)
@@ -0,0 +1,104 @@
+"""Local disk cache of extracted data frames.
+
+Data frames are stored as Arrow IPC (Feather) files named by the hash of
+their key. The total size of the cache directory is bounded and the least
+recently used files are evicted first. Writes go through a temporary file and
+an atomic rename, so the cache can be shared by concurrent processes.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import mstrio.config as config
+from mstrio.utils.helper import exception_handler
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is an optional dependency, required only for the cache
+    feather = None
+
+
+class ResultCache:
+    """Disk cache of data frames bounded by size with LRU eviction.
+
+    Args:
+        directory (str, optional): Directory of the cache files. Defaults to
+            `config.cache_dir`.
+        max_size (int, optional): Maximum total size of the cache files in
+            bytes. Defaults to `config.cache_max_size`.
+    """
+    __SUFFIX = '.arrow'
+
+    def __init__(self, directory=None, max_size=None):
+        if feather is None:
+            exception_handler("Package 'pyarrow' is required for the result cache. Install it with "
+                              "`pip install mstrio-py[arrow]`.", ImportError)
+        self.directory = directory or config.cache_dir
+        self.max_size = config.cache_max_size if max_size is None else max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(**parts):
+        """Return the cache key of a result identified by JSON-serializable
+        `parts`, e.g. object id, filter body and modification time."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key):
+        """Return the cached data frame for `key` or None if it is not cached."""
+        path = self.__path(key)
+        try:
+            dataframe = feather.read_feather(path)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        return dataframe
+
+    def put(self, key, dataframe):
+        """Store `dataframe` under `key` and evict the least recently used
+        files exceeding the size of the cache."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            feather.write_feather(dataframe, tmp_path)
+            os.replace(tmp_path, self.__path(key))
+        except Exception as err:
+            os.remove(tmp_path)
+            exception_handler("Data frame could not be cached: {}".format(err), Warning)
+            return
+        self.__evict()
+
+    def clear(self):
+        """Remove all files of the cache."""
+        for path, _ in self.__entries():
+            self.__remove(path)
+
+    def __path(self, key):
+        return os.path.join(self.directory, key + self.__SUFFIX)
+
+    def __entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.__SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((path, os.stat(path)))
+                except OSError:     # removed by another process
+                    pass
+        return entries
+
+    def __evict(self):
+        entries = sorted(self.__entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_size:
+                break
+            self.__remove(path)
+            total -= stat.st_size
+
+    @staticmethod
+    def __remove(path):
+        try:
+            os.remove(path)
+        except OSError:     # removed by another process
+            pass
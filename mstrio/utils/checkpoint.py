@@ -0,0 +1,95 @@
+"""Checkpoints of interrupted downloads.
+
+Chunks fetched from an instance of a cube are stored as compressed JSON files
+named by their offset and number of rows, next to the id of the instance. A
+download restarted on the same instance parses the stored chunks and fetches
+only the missing rows. Writes go through a temporary file and an atomic
+rename, so a chunk is either stored completely or not at all.
+"""
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+
+
+class Checkpoint:
+    """Directory of the chunks of an instance fetched so far.
+
+    Args:
+        directory (str): Parent directory of the checkpoints.
+        key (str): Key of the download, e.g. hash of the object id and filter.
+    """
+    __INSTANCE = 'instance'
+    __CHUNK = re.compile(r'^(\d+)-(\d+)\.json\.gz$')
+
+    def __init__(self, directory, key):
+        self.path = os.path.join(directory, key)
+        os.makedirs(self.path, exist_ok=True)
+
+    @property
+    def instance_id(self):
+        """Id of the instance the stored chunks belong to, or None."""
+        try:
+            with open(os.path.join(self.path, self.__INSTANCE)) as file:
+                return file.read().strip() or None
+        except OSError:
+            return None
+
+    def start(self, instance_id):
+        """Store the following chunks for `instance_id`. Chunks of any other
+        instance are removed.
+
+        Returns:
+            List of (offset, rows) of the chunks already stored for the
+            instance.
+        """
+        if instance_id != self.instance_id:
+            self.clear()
+            self.__write(self.__INSTANCE, instance_id.encode())
+        return self.chunks()
+
+    def chunks(self):
+        """Return sorted (offset, rows) of the stored chunks."""
+        chunks = []
+        for name in os.listdir(self.path):
+            match = self.__CHUNK.match(name)
+            if match:
+                chunks.append((int(match.group(1)), int(match.group(2))))
+        return sorted(chunks)
+
+    def load(self, offset, rows):
+        """Return JSON content of the stored chunk at `offset`."""
+        with gzip.open(os.path.join(self.path, self.__name(offset, rows)), 'rt') as file:
+            return json.load(file)
+
+    def save(self, chunk):
+        """Store JSON content of a fetched chunk."""
+        paging = chunk['data']['paging']
+        self.__write(self.__name(paging['offset'], paging['current']),
+                     gzip.compress(json.dumps(chunk).encode(), compresslevel=1))
+
+    def clear(self):
+        """Remove the stored chunks and the instance id."""
+        for name in os.listdir(self.path):
+            if name == self.__INSTANCE or self.__CHUNK.match(name):
+                os.remove(os.path.join(self.path, name))
+
+    def remove(self):
+        """Remove the checkpoint directory."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    @staticmethod
+    def __name(offset, rows):
+        return '{}-{}.json.gz'.format(offset, rows)
+
+    def __write(self, name, content):
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(content)
+            os.replace(tmp_path, os.path.join(self.path, name))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,211 @@
+"""Fetching of chunks of rows of cube and report instances.
+
+After the first chunk of an instance is fetched, add'l chunks are fetched one
+by one, concurrently on a pool of threads or with the asyncio engine. Sizes of
+the chunks and retries of the failed ones are controlled by a
+`PageSizeController`, shared by all `Cube` and `Report` downloads.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+
+import requests
+from requests_futures.sessions import FuturesSession
+from tqdm.auto import tqdm
+
+import mstrio.config as config
+import mstrio.utils.helper as helper
+from mstrio.api.exceptions import MstrTimeoutError
+from mstrio.utils import async_engine
+from mstrio.utils.paging import TRANSIENT_ERRORS, PageSizeController, wait_completed
+
+
+class ChunkFetcher:
+    """Fetcher of the chunks of rows of a cube or report instance.
+
+    Args:
+        connection: MicroStrategy REST API connection object.
+        get_chunk: Function taking `instance_id`, `offset` and `limit`
+            arguments and returning the response with a chunk of rows.
+        get_chunk_future: Function taking `future_session`, `instance_id`,
+            `offset`, `limit` and `hooks` arguments and returning a future of
+            the response with a chunk of rows.
+        get_chunk_async: Coroutine function taking an `aiohttp.ClientSession`
+            and `instance_id`, `offset` and `limit` arguments and returning
+            JSON content of a chunk of rows.
+        error_msg (str): Message printed if a chunk cannot be fetched.
+        initial_limit (int): Number of rows of the first chunk.
+        size_limit (int): Desired size of a chunk in bytes.
+        parallel (bool, optional): If False, chunks are fetched one by one.
+        progress_bar (bool, optional): If True, show the progress bar.
+    """
+
+    def __init__(self, connection, get_chunk, get_chunk_future, get_chunk_async, error_msg, initial_limit,
+                 size_limit, parallel=True, progress_bar=True):
+        self._connection = connection
+        self.__get_chunk = get_chunk
+        self.__get_chunk_future = get_chunk_future
+        self.__get_chunk_async = get_chunk_async
+        self.error_msg = error_msg
+        self.initial_limit = initial_limit
+        self.size_limit = size_limit
+        self.parallel = parallel
+        self.progress_bar = progress_bar
+
+    def fetch(self, instance, content_size, limit=None, engine='threads', ordered=True, fetched=None):
+        """Yield JSON content of the first chunk and of all add'l chunks of an
+        instance.
+
+        Args:
+            instance (dict): JSON content of the first chunk of the instance.
+            content_size (int): Size of the first chunk in bytes.
+            limit (int, optional): Number of rows of add'l chunks. By default,
+                it adapts to the measured size and latency of the chunks.
+            engine (str, optional): "threads" or "async", the engine fetching
+                the add'l chunks concurrently.
+            ordered (bool, optional): If True, chunks are yielded in order of
+                offsets, otherwise in order of completion (always for the
+                "async" engine).
+            fetched (list, optional): (offset, rows) of the chunks which are
+                fetched already and are not fetched again.
+        """
+        yield instance
+
+        # Gets the pagination totals and instance_id from the response object
+        _instance_id = instance['instanceId']
+        _pagination = instance['data']['paging']
+
+        # If there are more rows to fetch, fetch them
+        if _pagination['current'] != _pagination['total']:
+            pages = self.pages(_pagination['total'], content_size, limit, fetched)
+            # Estimate the number of additional iterations
+            it_total = ceil((_pagination['total'] - self.initial_limit) / pages.limit)
+
+            if engine == 'async':
+                yield from self.__fetch_chunks_async(pages, _instance_id)
+            elif self.parallel and it_total > 1:
+                threads = helper.get_parallel_number(it_total)
+                yield from self.__fetch_chunks_future(pages, threads, _instance_id, ordered)
+            else:
+                with self.__progress_bar(pages) as fetch_pbar:
+                    yield from self.fetch_pages(pages, _instance_id, fetch_pbar)
+
+    def pages(self, total, content_size, limit=None, fetched=None):
+        """Return the controller of the add'l chunks of an instance of `total`
+        rows, whose first chunk had `content_size` bytes.
+
+        Chunks have a fixed size if `limit` is set. Otherwise, the first size
+        is derived from the size of the first chunk and then it adapts to the
+        measured size and latency of the fetched chunks.
+        """
+        if limit:
+            return PageSizeController.fixed(total, self.initial_limit, limit, fetched)
+        bytes_per_row = content_size / self.initial_limit
+        limit = min(max(config.page_size_min, int(self.size_limit / bytes_per_row)), config.page_size_max)
+        return PageSizeController(total, self.initial_limit, limit, target_bytes=self.size_limit,
+                                  bytes_per_row=bytes_per_row, fetched=fetched)
+
+    def fetch_pages(self, pages, instance_id, fetch_pbar):
+        """Fetch the chunks handed out by `pages` one by one and yield their
+        JSON content, updating `fetch_pbar` with their rows."""
+        for offset, limit in iter(lambda: pages.next_page(block=True), None):
+            try:
+                response = self.__get_chunk(instance_id=instance_id, offset=offset, limit=limit)
+            except (requests.HTTPError, MstrTimeoutError, *TRANSIENT_ERRORS) as err:
+                if not pages.retry(offset, limit, err):
+                    raise
+            else:
+                chunk = response.json()
+                pages.update(chunk['data']['paging']['current'], response.elapsed.total_seconds(),
+                             len(response.content))
+                fetch_pbar.update(chunk['data']['paging']['current'])
+                yield chunk
+
+    def __fetch_chunks_future(self, pages, threads, instance_id, ordered=True):
+
+        # Fetch add'l rows from this object instance from the intelligence server. Only a bounded number of requests
+        # is kept in flight, so that fetched chunks do not pile up in memory when they are consumed slowly. JSON content
+        # is decoded in the worker threads. Unless `ordered`, chunks are yielded as soon as they complete, so that a
+        # slow chunk does not hold back parsing of the chunks which are already downloaded.
+        in_flight = {}    # future: (offset, limit)
+        done = {}         # offset: chunk waiting for the preceding chunks if `ordered`
+        next_offset = self.initial_limit
+        with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
+                            session=self._connection.session) as session:
+            with self.__progress_bar(pages) as fetch_pbar:
+                while True:
+                    while len(in_flight) < threads and (not in_flight or len(done) < threads):
+                        page = pages.next_page()
+                        if page is None:
+                            break
+                        future = self.__get_chunk_future(future_session=session, instance_id=instance_id,
+                                                         offset=page[0], limit=page[1],
+                                                         hooks={'response': self.__decode_json})
+                        in_flight[future] = page
+                    if not in_flight and pages.retry_delay() is None:
+                        break
+                    for future in wait_completed(in_flight, pages.retry_delay()):
+                        offset, limit = in_flight.pop(future)
+                        try:
+                            response = future.result()
+                        except TRANSIENT_ERRORS as err:
+                            if pages.retry(offset, limit, err):
+                                continue
+                            raise
+                        if not response.ok:
+                            if pages.retry(offset, limit, response):
+                                continue
+                            helper.response_handler(response, self.error_msg)
+                        rows = response.content_json['data']['paging']['current']
+                        pages.update(rows, response.elapsed.total_seconds(), len(response.content))
+                        fetch_pbar.update(rows)
+                        if ordered:
+                            done[offset] = response.content_json
+                        else:
+                            yield response.content_json
+                    while next_offset in done:
+                        chunk = done.pop(next_offset)
+                        next_offset += chunk['data']['paging']['current']
+                        yield chunk
+
+    def __fetch_chunks_async(self, pages, instance_id):
+
+        # Fetch add'l rows from this object instance from the intelligence server with the asyncio engine. Chunks are
+        # yielded in order of completion.
+        async def fetch(session, page):
+            # pages which are too big for the server are fetched in smaller parts
+            offset, end = page[0], sum(page)
+            chunks = []
+            while offset < end:
+                limit = pages.part_limit(end - offset)
+                start = time.perf_counter()
+                try:
+                    chunk = await self.__get_chunk_async(session, instance_id=instance_id, offset=offset,
+                                                         limit=limit)
+                except (requests.HTTPError, MstrTimeoutError, *TRANSIENT_ERRORS) as err:
+                    if not pages.shrink(limit, err):
+                        delay = pages.backoff(offset, err)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                else:
+                    pages.update(chunk['data']['paging']['current'], time.perf_counter() - start)
+                    chunks.append(chunk)
+                    offset += limit
+            return chunks
+
+        with self.__progress_bar(pages) as fetch_pbar:
+            for chunks in async_engine.iter_completed(self._connection, fetch, iter(pages.next_page, None)):
+                for chunk in chunks:
+                    fetch_pbar.update(chunk['data']['paging']['current'])
+                    yield chunk
+
+    def __progress_bar(self, pages):
+        return tqdm(desc="Downloading", total=pages.total, initial=self.initial_limit + pages.skipped, unit="rows",
+                    disable=(not self.progress_bar))
+
+    @staticmethod
+    def __decode_json(response, *args, **kwargs):
+        # Response hook run in the worker thread of a future, so that JSON content is decoded in parallel
+        response.content_json = response.json() if response.ok else None
@@ -0,0 +1,154 @@
+"""Fetching of attribute elements of cubes and reports.
+
+Every page of every attribute is a separate request scheduled on a shared pool
+of threads. Fetched elements are kept in a process-wide LRU cache, shared by
+all `Cube` and `Report` objects and keyed by a version of their data.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from requests_futures.sessions import FuturesSession
+from tqdm.auto import tqdm
+
+import mstrio.config as config
+import mstrio.utils.helper as helper
+from mstrio.utils.paging import TRANSIENT_ERRORS, PageSizeController, wait_completed
+
+
+class ElementCache:
+    """Thread-safe LRU cache of attribute elements bounded by the total number
+    of cached elements.
+
+    Args:
+        max_elements (int, optional): Maximum number of cached elements.
+            Defaults to `config.attr_elements_cache_size`.
+    """
+
+    def __init__(self, max_elements=None):
+        self.max_elements = max_elements
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached elements for `key` or None if they are not cached."""
+        with self._lock:
+            elements = self._entries.get(key)
+            if elements is not None:
+                self._entries.move_to_end(key)
+                return list(elements)
+
+    def put(self, key, elements):
+        """Cache `elements` under `key` and evict the least recently used
+        entries exceeding the size of the cache."""
+        max_elements = config.attr_elements_cache_size if self.max_elements is None else self.max_elements
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            if len(elements) > max_elements:
+                return
+            self._entries[key] = list(elements)
+            self._size += len(elements)
+            while self._size > max_elements:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        """Remove all cached elements."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+attr_elements_cache = ElementCache()
+
+
+def get_attr_elements(connection, object_id, version, attributes, coroutine, limit=50000, parallel=True,
+                      progress_bar=True):
+    """Get elements of attributes of a cube or report.
+
+    Elements are taken from the process-wide cache if possible. Otherwise,
+    first pages of all attributes are requested concurrently and add'l pages of
+    an attribute are requested as soon as its total number of elements is
+    known. Pages which time out are fetched again in smaller parts and pages
+    failing because of transient errors, e.g. dropped connections, are
+    fetched again after a backoff.
+
+    Args:
+        connection: MicroStrategy REST API connection object.
+        object_id (str): Identifier of the cube or report.
+        version: Version of the cube or report data, part of the cache key,
+            e.g. modification time of a cube or the I-Server session of a
+            report. If None, the elements are always fetched and not cached,
+            as they could not be invalidated.
+        attributes (list): Attributes as dicts with 'id' and 'name' keys.
+        coroutine: Function taking `future_session`, `attribute_id`, `offset`
+            and `limit` arguments and returning a future of a page of elements.
+        limit (int, optional): Number of elements in a single page.
+        parallel (bool, optional): If False, pages are fetched one by one.
+        progress_bar (bool, optional): If True, show the progress bar.
+
+    Returns:
+        List of dicts with 'attribute_name', 'attribute_id' and 'elements' for
+        all `attributes`, in the same order.
+    """
+    key = (connection.base_url, connection.project_id, connection.user_id, object_id, version)
+    cached = version is not None
+    elements = {attr['id']: attr_elements_cache.get(key + (attr['id'],)) if cached else None for attr in attributes}
+    missing = [attr for attr in attributes if elements[attr['id']] is None]
+
+    if missing:
+        # before the total number of elements is known, an attribute has a single page
+        pages = {attr['id']: PageSizeController(limit, 0, limit, min_limit=50, max_limit=limit) for attr in missing}
+        chunks = {attr['id']: {} for attr in missing}   # attribute id: {offset: elements}
+        fetched = {attr['id']: 0 for attr in missing}
+        names = {attr['id']: attr['name'] for attr in missing}
+        # number of pages is not known in advance, so use the maximal number of threads
+        threads = helper.get_parallel_number(0) if parallel else 1
+        in_flight = {}  # future: (attribute_id, offset, limit)
+
+        with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
+                            session=connection.session) as session:
+            with tqdm(total=len(attributes), initial=len(attributes) - len(missing), desc="Loading attribute elements",
+                      leave=False, disable=(not progress_bar)) as pbar:
+                while True:
+                    for attribute_id, attr_pages in pages.items():
+                        while len(in_flight) < threads:
+                            page = attr_pages.next_page()
+                            if page is None:
+                                break
+                            future = coroutine(session, attribute_id=attribute_id, offset=page[0], limit=page[1])
+                            in_flight[future] = (attribute_id,) + page
+                    delays = [attr_pages.retry_delay() for attr_pages in pages.values()]
+                    delays = [delay for delay in delays if delay is not None]
+                    if not in_flight and not delays:
+                        break
+                    for future in wait_completed(in_flight, min(delays, default=None)):
+                        attribute_id, offset, page_limit = in_flight.pop(future)
+                        attr_pages = pages[attribute_id]
+                        try:
+                            response = future.result()
+                        except TRANSIENT_ERRORS as err:
+                            if attr_pages.retry(offset, page_limit, err):
+                                continue
+                            raise
+                        if not response.ok:
+                            if attr_pages.retry(offset, page_limit, response):
+                                continue
+                            helper.response_handler(response, "Error getting attribute " + names[attribute_id]
+                                                    + " elements")
+                        attr_pages.total = int(response.headers['x-mstr-total-count'])
+                        chunks[attribute_id][offset] = response.json()
+                        fetched[attribute_id] += page_limit
+                        if fetched[attribute_id] >= attr_pages.total:
+                            pbar.update()
+
+        for attr in missing:
+            elements[attr['id']] = [el for offset in sorted(chunks[attr['id']]) for el in chunks[attr['id']][offset]]
+            if cached:
+                attr_elements_cache.put(key + (attr['id'],), elements[attr['id']])
+
+    return [{"attribute_name": attr['name'],
+             "attribute_id": attr['id'],
+             "elements": elements[attr['id']]} for attr in attributes]
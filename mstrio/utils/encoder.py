@@ -1,5 +1,17 @@
+import binascii
+import json
 from base64 import b64encode
 
+import numpy as np
+
+from mstrio.utils.helper import exception_handler
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is an optional dependency, required only for the fast encoder
+    pa = None
+
 
 class Encoder(object):
     """Internal method for converting a Pandas DataFrame to MicroStrategy
@@ -51,3 +63,167 @@ class Encoder(object):
                                                               date_format='iso').encode('utf-8')).decode('utf-8')
         # return base 64 encoded data to calling environment
         return self.__b64_data
+
+
+class FastEncoder(object):
+    """Internal method for converting a Pandas DataFrame to MicroStrategy
+    compliant base64 encoded JSON, built column by column with Apache Arrow.
+
+    Every column is converted into an Arrow array of JSON tokens with
+    vectorized compute functions, and the tokens are joined into one Arrow
+    string array holding the JSON rows, so the JSON document lies in a single
+    buffer. The buffer is base64-encoded in blocks into a preallocated output
+    buffer, without intermediate copies of the whole document. The JSON is
+    equivalent to the one of `Encoder`, except that floating point numbers
+    are written in their shortest exact representation (e.g. `0.1` for a
+    `float32` 0.1) instead of 10 decimal digits and that non-ASCII characters
+    are not escaped. Columns of types without a vectorized
+    conversion are converted with Pandas. Requires the optional `pyarrow`
+    package.
+
+    Args:
+        data_frame: Pandas DataFrame to be converted.
+        dataset_type (str): Dataset type. One of `single` or `multi` to
+            correspond with single-table or multi-table sources.
+    """
+
+    __table_type_orient_map = {"single": "records",
+                               "multi": "values"}
+    __BLOCK_SIZE = 3 * 2 ** 20    # bytes base64-encoded at once, a multiple of 3
+    __ESCAPED = r'["\\\x00-\x1f]'  # characters escaped in JSON strings
+
+    def __init__(self, data_frame, dataset_type):
+        if pa is None:
+            exception_handler("Package 'pyarrow' is required for the fast encoder. Install it with "
+                              "`pip install mstrio-py[arrow]`.", ImportError)
+        if dataset_type not in self.__table_type_orient_map.keys():
+            raise ValueError("Table type should be one of " + '%s' % ', '.join(map(str, self.__table_type_orient_map)))
+        self.__data_frame = data_frame
+        self.__orientation = self.__table_type_orient_map[dataset_type]
+
+    @property
+    def encode(self):
+        """Encode data in base 64."""
+        df = self.__data_frame
+        if df.shape[0] == 0 or df.shape[1] == 0:
+            json_data = df.to_json(orient=self.__orientation, date_format='iso').encode('utf-8')
+            return self.__b64encode([json_data], len(json_data))
+
+        # join tokens of the columns into rows, e.g. '[1,"a"],' or '{"x":1,"y":"a"},'
+        parts = []
+        for i, (name, column) in enumerate(df.items()):
+            if self.__orientation == "records":
+                parts.append(('{' if i == 0 else ',') + json.dumps(str(name)) + ':')
+            elif i > 0:
+                parts.append(',')
+            parts.extend(self.__tokens(column))
+        if self.__orientation == "values":
+            rows = self.__concat('[', *parts, '],')
+        else:
+            rows = self.__concat(*parts, '},')
+        rows = self.__combine(rows)
+
+        # data buffer of the rows without the trailing comma
+        offsets = np.frombuffer(rows.buffers()[1], dtype=np.int64)[rows.offset:rows.offset + len(rows) + 1]
+        data = memoryview(rows.buffers()[2])[offsets[0]:offsets[-1] - 1]
+        return self.__b64encode([b'[', data, b']'], len(data) + 2)
+
+    @classmethod
+    def __tokens(cls, column):
+        # Parts of the JSON tokens of the column values to concatenate: string literals and Arrow arrays
+        try:
+            values = pa.array(column, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return [cls.__pandas_tokens(column)]
+        # Arrow-backed columns, e.g. of the `str` dtype, are converted to chunked arrays
+        values = cls.__combine(values)
+        if pa.types.is_dictionary(values.type):
+            values = values.dictionary_decode()
+
+        type_ = values.type
+        if pa.types.is_integer(type_):
+            return cls.__wrap(pc.cast(values, pa.large_string()))
+        elif pa.types.is_floating(type_):
+            strings = pc.cast(values, pa.large_string())
+            if not pc.all(pc.is_finite(values)).as_py():
+                strings = pc.if_else(pc.is_finite(values), strings, None)
+            return cls.__wrap(strings)
+        elif pa.types.is_boolean(type_):
+            return cls.__wrap(pc.if_else(values, 'true', 'false').cast(pa.large_string()))
+        elif pa.types.is_string(type_) or pa.types.is_large_string(type_):
+            return cls.__wrap(cls.__escape(values), '"', '"')
+        elif pa.types.is_decimal(type_):
+            return cls.__wrap(pc.cast(values, pa.large_string()), '"', '"')
+        elif pa.types.is_date(type_):
+            return cls.__wrap(pc.cast(values, pa.large_string()), '"', 'T00:00:00.000"')
+        elif pa.types.is_timestamp(type_):
+            # ISO format with milliseconds, in UTC with the 'Z' suffix if the time zone is set
+            values = pc.floor_temporal(values, unit='millisecond').cast(pa.timestamp('ms', tz=type_.tz and 'UTC'))
+            strings = pc.replace_substring(pc.cast(values, pa.large_string()), ' ', 'T', max_replacements=1)
+            return cls.__wrap(strings, '"', '"')
+        return [cls.__pandas_tokens(column)]
+
+    @classmethod
+    def __wrap(cls, strings, prefix='', suffix=''):
+        # parts of tokens made of `strings` between `prefix` and `suffix`, or 'null' for missing values
+        if strings.null_count == 0:
+            return [prefix, strings, suffix]
+        return [pc.fill_null(cls.__concat(prefix, strings, suffix), 'null')]
+
+    @classmethod
+    def __escape(cls, strings):
+        # escape the rare strings with special characters one by one
+        strings = strings.cast(pa.large_string())
+        if len(strings) == strings.null_count:
+            return strings
+        # scan the characters of the array at once, special characters are below 0x20 or one of '"' and '\\'
+        offsets = np.frombuffer(strings.buffers()[1], dtype=np.int64)[strings.offset:strings.offset + len(strings) + 1]
+        characters = np.frombuffer(strings.buffers()[2], dtype=np.uint8)[offsets[0]:offsets[-1]]
+        if (characters < 0x20).any() or (characters == ord('"')).any() or (characters == ord('\\')).any():
+            special = pc.fill_null(pc.match_substring_regex(strings, cls.__ESCAPED), False)
+            escaped = [json.dumps(s, ensure_ascii=False)[1:-1] for s in strings.filter(special).to_pylist()]
+            strings = pc.replace_with_mask(strings, special, pa.array(escaped, type=pa.large_string()))
+        return strings
+
+    @staticmethod
+    def __combine(values):
+        # a single array with contiguous buffers
+        return values.combine_chunks() if isinstance(values, pa.ChunkedArray) else values
+
+    @staticmethod
+    def __concat(*parts):
+        # element-wise concatenation of large string arrays and string literals
+        parts = [pa.scalar(part, pa.large_string()) if isinstance(part, str) else part for part in parts if
+                 not isinstance(part, str) or part]
+        return pc.binary_join_element_wise(*parts, pa.scalar('', pa.large_string()))
+
+    @staticmethod
+    def __pandas_tokens(column):
+        # tokens of values of other types are serialized by Pandas, like by `Encoder`
+        values = json.loads(column.to_json(orient='values', date_format='iso'))
+        return pa.array([json.dumps(value) for value in values], type=pa.large_string())
+
+    @classmethod
+    def __b64encode(cls, parts, size):
+        # base64-encode the concatenated `parts` of `size` bytes block by block into a preallocated buffer
+        output = bytearray(4 * ((size + 2) // 3))
+        position, carry = 0, b''
+        for part in parts:
+            part = memoryview(part)
+            if carry:
+                head = carry + bytes(part[:3 - len(carry)])
+                part = part[3 - len(carry):]
+                if len(head) < 3:
+                    carry = head
+                    continue
+                output[position:position + 4] = binascii.b2a_base64(head, newline=False)
+                position += 4
+            end = len(part) - len(part) % 3
+            for start in range(0, end, cls.__BLOCK_SIZE):
+                block = binascii.b2a_base64(part[start:min(start + cls.__BLOCK_SIZE, end)], newline=False)
+                output[position:position + len(block)] = block
+                position += len(block)
+            carry = bytes(part[end:])
+        if carry:
+            output[position:] = binascii.b2a_base64(carry, newline=False)
+        return output.decode('ascii')
@@ -0,0 +1,128 @@
+"""Expressions compiled into I-Server view filters.
+
+Columns of a cube or report are compared with constants to build metric and
+attribute form qualifications, which are combined with `&` (And), `|` (Or)
+and `~` (Not), e.g.::
+
+    cube.where((cube["Region"] == "East") & (cube["Revenue"] > 1e6))
+"""
+from abc import ABCMeta, abstractmethod
+from numbers import Number
+
+
+class Expression(metaclass=ABCMeta):
+    """View filter expression, which can be combined with `&`, `|` and `~`."""
+
+    def __and__(self, other):
+        return LogicalExpression("And", [self, other])
+
+    def __or__(self, other):
+        return LogicalExpression("Or", [self, other])
+
+    def __invert__(self):
+        return LogicalExpression("Not", [self])
+
+    def __bool__(self):
+        raise TypeError("Expressions can not be used as booleans. Use '&', '|' and '~' instead of 'and', 'or' and "
+                        "'not', and wrap comparisons in parentheses.")
+
+    @abstractmethod
+    def to_dict(self):
+        """Return the view filter JSON of the expression."""
+        pass
+
+
+class LogicalExpression(Expression):
+    """And, Or or Not of expressions."""
+
+    def __init__(self, operator, operands):
+        for operand in operands:
+            if not isinstance(operand, Expression):
+                raise TypeError("Operands of '{}' have to be expressions, not '{}'.".format(
+                    operator, type(operand).__name__))
+        # flatten nested expressions of the same operator, e.g. (a & b) & c
+        self.operator = operator
+        self.operands = []
+        for operand in operands:
+            if operator != "Not" and isinstance(operand, LogicalExpression) and operand.operator == operator:
+                self.operands.extend(operand.operands)
+            else:
+                self.operands.append(operand)
+
+    def to_dict(self):
+        return {"operator": self.operator, "operands": [operand.to_dict() for operand in self.operands]}
+
+
+class Qualification(Expression):
+    """Comparison of a metric or an attribute form with constants."""
+
+    def __init__(self, operator, column, values):
+        self.operator = operator
+        self.column = column
+        self.values = values
+
+    def to_dict(self):
+        if self.operator in ("In", "NotIn"):
+            values = [_constant(value)["value"] for value in self.values]
+            constants = {"type": "constants", "dataType": _data_type(self.values), "values": values}
+            return {"operator": self.operator, "operands": [self.column.operand, constants]}
+        return {"operator": self.operator, "operands": [self.column.operand] + [_constant(v) for v in self.values]}
+
+
+class Column:
+    """Metric or attribute form of a cube or report used to build view filter
+    expressions with comparison operators, `isin()` and `between()`.
+
+    Args:
+        name (str): Name of the column.
+        operand (dict): View filter operand of the metric or attribute form.
+    """
+
+    def __init__(self, name, operand):
+        self.name = name
+        self.operand = operand
+
+    def __repr__(self):
+        return "Column({!r})".format(self.name)
+
+    def __eq__(self, value):
+        return Qualification("Equals", self, [value])
+
+    def __ne__(self, value):
+        return Qualification("NotEquals", self, [value])
+
+    def __gt__(self, value):
+        return Qualification("Greater", self, [value])
+
+    def __ge__(self, value):
+        return Qualification("GreaterEqual", self, [value])
+
+    def __lt__(self, value):
+        return Qualification("Less", self, [value])
+
+    def __le__(self, value):
+        return Qualification("LessEqual", self, [value])
+
+    __hash__ = None
+
+    def isin(self, values):
+        """Qualify on values equal to one of `values`."""
+        values = list(values)
+        if not values:
+            raise ValueError("At least one value has to be provided for 'isin'.")
+        return Qualification("In", self, values)
+
+    def between(self, low, high):
+        """Qualify on values between `low` and `high`, inclusive."""
+        return Qualification("Between", self, [low, high])
+
+
+def _data_type(values):
+    return "Real" if all(isinstance(value, Number) for value in values) else "Char"
+
+
+def _constant(value):
+    if isinstance(value, bool) or not isinstance(value, (Number, str)):
+        raise TypeError("Only numbers and strings can be compared with columns, not '{}'.".format(
+            type(value).__name__))
+    return {"type": "constant", "dataType": _data_type([value]), "value": str(value)}
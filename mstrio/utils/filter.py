@@ -1,11 +1,16 @@
 import mstrio.utils.helper as helper
+from mstrio.utils.expression import Column
+from mstrio.utils.parser import Parser
 
 
 class Filter:
     err_msg_invalid = "Invalid object ID: '{}'"
     err_msg_duplicated = "Duplicate object ID: '{}'"
+    err_msg_invalid_column = "Invalid column name: '{}'"
+    err_msg_ambiguous_column = "Ambiguous column name: '{}' is both an attribute and a metric"
 
-    def __init__(self, attributes, metrics, attr_elements=None, row_count_metrics=None, operator='In'):
+    def __init__(self, attributes, metrics, attr_elements=None, row_count_metrics=None, operator='In',
+                 attribute_forms=None):
 
         self.attributes = {}
         for a in attributes:
@@ -28,6 +33,8 @@ class Filter:
         self.metr_selected = []
         self.attr_elem_selected = []
         self.operator = operator
+        self.attribute_forms = attribute_forms if attribute_forms is not None else {}
+        self.expression = None
 
         # select all metrics and all attributes
         self._select([metric_id['id'] for metric_id in metrics])
@@ -62,6 +69,64 @@ class Filter:
                 if typ == "metric":
                     self.metr_selected.append(object_id)
 
+    def _select_columns(self, columns):
+        """Select attributes, attribute forms and metrics by names of data
+        frame columns, e.g. 'Attribute', 'Attribute@Form' or 'Metric'. Replaces
+        previously selected attributes and metrics."""
+        attributes = {v["name"]: k for k, v in self.attributes.items()}
+        metrics = {v["name"]: k for k, v in self.metrics.items()}
+        attr_selected, metr_selected = {}, []
+
+        for column in columns:
+            attr_name, sep, form_name = column.partition(Parser.AF_COL_SEP)
+            if column in attributes and column in metrics:
+                raise ValueError(self.err_msg_ambiguous_column.format(column))
+            elif column in metrics:
+                metr_selected.append(metrics[column])
+            elif column in attributes:
+                attr_selected[attributes[column]] = None    # all forms
+            elif sep and attr_name in attributes:
+                attribute_id = attributes[attr_name]
+                form_ids = {form["name"]: form["id"] for form in self.attribute_forms.get(attribute_id, [])}
+                if form_name not in form_ids:
+                    raise ValueError(self.err_msg_invalid_column.format(column))
+                forms = attr_selected.setdefault(attribute_id, [])
+                if forms is not None and form_ids[form_name] not in forms:
+                    forms.append(form_ids[form_name])
+            else:
+                raise ValueError(self.err_msg_invalid_column.format(column))
+
+        self.attr_selected = [[attribute_id] + (forms or []) for attribute_id, forms in attr_selected.items()]
+        self.metr_selected = list(dict.fromkeys(metr_selected))
+
+    def _column(self, name):
+        """Return the metric or attribute form with the data frame column name
+        `name` as a `Column` of view filter expressions. An attribute without a
+        form qualifies on its 'DESC' form, or on its only form."""
+        attributes = {v["name"]: k for k, v in self.attributes.items()}
+        metrics = {v["name"]: k for k, v in self.metrics.items()}
+        attr_name, sep, form_name = name.partition(Parser.AF_COL_SEP)
+
+        if name in attributes and name in metrics:
+            raise ValueError(self.err_msg_ambiguous_column.format(name))
+        elif name in metrics:
+            return Column(name, {"type": "metric", "id": metrics[name]})
+        elif name in attributes:
+            attribute_id = attributes[name]
+            forms = self.attribute_forms.get(attribute_id, [])
+            forms = [form for form in forms if form["name"] == "DESC"] or forms
+            if len(forms) != 1:
+                raise ValueError(self.err_msg_invalid_column.format(name) + ", specify the attribute form as '"
+                                 + name + Parser.AF_COL_SEP + "<form>'")
+        elif sep and attr_name in attributes:
+            attribute_id = attributes[attr_name]
+            forms = [form for form in self.attribute_forms.get(attribute_id, []) if form["name"] == form_name]
+            if not forms:
+                raise ValueError(self.err_msg_invalid_column.format(name))
+        else:
+            raise ValueError(self.err_msg_invalid_column.format(name))
+        return Column(name, {"type": "form", "attribute": {"id": attribute_id}, "form": {"id": forms[0]["id"]}})
+
     def _select_attr_el(self, element_id):
         if isinstance(element_id, list):
             for i in element_id:
@@ -117,6 +182,15 @@ class Filter:
         return ro
 
     def _view_filter(self):
+        vf = self.__element_view_filter()
+        if self.expression is None:
+            return vf
+        expression = self.expression.to_dict()
+        if vf is None:
+            return expression
+        return {"operator": "And", "operands": [vf, expression]}
+
+    def __element_view_filter(self):
 
         if not self.attr_elem_selected:
             return None
@@ -149,8 +223,9 @@ class Filter:
     def _filter_body(self):
         fb = {}
         fb["requestedObjects"] = self._requested_objects()
-        if self.attr_elem_selected:
-            fb["viewFilter"] = self._view_filter()
+        view_filter = self._view_filter()
+        if view_filter is not None:
+            fb["viewFilter"] = view_filter
 
         return fb
 
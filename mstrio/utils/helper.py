@@ -1,17 +1,18 @@
 import os
+import queue
 import re
+import threading
 import warnings
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from functools import wraps
 from json.decoder import JSONDecodeError
-from math import floor
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Union
 
 import mstrio.config as config
 import stringcase
 from mstrio import __version__ as mstrio_version
 from mstrio.api.exceptions import MstrTimeoutError, VersionException
+from mstrio.utils.paging import TRANSIENT_ERRORS, PageSizeController, wait_completed
 from requests_futures.sessions import FuturesSession
 
 
@@ -175,33 +176,6 @@ def response_handler(response, msg, throw_error=True, verbose=True, whitelist=[]
                 response.raise_for_status()
 
 
-def fallback_on_timeout(min_limit: int = 50):
-    """Return a decorator, which decorates a function with one argument,
-    `limit`, to retry with half as big limit if it encounters a timeout error.
-
-    Do note that the wrapped function will return a (result, working_limit)
-    tuple, not just the result, to allow for using the working limit further.
-
-    Args:
-        min_limit: The minimum limit that will be attempted as retry. If the
-            wrapper recurses past it, it will just raise the error back.
-    """
-    def decorate(func: Callable[[int], Any]):
-        @wraps(func)    # Replaces `fot_wrapper`'s __name__, __doc__ and __module__ with those of `func`
-        def fot_wrapper(limit: int) -> Tuple[Any, int]:
-            try:
-                return func(limit), limit
-            except MstrTimeoutError as err:
-                new_limit = floor(limit / 2)
-                if new_limit >= min_limit:
-                    warnings.warn(f"Timout hit when executing {func.__name__} with limit {limit}, retrying with limit {new_limit}")
-                    return fot_wrapper(new_limit)
-                else:
-                    raise err
-        return fot_wrapper
-    return decorate
-
-
 def get_parallel_number(total_chunks):
     """Returns the optimal number of threads to be used for downloading
     cubes/reports in parallel."""
@@ -213,6 +187,57 @@ def get_parallel_number(total_chunks):
     return threads
 
 
+def iter_prefetched(iterable, size):
+    """Iterate over `iterable` produced on a background thread.
+
+    Items are produced while the consumer processes the previous ones, e.g.
+    encoding of the next chunk overlaps with the upload of the current one.
+    At most `size` produced items wait to be consumed, so memory usage stays
+    bounded. Exceptions raised by the producer are re-raised in the consumer.
+
+    Args:
+        iterable: Iterable of items, consumed on the background thread.
+        size (int): Maximum number of items produced ahead of the consumer.
+    """
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        # wait for a free slot, unless the consumer stopped
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as err:
+            put((done, err))
+        else:
+            put((done, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
 def make_dict_filter(param: str, expression: Union[str, int, float, dict, List]):
     """Return a filter function that takes a dictionary object as parameter.
 
@@ -320,9 +345,11 @@ def fetch_objects_async(connection: "Connection", api, async_api, dict_unpack_va
             to be additionally specified
     """
 
-    def prepare_objects(response):
+    def unpack_objects(response):
         objects = response.json()
-        objects = objects.get(dict_unpack_value) if dict_unpack_value else objects  # unpack value
+        return objects.get(dict_unpack_value) if dict_unpack_value else objects  # unpack value
+
+    def prepare_objects(objects):
         objects = camel_to_snake(objects)      # Convert keys
         objects = filter_list_of_dicts(objects, **filters)    # Filter fetched objects
         return objects
@@ -337,30 +364,54 @@ def fetch_objects_async(connection: "Connection", api, async_api, dict_unpack_va
     param_value_dict = {arg: kwargs.get(arg) for arg in args if arg not in ['connection', 'limit',
                                                                             'offset', 'error_msg']}
     response = api(connection=connection, offset=offset, limit=chunk_size, error_msg=error_msg, **param_value_dict)
-    objects = prepare_objects(response)
-    all_objects.extend(objects)
+    objects = unpack_objects(response)
+    all_objects.extend(prepare_objects(objects))
     current_count = offset + chunk_size
     total_objects = int(response.headers.get('x-mstr-total-count'))
     total_objects = min(limit, total_objects) if limit else total_objects
 
     if total_objects > current_count:
+        # the size of add'l chunks adapts to the measured size and latency of the fetched chunks, but never exceeds
+        # `chunk_size`, as endpoints may cap the number of returned objects and the offsets would skip objects
+        pages = PageSizeController(total_objects, current_count, chunk_size, min_limit=min(chunk_size, 100),
+                                   max_limit=chunk_size, bytes_per_row=len(response.content) / max(1, len(objects)))
         it_total = int(total_objects / chunk_size) + (total_objects % chunk_size != 0)
         threads = get_parallel_number(it_total)
+        chunks = {}
         with FuturesSession(executor=ThreadPoolExecutor(max_workers=threads),
                             session=connection.session) as session:
             # Extract parameters of the api wrapper and set them using the kwargs
             args = async_api.__code__.co_varnames[:async_api.__code__.co_argcount]
             param_value_dict = {arg: kwargs.get(arg) for arg in args if arg not in [
                 'connection', 'limit', 'offset', 'future_session', 'error_msg']}
-            futures = [async_api(future_session=session, connection=connection, offset=offset, limit=chunk_size, **param_value_dict)
-                       for offset in range(current_count, total_objects, chunk_size)]
-
-        for f in futures:
-            response = f.result()
-            if not response.ok:
-                response_handler(response, error_msg, throw_error=False)
-            objects = prepare_objects(response)
-            all_objects.extend(objects)
+            futures = {}
+            while True:
+                while len(futures) < threads:
+                    page = pages.next_page()
+                    if page is None:
+                        break
+                    futures[async_api(future_session=session, connection=connection, offset=page[0], limit=page[1],
+                                      **param_value_dict)] = page
+                if not futures and pages.retry_delay() is None:
+                    break
+                for f in wait_completed(futures, pages.retry_delay()):
+                    offset, chunk_limit = futures.pop(f)
+                    try:
+                        response = f.result()
+                    except TRANSIENT_ERRORS as err:
+                        if pages.retry(offset, chunk_limit, err):
+                            continue
+                        raise
+                    if not response.ok:
+                        if pages.retry(offset, chunk_limit, response):
+                            continue
+                        response_handler(response, error_msg, throw_error=False)
+                    objects = unpack_objects(response)
+                    pages.update(len(objects), response.elapsed.total_seconds(), len(response.content))
+                    chunks[offset] = prepare_objects(objects)
+
+        for offset in sorted(chunks):
+            all_objects.extend(chunks[offset])
 
     return all_objects
 
@@ -0,0 +1,313 @@
+import asyncio
+import heapq
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, wait
+from json.decoder import JSONDecodeError
+from math import ceil
+
+import requests
+
+import mstrio.config as config
+from mstrio.api.exceptions import MstrTimeoutError
+
+try:
+    from aiohttp import ClientConnectionError
+except ImportError:  # aiohttp is an optional dependency, required only for the "async" engine
+    ClientConnectionError = ConnectionError
+
+MSI_REQUEST_TIMEOUT = -2147206497   # I-Server error code of a server-side request timeout
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503)   # statuses of failures which may not repeat
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, ClientConnectionError, asyncio.TimeoutError)
+
+
+class PageSizeController:
+    """Hand out pages of rows (offset, limit) of a paged REST API collection
+    and adjust the page `limit` during the download.
+
+    The limit is derived from the measured bytes and latency per row of the
+    fetched pages, so that a single page stays close to `target_bytes` and
+    `target_seconds`, whichever is smaller. The limit changes by a factor of
+    at most 2 per page and always stays within `min_limit` and `max_limit`.
+    Pages failing because they are too big for the server (timeouts, 413 and
+    504 responses) halve the limit and can be handed out again. Pages failing
+    because of transient errors (connection errors, 429 and 5xx responses)
+    are handed out again once an exponential backoff has passed, at most
+    `max_retries` times per page. The controller never sleeps on its own, so
+    other pages can be fetched and consumed during the backoff.
+
+    Args:
+        total (int): Total number of rows to fetch.
+        offset (int): Offset of the first page to hand out.
+        limit (int): Initial page limit.
+        min_limit (int, optional): Lower bound of the limit. Defaults to
+            `config.page_size_min` (or `limit` if it is smaller).
+        max_limit (int, optional): Upper bound of the limit. Defaults to
+            `config.page_size_max` (or `limit` if it is bigger).
+        target_bytes (int, optional): Desired size of a page in bytes.
+            Defaults to `config.page_target_bytes`.
+        target_seconds (float, optional): Desired latency of a page in
+            seconds. Defaults to `config.page_target_seconds`.
+        bytes_per_row (float, optional): Known size of a row in bytes, e.g.
+            measured on a first page fetched outside of the controller.
+        fetched (list, optional): (offset, rows) of the pages which are
+            already fetched, e.g. stored by a checkpoint. Their rows are
+            skipped.
+        max_retries (int, optional): Maximum number of retries of a page
+            after transient errors. Defaults to `config.page_retries`.
+        retry_backoff (float, optional): Delay before the first retry of a
+            page in seconds, doubled with every retry. Defaults to
+            `config.page_retry_backoff`.
+
+    Attributes:
+        limit (int): Limit of the next page.
+        skipped (int): Number of rows skipped as already fetched.
+    """
+    _SMOOTHING = 0.5    # weight of the latest full page in the moving averages of bytes and seconds per row
+    _MAX_STEP = 2       # maximal factor by which the limit changes after a single page
+
+    def __init__(self, total, offset, limit, min_limit=None, max_limit=None, target_bytes=None,
+                 target_seconds=None, bytes_per_row=None, fetched=None, max_retries=None, retry_backoff=None):
+        self.total = total
+        self.min_limit = min(limit, config.page_size_min if min_limit is None else min_limit)
+        self.max_limit = max(limit, config.page_size_max if max_limit is None else max_limit)
+        self.target_bytes = config.page_target_bytes if target_bytes is None else target_bytes
+        self.target_seconds = config.page_target_seconds if target_seconds is None else target_seconds
+        self.max_retries = config.page_retries if max_retries is None else max_retries
+        self.retry_backoff = config.page_retry_backoff if retry_backoff is None else retry_backoff
+        self.limit = limit
+        self._offset = offset
+        self._retries = []     # heap of (offset, size) of failed pages
+        self._delayed = []     # heap of (not_before, offset, size) of pages failed with transient errors
+        self._attempts = {}    # offset: number of retries after transient errors
+        self._fetched = sorted(page for page in fetched or [] if sum(page) > offset)
+        self.skipped = sum(start + rows - max(start, offset) for start, rows in self._fetched)
+        self._bytes_per_row = bytes_per_row
+        self._seconds_per_row = None
+
+    @classmethod
+    def fixed(cls, total, offset, limit, fetched=None):
+        """Return a controller handing out pages of constant `limit`."""
+        return cls(total, offset, limit, min_limit=limit, max_limit=limit, fetched=fetched)
+
+    def next_page(self, block=False):
+        """Return (offset, limit) of the next page to fetch, or None if there
+        is currently no page left to fetch.
+
+        Pages handed back with `retry()` are handed out first, in order of
+        offsets, once their backoff has passed, so more pages may become
+        available later (see `retry_delay()`).
+
+        Args:
+            block (bool, optional): If True and the only pages left are
+                waiting for their backoff, sleep until the first of them is
+                due instead of returning None. Meant for sequential downloads,
+                with no other requests in flight.
+        """
+        page = self.__next_page()
+        delay = self.retry_delay()
+        while block and page is None and delay is not None:
+            time.sleep(delay)
+            page, delay = self.__next_page(), self.retry_delay()
+        return page
+
+    def part_limit(self, size):
+        """Return the limit of the first part of a failed page of `size` rows,
+        which is fetched again in parts.
+
+        The page is split in parts of balanced sizes close to the limit, e.g.
+        in halves after the limit was halved, so that no tiny remainder is
+        left, whose measurements would be dominated by the fixed overhead of
+        a page.
+        """
+        return ceil(size / max(1, round(size / self.limit)))
+
+    def retry_delay(self):
+        """Return the number of seconds until the first page waiting for its
+        backoff is due, 0 if it is due already, or None if no page waits."""
+        if not self._delayed:
+            return None
+        return max(0, self._delayed[0][0] - time.monotonic())
+
+    def __next_page(self):
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, offset, size = heapq.heappop(self._delayed)
+            heapq.heappush(self._retries, (offset, size))
+        if self._retries:
+            offset, size = heapq.heappop(self._retries)
+            limit = self.part_limit(size)
+            if size > limit:
+                heapq.heappush(self._retries, (offset + limit, size - limit))
+            return offset, limit
+        # skip the pages which are already fetched and stop before the next one
+        while self._fetched and self._fetched[0][0] <= self._offset:
+            self._offset = max(self._offset, sum(self._fetched.pop(0)))
+        end = self._fetched[0][0] if self._fetched else self.total
+        if self._offset < self.total:
+            offset, limit = self._offset, min(self.limit, end - self._offset)
+            self._offset += limit
+            return offset, limit
+        return None
+
+    def update(self, rows, seconds, n_bytes=None):
+        """Record the measurements of a fetched page and adjust the limit.
+
+        Pages smaller than the limit have a proportionally smaller weight in
+        the averages, as their measurements per row are inflated by the fixed
+        overhead of a page, e.g. the definition of the instance.
+
+        Args:
+            rows (int): Number of rows in the page.
+            seconds (float): Latency of the page request in seconds.
+            n_bytes (int, optional): Size of the page content in bytes.
+        """
+        if rows <= 0:
+            return
+        weight = self._SMOOTHING * min(1, rows / self.limit)
+        self._bytes_per_row = self.__average(self._bytes_per_row, n_bytes, rows, weight)
+        self._seconds_per_row = self.__average(self._seconds_per_row, seconds, rows, weight)
+
+        candidates = [self.max_limit]
+        if self._bytes_per_row:
+            candidates.append(self.target_bytes / self._bytes_per_row)
+        if self._seconds_per_row:
+            candidates.append(self.target_seconds / self._seconds_per_row)
+        new_limit = min(candidates)
+        new_limit = min(max(new_limit, self.limit / self._MAX_STEP), self.limit * self._MAX_STEP)
+        self.limit = int(min(max(new_limit, self.min_limit), self.max_limit))
+
+    def shrink(self, limit, error):
+        """Halve the limit after a page of `limit` rows failed with `error`.
+
+        Args:
+            limit (int): Limit of the failed page.
+            error: Response object of the failed request or the exception
+                raised for it.
+
+        Returns:
+            True if the limit was lowered, False if the failure is not caused
+            by the page size or the limit cannot be lowered.
+        """
+        reason = self.__too_large_reason(error)
+        if reason is None or limit <= self.min_limit:
+            return False
+        new_limit = max(min(self.limit, limit // 2), self.min_limit)
+        warnings.warn(f"{reason} when fetching a page with limit {limit}, retrying with limit {new_limit}")
+        self.limit = new_limit
+        self.max_limit = max(min(self.max_limit, new_limit), self.min_limit)   # do not grow back to failing sizes
+        return True
+
+    def backoff(self, offset, error):
+        """Count a transient failure of the page at `offset`.
+
+        Args:
+            offset (int): Offset of the failed page.
+            error: Response object of the failed request or the exception
+                raised for it.
+
+        Returns:
+            Delay in seconds before the page should be fetched again, or None
+            if the failure is not transient or the page was retried
+            `max_retries` times already.
+        """
+        attempt = self._attempts.get(offset, 0) + 1
+        if not self.is_transient(error) or attempt > self.max_retries:
+            return None
+        self._attempts[offset] = attempt
+        delay = self.retry_backoff * 2 ** (attempt - 1)
+        warnings.warn(f"Fetching a page at offset {offset} failed, retrying in {delay} seconds")
+        return delay
+
+    def retry(self, offset, limit, error):
+        """Hand back a failed page to be fetched again, with a halved limit
+        if it was too big, or once a backoff has passed if the failure is
+        transient. The page is not handed out by `next_page()` before then.
+
+        Args:
+            offset (int): Offset of the failed page.
+            limit (int): Limit of the failed page.
+            error: Response object of the failed request or the exception
+                raised for it.
+
+        Returns:
+            True if the page will be handed out again, False if the failure
+            cannot be recovered by fetching the page again.
+        """
+        if self.shrink(limit, error):
+            heapq.heappush(self._retries, (offset, limit))
+            return True
+        delay = self.backoff(offset, error)
+        if delay is None:
+            return False
+        heapq.heappush(self._delayed, (time.monotonic() + delay, offset, limit))
+        return True
+
+    @classmethod
+    def is_too_large(cls, error):
+        """Check if a request failed because its page was too big.
+
+        Args:
+            error: Response object of the failed request or the exception
+                raised for it.
+        """
+        return cls.__too_large_reason(error) is not None
+
+    @staticmethod
+    def is_transient(error):
+        """Check if a request failed because of an error which may not
+        repeat, e.g. a dropped connection or an overloaded server.
+
+        Args:
+            error: Response object of the failed request or the exception
+                raised for it.
+        """
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        response = getattr(error, 'response', error)
+        return getattr(response, 'status_code', None) in TRANSIENT_STATUS_CODES
+
+    @staticmethod
+    def __too_large_reason(error):
+        # description of the failure if it is caused by the page size, otherwise None
+        if isinstance(error, MstrTimeoutError):
+            return "Timeout hit"
+        response = getattr(error, 'response', error)
+        if response is None or getattr(response, 'status_code', None) is None:
+            return None
+        if response.status_code == 413:
+            return "HTTP 413 (Payload Too Large) received"
+        if response.status_code == 504:
+            return "HTTP 504 (Gateway Timeout) received"
+        try:
+            if response.status_code >= 400 and response.json().get('iServerCode') == MSI_REQUEST_TIMEOUT:
+                return "I-Server request timeout hit"
+        except (JSONDecodeError, ValueError, AttributeError):
+            pass
+        return None
+
+    @staticmethod
+    def __average(average, value, rows, weight):
+        if value is None:
+            return average
+        value = value / rows
+        return value if average is None else weight * value + (1 - weight) * average
+
+
+def wait_completed(futures, retry_delay=None):
+    """Wait until one of `futures` completes or `retry_delay` seconds pass,
+    so that pages waiting for their backoff are submitted when they are due.
+
+    Args:
+        futures: Collection of futures of the page requests in flight.
+        retry_delay (float, optional): Seconds until the first page waiting
+            for its backoff is due, as returned by
+            `PageSizeController.retry_delay()`, or None if no page waits.
+
+    Returns:
+        Set of the completed futures, empty if the delay passed first.
+    """
+    if not futures:
+        time.sleep(retry_delay or 0)
+        return set()
+    return wait(futures, timeout=retry_delay, return_when=FIRST_COMPLETED).done
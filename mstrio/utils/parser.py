@@ -1,23 +1,67 @@
+import os
+import sys
+import tempfile
+import warnings
+
 import pandas as pd
 import numpy as np
-from itertools import chain
 
+import mstrio.config as config
 from mstrio.utils.helper import exception_handler
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.0
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is an optional dependency, required only for the Arrow output
+    pa = None
+
 
 class Parser:
     """Converts JSON-formatted cube and report data into a tabular
-    structure."""
+    structure.
+
+    Column buffers are preallocated from the total number of rows reported in
+    the paging information of the first response. Each parsed chunk is written
+    into the buffers at its own offset, so chunks may be parsed in any order.
+
+    If `categorical` is True, attribute columns are built as
+    `pandas.Categorical` directly from the attribute element indexes sent by
+    the I-Server, without materializing the element labels for every row.
+
+    If `spill_dir` is given, column buffers are memory-mapped files in that
+    directory, so the data frame is backed by disk and loaded lazily by the
+    operating system. Attribute columns are then always categorical.
+
+    Columns are typed by the data types of attribute forms and metrics in the
+    grid definition: numeric forms become `int64` or `float64` and date forms
+    `datetime64`, unless their values do not fit the type (e.g. subtotals of
+    reports). Dates are parsed with one format per column, guessed from the
+    first chunk; labels in other formats stay strings. Metrics become `float64`, or `int64` if they are integers. If
+    `downcast` is True, numeric metrics are stored as 32-bit numbers if
+    possible.
+    """
 
     AF_COL_SEP = "@"  # attribute form column label separator; commonly "@"
     chunk_size = None
     total_rows = None
+    # data types of attribute forms and metrics in the grid definition, lowercase and without underscores
+    _INTEGER_TYPES = {'integer', 'long', 'short', 'unsigned', 'biginteger', 'int64'}
+    _FLOAT_TYPES = {'real', 'double', 'float', 'numeric', 'decimal', 'bigdecimal'}
+    _DATETIME_TYPES = {'date', 'datetime', 'timestamp'}
+    _KIND_DTYPES = {'i': np.int64, 'f': np.float64, 'M': 'datetime64[ns]'}    # dtypes of typed labels by kind
+    __FORMAT_SAMPLE = 100   # labels from which the format of a date column is guessed
 
-    def __init__(self, response, parse_cube=True):
+    def __init__(self, response, parse_cube=True, categorical=False, spill_dir=None, downcast=False):
 
         self.parse_cube = parse_cube
-        # row-level metric data
-        self._metric_values_raw = []
+        self.spill_dir = spill_dir
+        self.downcast = downcast
+        # object columns can not be memory-mapped, so spilled attribute columns are categorical
+        self.categorical = categorical or spill_dir is not None
 
         # extract column headers and names
         self._metric_col_names = self.__extract_metric_col_names(response=response)
@@ -32,95 +76,361 @@ class Parser:
         # parse attribute column names including attribute form names into final column names
         self._attribute_col_names = self.__get_attribute_col_names()
 
+        # numpy kinds of attribute form and metric columns by their data types in the grid definition
+        self._attribute_col_kinds = [self.__kind(form) for row in response["definition"]["grid"]["rows"]
+                                     for form in row["forms"]]
+        self._metric_kinds = [self.__kind(metric) for metric in self.__extract_metrics(response=response)]
+        # formats of date attribute form columns by their positions, guessed from the first chunk
+        self._date_formats = {}
+
         self.__extract_paging_info(response)
 
-        # attribute data
-        self._mapped_attributes = np.zeros((0, len(self._attribute_col_names)), dtype=object)
+        # column buffers are preallocated on the first call to `parse()`
+        self._attribute_buffers = None
+        self._metric_buffers = None
+        # categories of attribute columns shared by all chunks, the position of a label is its category code
+        self._attribute_categories = [None] * len(self._attribute_col_names)
 
     def parse(self, response):
         """
         Args:
             response: JSON-formatted content of API response.
         """
-        if self.total_rows > 0:
-            # extract attribute values into numpy 2D array if attributes exist in the response
-            if self._attribute_names:
-                self._mapped_attributes = np.vstack((self._mapped_attributes, self.__map_attributes(response=response)))
+        if self._attribute_buffers is None:
+            # preallocate buffers of category codes; buffers of labels and metrics are typed by the first chunk
+            if self.categorical:
+                self._attribute_buffers = [self.__allocate(np.int32) for _ in self._attribute_col_names]
+            else:
+                self._attribute_buffers = [None] * len(self._attribute_col_names)
+            self._metric_buffers = [None] * len(self._metric_col_names)
 
-            # extract metric values if metrics exist in the response
-            if self._metric_col_names:
-                self._metric_values_raw.extend(self.__extract_metric_values(response=response))
+        if self.total_rows > 0:
+            offset = response["data"]["paging"]["offset"]
+            attribute_columns, metric_columns = self.__parse_columns(response=response, as_codes=self.categorical)
 
-    def __to_dataframe(self):
+            for i, column in enumerate(attribute_columns):
+                self.__write_column(self._attribute_buffers, i, column, offset)
 
-        # create attribute data frame, then re-map integer array with corresponding attribute element values
-        attribute_df = pd.DataFrame(
-            data=self._mapped_attributes, columns=self._attribute_col_names)
+            for i, column in enumerate(metric_columns):
+                self.__write_column(self._metric_buffers, i, column, offset)
 
-        # create metric values data frame
-        metric_df = pd.DataFrame(
-            data=self._metric_values_raw, columns=self._metric_col_names)
+    def estimate_size(self, response):
+        """Estimate the memory footprint in bytes of the data frame of all
+        rows of the cube or report, based on a single chunk.
 
-        return pd.concat([attribute_df, metric_df], axis=1)
+        Rows take the size of the column buffers. Attribute element labels are
+        extrapolated from the ratio of distinct elements to rows in the chunk.
 
-    def __map_attributes(self, response):
+        Args:
+            response: JSON-formatted content of API response.
+        """
+        rows = response["data"]["paging"]["current"]
+        if not rows:
+            return 0
+        attribute_itemsize = np.dtype(np.int32 if self.categorical else object).itemsize
+        row_bytes = attribute_itemsize * len(self._attribute_col_names)
+        label_bytes = 0
+        if self._attribute_names:
+            for table in self._create_attribute_element_map(response=response):
+                table_bytes = sum(sys.getsizeof(label) for label in table.flat)
+                label_bytes += table_bytes * max(1, len(table) / rows * self.total_rows / rows)
+        if self._metric_col_names:
+            row_bytes += sum(column.dtype.itemsize for column in self._extract_metric_columns(response=response))
+        return int(row_bytes * self.total_rows + label_bytes)
+
+    def chunk_to_dataframe(self, response):
+        """Convert a single chunk into a DataFrame without storing it in the
+        parser. The index of the DataFrame reflects the position of the rows
+        within the whole cube or report.
 
-        # def map_index(attribute_indexes, columns):
-        #     return label_map[columns][attribute_indexes]
-        label_map = self.__create_attribute_element_map(response=response)
-        row_index = self.__extract_attribute_element_row_index(response=response)
-        row_index_array = np.array(row_index)
-        _, columns = row_index_array.shape
+        Args:
+            response: JSON-formatted content of API response.
+        """
+        paging = response["data"]["paging"]
+        attribute_columns, metric_columns = self.__parse_columns(response=response)
+        index = pd.RangeIndex(paging["offset"], paging["offset"] + paging["current"])
+        return self.__build_dataframe(attribute_columns + metric_columns, index)
+
+    def __parse_columns(self, response, as_codes=False):
+        # extract attribute values if attributes exist in the response
+        attribute_columns = self.__map_attributes(response=response, as_codes=as_codes) if self._attribute_names else []
+        # extract metric values if metrics exist in the response
+        metric_columns = self._extract_metric_columns(response=response) if self._metric_col_names else []
+        return attribute_columns, metric_columns
+
+    def to_dataframes(self, tables):
+        """Build one data frame per table directly from the parsed columns,
+        without building the data frame of all columns first.
 
-        # create attribute form name to attribute form index mapping
-        vfunc = np.vectorize(lambda attribute_indexes, columns: label_map[columns][attribute_indexes])
+        Args:
+            tables (dict): Column names of every table by table name.
 
-        return vfunc(row_index_array, range(columns))
+        Returns:
+            List of data frames in order of `tables`.
+        """
+        columns = dict(zip(self.__col_names, self.__columns()))
+        shared = set()
+        dataframes = []
+        for names in tables.values():
+            # columns shared by tables (e.g. attributes) are copied, so that the tables do not alias each other
+            table_columns = [columns[name].copy() if name in shared else columns[name] for name in names]
+            shared.update(names)
+            dataframes.append(self.__build_dataframe(table_columns, self.__index, names))
+        return dataframes
 
-    def __create_attribute_element_map(self, response):
-        # creates a map of type nested list for attribute element labels. The index of the list corresponds to
-        # attribute element row index from the grid headers. The map is used later to map the integer-based grid
-        # header values to the real attribute element labels
+    def __to_dataframe(self):
+        return self.__build_dataframe(self.__columns(), self.__index)
 
-        # extract attribute form and attribute elements labels
-        rows = response["definition"]["grid"]["rows"]
-        form_values_rows = [[el['formValues'] for el in row['elements']] for row in rows]
+    @property
+    def __index(self):
+        return pd.RangeIndex(0 if self._attribute_buffers is None else self.total_rows)
+
+    def __columns(self):
+        if self._attribute_buffers is None or self.total_rows == 0:
+            return [np.empty(0, dtype=object) for _ in self.__col_names]
+        if self.categorical:
+            categories = [pd.Index([]) if c is None else c for c in self._attribute_categories]
+            attribute_columns = [pd.Categorical.from_codes(self.__compact_codes(codes, len(c)), categories=c)
+                                 for codes, c in zip(self._attribute_buffers, categories)]
+        else:
+            attribute_columns = self._attribute_buffers
+        return attribute_columns + self._metric_buffers
 
-        def replicate_form_values(form_values):
-            # replicate attribute element values for total, count, etc. to fill the lists to correct size
-            # I-Server only sends them once for attribute
-            if not self.parse_cube:
-                for i, attr in enumerate(self._attribute_elem_form_names):
+    def __build_dataframe(self, columns, index, names=None):
+        # build the frame positionally, as attribute and metric column names are not guaranteed to be unique;
+        # the frame is built on the column buffers without copying them, which also keeps memory-mapped buffers
+        df = pd.DataFrame({i: column for i, column in enumerate(columns)}, index=index, copy=False)
+        df.columns = self.__col_names if names is None else names
+        return df
 
-                    required_len = len(attr)
+    @property
+    def __col_names(self):
+        return self._attribute_col_names + self._metric_col_names
+
+    def __map_categories(self, i, labels):
+        # translate element labels of a single chunk into the codes of categories shared by all chunks, missing
+        # labels are coded as -1
+        categories = self._attribute_categories[i]
+        if categories is None:
+            # categories take the type of the labels of the first chunk
+            categories = pd.Index(pd.unique(labels[~pd.isna(labels)]))
+            self._attribute_categories[i] = categories
+        mapping = categories.get_indexer(labels)
+        new = (mapping == -1) & ~pd.isna(labels)
+        if new.any():
+            # labels seen for the first time are appended to the categories
+            categories = categories.append(pd.Index(pd.unique(labels[new])))
+            self._attribute_categories[i] = categories
+            mapping[new] = categories.get_indexer(labels[new])
+        return mapping.astype(np.int32)
+
+    def __write_column(self, buffers, i, column, offset):
+        buffer = buffers[i]
+        if buffer is None:
+            buffer = self.__allocate(column.dtype)
+        elif buffer.dtype != column.dtype:
+            # widen the buffer if a chunk brings a broader type (e.g. floats after integers, or labels which do not
+            # fit the data type of the attribute form)
+            try:
+                dtype = np.result_type(buffer.dtype, column.dtype)
+            except TypeError:
+                dtype = np.dtype(object)
+            if self.downcast and dtype == np.float64 and np.float64 not in (buffer.dtype, column.dtype):
+                # downcast integers and floats widen into 32-bit floats, not into 64-bit ones
+                dtype = np.dtype(np.float32)
+            if dtype != buffer.dtype:
+                widened = self.__allocate(dtype)
+                # numpy would turn datetimes into integers when converting them to objects, pandas keeps timestamps
+                widened[:] = pd.Series(buffer).astype(object).to_numpy() if dtype.hasobject else buffer
+                buffer = widened
+        buffer[offset:offset + len(column)] = column
+        buffers[i] = buffer
+
+    def __allocate(self, dtype):
+        # allocate a column buffer for all rows, memory-mapped to a file in the spill directory if possible
+        dtype = np.dtype(dtype)
+        if self.spill_dir is None or dtype.hasobject or self.total_rows == 0:
+            return np.empty(self.total_rows, dtype=dtype)
+        fd, path = tempfile.mkstemp(dir=self.spill_dir, suffix='.npy')
+        os.close(fd)
+        buffer = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(self.total_rows,))
+        try:
+            os.remove(path)     # the mapping keeps the data until the buffer is released
+        except OSError:         # open files can not be removed on Windows
+            pass
+        return buffer
+
+    def __compact_codes(self, codes, n_categories):
+        # pandas stores category codes in the smallest sufficient integer type and would copy memory-mapped codes
+        # of a wider type into memory, so spilled codes are narrowed into a new memory-mapped buffer instead
+        if self.spill_dir is None:
+            return codes
+        dtype = next(t for t in (np.int8, np.int16, np.int32, np.int64) if n_categories < np.iinfo(t).max)
+        if dtype == codes.dtype:
+            return codes
+        compact = self.__allocate(dtype)
+        compact[:] = codes
+        return compact
+
+    def __map_attributes(self, response, as_codes=False):
+        # map integer-based grid header values to attribute element labels, one array per attribute form column;
+        # if `as_codes`, rows are mapped to the codes of the categories shared by all chunks instead
+        element_tables = self._create_attribute_element_map(response=response)
+        row_index = self._extract_attribute_element_row_index(response=response)
+
+        columns = []
+        try:
+            for i, table in enumerate(element_tables):
+                for j in range(table.shape[1]):
+                    labels = self._typed_labels(table[:, j], len(columns))
+                    if as_codes:
+                        mapping = self.__map_categories(len(columns), labels)
+                        columns.append(np.take(mapping, row_index[:, i]))
+                    elif self.categorical:
+                        # factorize the element labels and map rows to their codes instead of the labels
+                        codes, categories = pd.factorize(labels)
+                        columns.append(pd.Categorical.from_codes(np.take(codes, row_index[:, i]), categories))
+                    else:
+                        columns.append(np.take(labels, row_index[:, i]))
+        except IndexError as e:
+            exception_handler("Missing attribute elements, please check if attribute elements IDs are valid and if "
+                              "they exist in report.", type(e))
+        return columns
+
+    def _create_attribute_element_map(self, response):
+        # creates one 2D array of attribute element labels per attribute with one column per attribute form. The
+        # row of the array corresponds to attribute element row index from the grid headers.
+        rows = response["definition"]["grid"]["rows"]
+        tables = []
+        for row, forms in zip(rows, self._attribute_elem_form_names):
+            form_values = [el['formValues'] for el in row['elements']]
+            required_len = len(forms)
+            # flat array of the form values of all elements
+            values = [value for element_values in form_values for value in element_values]
+            labels = np.empty(len(values), dtype=object)
+            labels[:] = values
+
+            if not self.parse_cube and len(values) != len(form_values) * required_len:
+                # I-Server sends values of total, count, etc. elements only once for all forms of an attribute, so
+                # the last value of such an element is repeated for its missing forms
+                lengths = np.fromiter(map(len, form_values), dtype=np.intp, count=len(form_values))
+                starts = np.cumsum(lengths) - lengths
+                positions = np.minimum(np.arange(required_len), np.maximum(lengths, 1)[:, None] - 1)
+                table = labels[starts[:, None] + positions]
+            else:
+                table = labels.reshape(len(form_values), required_len)
+            tables.append(table)
 
-                    for r in form_values[i]:
-                        if len(r) < required_len:
-                            r.extend(r * (required_len - 1))
+        return tables
 
-        def separate(form_values):
-            # format into correct list structure. This function separates the nested lists into a list of list
-            # where one element corresponds to a attribute column
-            final_list = []
+    def _extract_attribute_element_row_index(self, response):
+        # extracts the attribute element row index from the headers
+        row_index = np.asarray(response["data"]["headers"]["rows"], dtype=np.intp)
+        return row_index.reshape(-1, len(self._attribute_names))
+
+    def _typed_labels(self, labels, i):
+        # convert element labels of the i-th attribute form column to the numpy kind of its data type. If some labels
+        # do not fit it (e.g. subtotals of reports), labels stay objects and only the fitting ones are converted.
+        kind = self._attribute_col_kinds[i]
+        if kind == 'M':
+            return self.__typed_dates(labels, i)
+        try:
+            if kind == 'i':
+                typed = labels.astype(np.int64)
+                # non-integral numbers are truncated by the cast, they do not fit
+                if (labels.astype(np.float64) == typed).all():
+                    return typed
+            elif kind == 'f':
+                return labels.astype(np.float64)
+            else:
+                return labels
+        except (TypeError, ValueError, OverflowError):
+            pass
+        converted = pd.Series(pd.to_numeric(labels, errors='coerce'))
+        fits = converted.notna().to_numpy()
+        if kind == 'i':
+            fits = fits & (converted == np.floor(converted)).to_numpy()
+        converted = converted[fits].astype(np.int64) if kind == 'i' else converted[fits]
+        typed = labels.copy()
+        typed[fits] = converted.astype(object).to_numpy()
+        return typed
+
+    def __typed_dates(self, labels, i):
+        # Dates are parsed with a single format per column, guessed from the first chunk, so that all chunks are
+        # parsed alike (e.g. never day-first in one chunk and month-first in another). Labels which do not match the
+        # format stay strings, and so do all labels of a column without a recognized format.
+        if pd.api.types.infer_dtype(labels, skipna=True) != 'string':
+            return labels
+        if i not in self._date_formats:
+            strings = pd.unique(labels[[isinstance(label, str) for label in labels]])[:self.__FORMAT_SAMPLE]
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')     # pandas warns about formats with the day first
+                self._date_formats[i] = next(filter(None, map(guess_datetime_format, strings)), None)
+        if self._date_formats[i] is None:
+            return labels
+        converted = pd.Series(pd.to_datetime(labels, format=self._date_formats[i], errors='coerce'))
+        converted = converted.astype('datetime64[ns]')  # the same resolution in all chunks
+        fits = converted.notna().to_numpy()
+        if fits.sum() == (~pd.isna(labels)).sum():
+            return converted.to_numpy()
+        typed = labels.copy()
+        typed[fits] = converted[fits].astype(object).to_numpy()
+        return typed
+
+    def typed_elements(self, column, elements):
+        """Convert attribute element labels, e.g. of a filter, to the type of
+        the labels of the attribute form column named `column`."""
+        typed = self._typed_labels(np.array(elements, dtype=object), self._attribute_col_names.index(column))
+        return pd.Series(typed).tolist()    # dates as timestamps, which compare equal to timestamps in object columns
+
+    def _extract_metric_columns(self, response):
+        raw = response["data"]["metricValues"]["raw"]
+        columns = None
+        if self._metric_kinds and all(kind in ('i', 'f') for kind in self._metric_kinds):
+            # numeric metrics are converted at once, nulls become NaN
             try:
-                for attr in form_values:
-                    row = len(attr[0])
-                    col = len(attr)
-                    final_list.extend(np.array(attr).reshape(col, row).transpose().tolist())
-                return final_list
-            except IndexError as e:
-                exception_handler("Missing attribute elements, please check if attribute elements IDs are valid and if they exist in report.",
-                                  type(e))
-
-        replicate_form_values(form_values_rows)
-        ae_index_map = separate(form_values_rows)
+                values = np.array(raw, dtype=np.float64).reshape(len(raw), len(self._metric_col_names))
+            except (TypeError, ValueError):
+                pass
+            else:
+                # integers beyond 2**53 are not exact as floats, pandas keeps them as int64
+                if not any(kind == 'i' and (np.abs(values[:, i]) >= 2 ** 53).any()
+                           for i, kind in enumerate(self._metric_kinds)):
+                    columns = [self.__integral(values[:, i]) if kind == 'i' else values[:, i]
+                               for i, kind in enumerate(self._metric_kinds)]
+        if columns is None:
+            # let pandas infer the type of each metric column, as raw values may contain nulls or strings
+            raw = pd.DataFrame(raw, columns=range(len(self._metric_col_names)))
+            columns = [raw[i].to_numpy() for i in raw.columns]
+        return [self.__downcast(column) for column in columns] if self.downcast else columns
 
-        return ae_index_map
+    @staticmethod
+    def __integral(column):
+        # integer metrics without nulls and fractions are stored as integers
+        if np.isfinite(column).all() and (column == np.trunc(column)).all():
+            return column.astype(np.int64)
+        return column
 
-    def __extract_attribute_element_row_index(self, response):
-        # extracts the attribute element row index from the headers
-        return [list(chain.from_iterable([[r for _ in f] for r, f in zip(row, self._attribute_elem_form_names)]))
-                for row in response["data"]["headers"]["rows"]]
+    @staticmethod
+    def __downcast(column):
+        if column.dtype == np.float64:
+            return column.astype(np.float32)
+        elif column.dtype == np.int64 and (not len(column) or (np.iinfo(np.int32).min <= column.min()
+                                                               and column.max() <= np.iinfo(np.int32).max)):
+            return column.astype(np.int32)
+        return column
+
+    @classmethod
+    def __kind(cls, obj):
+        # numpy kind of an attribute form or a metric by its data type, None if it is unknown or not numeric
+        data_type = str(obj.get("dataType", "")).lower().replace("_", "")
+        if data_type in cls._INTEGER_TYPES:
+            return 'i'
+        elif data_type in cls._FLOAT_TYPES:
+            return 'f'
+        elif data_type in cls._DATETIME_TYPES:
+            return 'M'
+        return None
 
     def __extract_paging_info(self, response):
         # extract paging info
@@ -128,16 +438,16 @@ class Parser:
         self.total_rows = response["data"]["paging"]["total"]
 
     @staticmethod
-    def __extract_metric_values(response):
-        return response["data"]["metricValues"]["raw"]
-
-    @staticmethod
-    def __extract_metric_col_names(response):
+    def __extract_metrics(response):
         if response["definition"]["grid"]["columns"]:
-            return [i['name'] for i in response["definition"]["grid"]["columns"][-1]["elements"]]
+            return response["definition"]["grid"]["columns"][-1]["elements"]
         else:
             return []
 
+    @classmethod
+    def __extract_metric_col_names(cls, response):
+        return [i['name'] for i in cls.__extract_metrics(response)]
+
     @staticmethod
     def __extract_attribute_form_names(response):
         # extract attribute form names
@@ -164,3 +474,228 @@ class Parser:
     @property
     def dataframe(self):
         return self.__to_dataframe()
+
+
+def check_memory_budget(size):
+    """Apply `config.memory_budget_policy` if the estimated size of a data
+    frame exceeds `config.memory_budget`.
+
+    Args:
+        size (int): Estimated size of the data frame in bytes.
+
+    Returns:
+        Directory into which the data frame is spilled, or None if it fits into
+        the budget.
+
+    Raises:
+        MemoryError: If the size exceeds the budget and the policy is 'raise'.
+    """
+    if config.memory_budget is None or size <= config.memory_budget:
+        return None
+    if config.memory_budget_policy == 'spill':
+        spill_dir = config.spill_dir or tempfile.gettempdir()
+        os.makedirs(spill_dir, exist_ok=True)
+        return spill_dir
+    exception_handler("Estimated size of the data frame ({:,} bytes) exceeds the memory budget ({:,} bytes). Filter "
+                      "the data, raise `config.memory_budget` or set `config.memory_budget_policy` to 'spill'."
+                      .format(size, config.memory_budget), MemoryError)
+
+
+class ArrowParser(Parser):
+    """Converts JSON-formatted cube and report data into a `pyarrow.Table`.
+
+    Every parsed chunk is converted into a record batch. Attribute columns are
+    dictionary-encoded arrays built from the attribute element indexes and the
+    attribute element labels sent by the I-Server. Metric columns are typed
+    numeric arrays built from the raw metric values.
+    """
+
+    def __init__(self, response, parse_cube=True):
+        if pa is None:
+            exception_handler("Package 'pyarrow' is required for the Arrow output. Install it with "
+                              "`pip install mstrio-py[arrow]`.", ImportError)
+        super().__init__(response=response, parse_cube=parse_cube)
+        # record batches of parsed chunks by their offsets
+        self._batches = {}
+
+    def parse(self, response):
+        """
+        Args:
+            response: JSON-formatted content of API response.
+        """
+        self._batches[response["data"]["paging"]["offset"]] = self.chunk_to_record_batch(response=response)
+
+    def chunk_to_record_batch(self, response):
+        """Convert a single chunk into a `pyarrow.RecordBatch` without storing
+        it in the parser.
+
+        Args:
+            response: JSON-formatted content of API response.
+        """
+        columns = []
+        if self._attribute_names:
+            element_tables = self._create_attribute_element_map(response=response)
+            row_index = self._extract_attribute_element_row_index(response=response)
+            for i, table in enumerate(element_tables):
+                indices = pa.array(row_index[:, i], type=pa.int32())
+                for j in range(table.shape[1]):
+                    dictionary = self.__dictionary(table[:, j], len(columns))
+                    columns.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+        if self._metric_col_names:
+            columns.extend(pa.array(column, from_pandas=True)
+                           for column in self._extract_metric_columns(response=response))
+        return pa.RecordBatch.from_arrays(columns, names=self._attribute_col_names + self._metric_col_names)
+
+    def __dictionary(self, labels, i):
+        # Typed element labels, or strings if some labels do not fit the type (e.g. subtotals). The fitting labels
+        # are then formatted like typed labels cast to strings by Arrow, as when chunks of different types are
+        # unified, so that a column looks alike in all chunks.
+        typed = self._typed_labels(labels, i)
+        try:
+            return pa.array(typed, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        dtype = self._KIND_DTYPES.get(self._attribute_col_kinds[i])
+        fits = ~pd.isna(typed) & np.array([not isinstance(label, str) for label in typed], dtype=bool)
+        strings = np.array([None if pd.isna(label) else str(label) for label in typed], dtype=object)
+        if dtype is not None and fits.any():
+            strings[fits] = pa.array(typed[fits].astype(dtype)).cast(pa.string()).to_numpy(zero_copy_only=False)
+        return pa.array(strings, type=pa.string())
+
+    def arrow_elements(self, column, elements, type_):
+        """Return attribute element labels, e.g. of a filter, as an array of
+        the value type of the attribute form column named `column` of type
+        `type_`, e.g. to compare them with `pyarrow.compute.is_in()`."""
+        value_type = type_.value_type if pa.types.is_dictionary(type_) else type_
+        typed = self.typed_elements(column, elements)
+        dtype = self._KIND_DTYPES.get(self._attribute_col_kinds[self._attribute_col_names.index(column)])
+        try:
+            # typed labels, cast to strings like labels of columns unified to strings
+            return pa.array(np.array(typed, dtype=dtype) if dtype else typed, from_pandas=True).cast(value_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+            return pa.array([str(element) for element in elements]).cast(value_type)
+
+    def chunk_to_table(self, response):
+        """Convert a single chunk into a `pyarrow.Table` with one record batch
+        without storing it in the parser.
+
+        Args:
+            response: JSON-formatted content of API response.
+        """
+        return pa.Table.from_batches([self.chunk_to_record_batch(response=response)])
+
+    def write_parquet(self, path, tables):
+        """Write tables into a Parquet file, one row group per table, as they
+        are produced.
+
+        The schema of the file is taken from the first table. Integer metric
+        columns are stored as 64-bit integers until a later table brings
+        non-integer values. Then the columns are widened to floating point
+        numbers and the row groups written so far are rewritten. Columns with
+        nulls only in the first table are stored as floating point numbers
+        (metrics) or strings (attributes). Attribute columns of reports are
+        stored as strings, as subtotals in later tables may not fit the type of
+        the attribute form.
+
+        Args:
+            path (str): Path of the Parquet file.
+            tables: Iterable of `pyarrow.Table` objects, e.g. created with
+                `chunk_to_table()`.
+        """
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for table in tables:
+                if writer is None:
+                    schema = pa.schema(pa.field(field.name, self.__stable_type(field.type)) for field in table.schema)
+                    writer = pq.ParquetWriter(path, schema)
+                schema = self.__widen_schema(writer.schema, table)
+                if schema != writer.schema:
+                    writer.close()
+                    writer = self.__rewrite_parquet(path, schema)
+                writer.write_table(table.cast(writer.schema), row_group_size=max(1, table.num_rows))
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @staticmethod
+    def __widen_schema(schema, table):
+        # integer columns of the schema are widened to float64 if the table has non-integer values in them
+        fields = []
+        for field, column in zip(schema, table.columns):
+            if pa.types.is_integer(field.type) and not pa.types.is_integer(column.type):
+                try:
+                    column.cast(field.type)
+                except pa.ArrowInvalid:
+                    field = field.with_type(pa.float64())
+            fields.append(field)
+        return pa.schema(fields)
+
+    @staticmethod
+    def __rewrite_parquet(path, schema):
+        # rewrite the row groups of the Parquet file with the widened schema and return its open writer
+        import pyarrow.parquet as pq
+
+        written = path + ".tmp"
+        os.replace(path, written)
+        writer = pq.ParquetWriter(path, schema)
+        with pq.ParquetFile(written) as source:
+            for i in range(source.num_row_groups):
+                # dictionaries of typed labels are read back as plain arrays
+                row_group = source.read_row_group(i)
+                columns = [column.dictionary_encode() if pa.types.is_dictionary(field.type)
+                           and not pa.types.is_dictionary(column.type) else column
+                           for field, column in zip(schema, row_group.columns)]
+                row_group = pa.Table.from_arrays(columns, names=row_group.column_names)
+                writer.write_table(row_group.cast(schema), row_group_size=max(1, row_group.num_rows))
+        os.remove(written)
+        return writer
+
+    def __stable_type(self, type_):
+        if pa.types.is_dictionary(type_):
+            typed = self.parse_cube and not pa.types.is_null(type_.value_type)
+            return pa.dictionary(pa.int32(), type_.value_type if typed else pa.string())
+        elif pa.types.is_integer(type_):
+            return pa.int64()
+        elif pa.types.is_null(type_):
+            return pa.float64()
+        return type_
+
+    @classmethod
+    def unify_schema(cls, schemas):
+        """Return a schema to which record batches of all given schemas can be
+        cast. Chunks may differ in inferred types, e.g. a metric column can be
+        integer in one chunk and floating point in another."""
+        schemas = list(schemas)
+        fields = [pa.field(field.name, cls.__unify_type([schema.field(i).type for schema in schemas]))
+                  for i, field in enumerate(schemas[0])]
+        return pa.schema(fields)
+
+    @classmethod
+    def __unify_type(cls, types):
+        # columns with nulls only do not decide the type
+        types = {t for t in types if not pa.types.is_null(t)}
+        if not types:
+            return pa.null()
+        elif len(types) == 1:
+            return types.pop()
+        elif all(pa.types.is_dictionary(t) for t in types):
+            return pa.dictionary(pa.int32(), cls.__unify_type([t.value_type for t in types]))
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+            return pa.float64()
+        else:
+            return pa.string()
+
+    def __to_table(self):
+        names = self._attribute_col_names + self._metric_col_names
+        if not self._batches:
+            return pa.Table.from_arrays([pa.array([], type=pa.null()) for _ in names], names=names)
+
+        batches = [self._batches[offset] for offset in sorted(self._batches)]
+        schema = self.unify_schema(batch.schema for batch in batches)
+        return pa.concat_tables(pa.Table.from_batches([batch]).cast(schema) for batch in batches)
+
+    @property
+    def table(self):
+        return self.__to_table()
@@ -55,6 +55,8 @@ setup(name='mstrio-py',
       ],
       extras_require={
           'dev': ['flake8', 'mypy', 'yapf', 'unittest', 'coverage'],
+          'arrow': ['pyarrow'],
+          'async': ['aiohttp'],
       },
       long_description=long_description,
       long_description_content_type='text/markdown',
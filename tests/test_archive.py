@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from mstrio.utils.archive import PageArchive, iter_pages, read_archive, read_manifest
+from test_parser import EXPECTED, ROWS, page
+
+
+class TestPageArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cube.zip')
+
+    def test_round_trip(self):
+        pages = [page(ROWS[offset:offset + 2], offset, len(ROWS)) for offset in (4, 0, 2)]
+        with PageArchive(self.path, 'cube', 'C' * 32) as archive:
+            for p in pages:
+                archive.write(p)
+        manifest = read_manifest(self.path)
+        self.assertEqual((manifest['type'], manifest['total'], manifest['offsets']), ('cube', 5, [0, 2, 4]))
+        self.assertEqual([p['data']['paging']['offset'] for p in iter_pages(self.path)], [0, 2, 4])
+        pd.testing.assert_frame_equal(read_archive(self.path), EXPECTED, check_dtype=False)
+
+    def test_interrupted_archive_is_discarded(self):
+        with self.assertRaises(RuntimeError):
+            with PageArchive(self.path, 'cube', 'C' * 32) as archive:
+                archive.write(page(ROWS[:2], 0, len(ROWS)))
+                raise RuntimeError
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_empty_archive(self):
+        with PageArchive(self.path, 'report', 'R' * 32):
+            pass
+        with self.assertRaises(ValueError):
+            read_archive(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from mstrio.dataset import Dataset
+from mstrio.utils.batches import conform, open_batches
+
+cut_chunk = Dataset._Dataset__cut_chunk
+
+
+class TestOpenBatches(unittest.TestCase):
+
+    def test_data_frame(self):
+        df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+        frame, batches, rows = open_batches(df)
+        self.assertIs(frame, df)
+        self.assertEqual(rows, 2)
+        self.assertEqual(len(list(batches)), 1)
+
+    def test_batches_are_conformed_to_the_first_batch(self):
+        first = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+        second = pd.DataFrame({'b': ['z'], 'a': [3.0]})
+        frame, batches, rows = open_batches([first, second])
+        batches = list(batches)
+        self.assertIsNone(rows)
+        self.assertEqual(list(batches[1].columns), ['a', 'b'])
+        self.assertEqual(batches[1]['a'].dtype, np.int64)
+
+    def test_mismatching_batches_raise(self):
+        first = pd.DataFrame({'a': [1], 'b': ['x']})
+        for batch in (pd.DataFrame({'a': [1]}), pd.DataFrame({'a': [1], 'b': ['x'], 'c': [1]}),
+                      pd.DataFrame({'a': [np.nan], 'b': ['x']})):
+            with self.subTest(columns=list(batch.columns)), self.assertRaises(ValueError):
+                list(open_batches([first, batch])[1])
+
+    def test_schema_restricts_and_casts(self):
+        frame, batches, _ = open_batches([pd.DataFrame({'a': [1, 2], 'b': ['x', 'y'], 'c': [1, 2]})],
+                                         schema={'a': 'float64', 'b': object})
+        batch = next(batches)
+        self.assertEqual(list(batch.columns), ['a', 'b'])
+        self.assertEqual(batch['a'].dtype, np.float64)
+
+    def test_csv_is_read_in_batches(self):
+        path = os.path.join(tempfile.mkdtemp(), 'table.csv')
+        pd.DataFrame({'a': range(10), 'b': list('abcdefghij')}).to_csv(path, index=False)
+        frame, batches, _ = open_batches(path, batch_rows=4)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+
+    def test_conform_strict(self):
+        frame = pd.DataFrame({'a': pd.Series([], dtype='int64')})
+        self.assertEqual(list(conform(pd.DataFrame({'a': [1], 'b': [2]}), frame).columns), ['a'])
+        with self.assertRaises(ValueError):
+            conform(pd.DataFrame({'a': [1], 'b': [2]}), frame, strict=True)
+
+
+class TestCutChunk(unittest.TestCase):
+
+    def test_chunks_span_batches(self):
+        df = pd.DataFrame({'a': range(10)})
+        pending = deque([df.iloc[:3], df.iloc[3:4], df.iloc[4:10]])
+        chunks = [cut_chunk(pending, 4) for _ in range(3)]
+        self.assertEqual([chunk['a'].tolist() for chunk in chunks], [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertFalse(pending)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from mstrio.utils.cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_key(self):
+        self.assertEqual(ResultCache.key(id='a', body={'x': 1, 'y': 2}), ResultCache.key(body={'y': 2, 'x': 1}, id='a'))
+        self.assertNotEqual(ResultCache.key(id='a'), ResultCache.key(id='b'))
+
+    def test_round_trip(self):
+        cache = ResultCache(self.directory, max_size=2 ** 20)
+        df = pd.DataFrame({'Region': pd.Categorical(['East', 'West']), 'Units': [1, 2], 'Revenue': [1.5, None]})
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', df)
+        pd.testing.assert_frame_equal(cache.get('a'), df)
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+    def test_least_recently_used_files_are_evicted(self):
+        df = pd.DataFrame({'a': range(1000)})
+        cache = ResultCache(self.directory, max_size=2 ** 20)
+        cache.put('a', df)
+        cache.max_size = 2 * os.path.getsize(os.path.join(self.directory, 'a.arrow'))
+        cache.put('b', df)
+        os.utime(os.path.join(self.directory, 'a.arrow'), (0, 0))
+        cache.put('c', df)
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
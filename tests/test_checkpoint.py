@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from mstrio.utils.checkpoint import Checkpoint
+from test_parser import ROWS, page
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.checkpoint = Checkpoint(tempfile.mkdtemp(), 'key')
+
+    def test_round_trip(self):
+        self.assertIsNone(self.checkpoint.instance_id)
+        self.assertEqual(self.checkpoint.start('I1'), [])
+        chunks = [page(ROWS[offset:offset + 2], offset, len(ROWS)) for offset in (2, 4)]
+        for chunk in chunks:
+            self.checkpoint.save(chunk)
+        self.assertEqual(self.checkpoint.instance_id, 'I1')
+        self.assertEqual(self.checkpoint.start('I1'), [(2, 2), (4, 1)])
+        self.assertEqual(self.checkpoint.load(2, 2), chunks[0])
+
+    def test_chunks_of_another_instance_are_removed(self):
+        self.checkpoint.start('I1')
+        self.checkpoint.save(page(ROWS[:2], 0, len(ROWS)))
+        self.assertEqual(self.checkpoint.start('I2'), [])
+        self.assertEqual(self.checkpoint.instance_id, 'I2')
+
+    def test_remove(self):
+        self.checkpoint.start('I1')
+        self.checkpoint.remove()
+        self.assertFalse(os.path.exists(self.checkpoint.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
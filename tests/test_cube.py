@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from mstrio.cube import Cube
+
+concat_partitions = Cube._Cube__concat_partitions
+
+
+class TestConcatPartitions(unittest.TestCase):
+
+    def test_no_partitions(self):
+        self.assertTrue(concat_partitions([]).empty)
+
+    def test_empty_partitions_keep_columns(self):
+        empty = pd.DataFrame({'Region': pd.Series([], dtype=object), 'Revenue': pd.Series([], dtype=float)})
+        result = concat_partitions([empty, empty])
+        self.assertEqual(list(result.columns), ['Region', 'Revenue'])
+        self.assertEqual(len(result), 0)
+
+    def test_rows_are_concatenated_in_order(self):
+        first = pd.DataFrame({'Region': ['a', 'b'], 'Revenue': [1.0, 2.0]})
+        second = pd.DataFrame({'Region': ['c'], 'Revenue': [3.0]})
+        empty = first.iloc[:0]
+        result = concat_partitions([first, empty, second])
+        pd.testing.assert_frame_equal(result, pd.DataFrame({'Region': ['a', 'b', 'c'], 'Revenue': [1.0, 2.0, 3.0]}))
+
+    def test_duplicate_column_names(self):
+        first = pd.DataFrame([[1, 2]], columns=['x', 'x'])
+        second = pd.DataFrame([[3, 4]], columns=['x', 'x'])
+        result = concat_partitions([first, second])
+        self.assertEqual(list(result.columns), ['x', 'x'])
+        np.testing.assert_array_equal(result.values, [[1, 2], [3, 4]])
+
+    def test_categories_are_merged(self):
+        first = pd.DataFrame({'Year': pd.Categorical([2020, 2021])})
+        second = pd.DataFrame({'Year': pd.Categorical(['Total'])})
+        result = concat_partitions([first, second])
+        self.assertIsInstance(result['Year'].dtype, pd.CategoricalDtype)
+        self.assertEqual(result['Year'].tolist(), [2020, 2021, 'Total'])
+
+
+if __name__ == '__main__':
+    unittest.main()
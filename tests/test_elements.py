@@ -0,0 +1,37 @@
+import unittest
+
+from mstrio.utils.elements import ElementCache
+
+
+class TestElementCache(unittest.TestCase):
+
+    def test_get_and_put(self):
+        cache = ElementCache(max_elements=10)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', [1, 2])
+        self.assertEqual(cache.get('a'), [1, 2])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ElementCache(max_elements=5)
+        cache.put('a', [1, 2])
+        cache.put('b', [3, 4])
+        cache.get('a')
+        cache.put('c', [5, 6])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), [1, 2])
+        self.assertEqual(cache.get('c'), [5, 6])
+
+    def test_entries_bigger_than_the_cache_are_not_stored(self):
+        cache = ElementCache(max_elements=2)
+        cache.put('a', [1, 2, 3])
+        self.assertIsNone(cache.get('a'))
+
+    def test_clear(self):
+        cache = ElementCache(max_elements=5)
+        cache.put('a', [1])
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import unittest
+from base64 import b64decode
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from mstrio.utils.encoder import Encoder, FastEncoder
+
+
+def decode(encoder):
+    return json.loads(b64decode(encoder.encode).decode('utf-8'))
+
+
+def mixed_data_frame():
+    return pd.DataFrame({
+        'int': [1, -2, 2 ** 40],
+        'nullable_int': pd.array([1, None, 3], dtype='Int64'),
+        'float': [0.1, np.nan, 1e300],
+        'float32': np.array([0.5, 1.25, np.inf], dtype=np.float32),
+        'bool': [True, False, True],
+        'str': ['a', 'quote " and \\ back\nslash', None],
+        'unicode': ['zażółć', '日本', ''],
+        'category': pd.Categorical(['x', 'y', 'x']),
+        'date': pd.to_datetime(['2020-01-02', '2021-03-04 05:06:07.891', None], format='ISO8601'),
+        'date_tz': pd.to_datetime(['2020-01-02 03:04:05'] * 3).tz_localize('Europe/Warsaw'),
+        'object': [{'a': 1}, [1, 2], None],
+    })
+
+
+class TestFastEncoder(unittest.TestCase):
+
+    def assertJsonEqual(self, first, second):
+        # floats of `Encoder` are rounded to 10 significant digits
+        if isinstance(first, float) and isinstance(second, (int, float)):
+            self.assertAlmostEqual(first, second, delta=abs(second) * 1e-9)
+        elif isinstance(first, list):
+            self.assertEqual(len(first), len(second))
+            for a, b in zip(first, second):
+                self.assertJsonEqual(a, b)
+        elif isinstance(first, dict):
+            self.assertEqual(list(first), list(second))
+            for key in first:
+                self.assertJsonEqual(first[key], second[key])
+        else:
+            self.assertEqual(first, second)
+
+    def check(self, df):
+        for dataset_type in ('single', 'multi'):
+            with self.subTest(dataset_type=dataset_type):
+                self.assertJsonEqual(decode(FastEncoder(df, dataset_type)), decode(Encoder(df, dataset_type)))
+
+    def test_mixed_dtypes(self):
+        self.check(mixed_data_frame())
+
+    def test_arrow_strings(self):
+        self.check(pd.DataFrame({'str': pd.array(['a', None, '"b"'], dtype='string[pyarrow]')}))
+
+    def test_empty(self):
+        self.check(pd.DataFrame({'a': pd.Series([], dtype=float)}))
+
+    def test_blocks(self):
+        df = pd.DataFrame({'a': range(100), 'b': ['x' * (i % 7) for i in range(100)]})
+        with mock.patch.object(FastEncoder, '_FastEncoder__BLOCK_SIZE', 3):
+            self.check(df)
+        for rows in range(1, 5):
+            with self.subTest(rows=rows):
+                encoded = FastEncoder(df.iloc[:rows], 'multi').encode
+                self.assertEqual(encoded, Encoder(df.iloc[:rows], 'multi').encode)
+
+    def test_invalid_dataset_type(self):
+        with self.assertRaises(ValueError):
+            FastEncoder(pd.DataFrame({'a': [1]}), 'double')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from mstrio.utils.expression import Column, Expression
+from mstrio.utils.filter import Filter
+
+REVENUE = {"type": "metric", "id": "D" * 32}
+REGION = {"type": "form", "attribute": {"id": "A" * 32}, "form": {"id": "F1"}}
+
+
+def constant(value, data_type="Real"):
+    return {"type": "constant", "dataType": data_type, "value": value}
+
+
+class TestExpression(unittest.TestCase):
+
+    def setUp(self):
+        self.revenue = Column("Revenue", REVENUE)
+        self.region = Column("Region", REGION)
+
+    def test_comparisons(self):
+        for expression, operator in ((self.revenue == 5, "Equals"), (self.revenue != 5, "NotEquals"),
+                                     (self.revenue > 5, "Greater"), (self.revenue >= 5, "GreaterEqual"),
+                                     (self.revenue < 5, "Less"), (self.revenue <= 5, "LessEqual")):
+            with self.subTest(operator=operator):
+                self.assertEqual(expression.to_dict(), {"operator": operator, "operands": [REVENUE, constant("5")]})
+        self.assertEqual((self.region == "East").to_dict(),
+                         {"operator": "Equals", "operands": [REGION, constant("East", "Char")]})
+
+    def test_isin_and_between(self):
+        self.assertEqual(self.region.isin(["East", "West"]).to_dict(),
+                         {"operator": "In", "operands": [REGION, {"type": "constants", "dataType": "Char",
+                                                                  "values": ["East", "West"]}]})
+        self.assertEqual(self.revenue.between(1, 2.5).to_dict(),
+                         {"operator": "Between", "operands": [REVENUE, constant("1"), constant("2.5")]})
+        with self.assertRaises(ValueError):
+            self.region.isin([])
+
+    def test_logical_operators_are_flattened(self):
+        expression = (self.revenue > 1) & (self.revenue < 2) & ~(self.region == "East")
+        self.assertEqual(expression.to_dict(), {"operator": "And", "operands": [
+            (self.revenue > 1).to_dict(), (self.revenue < 2).to_dict(),
+            {"operator": "Not", "operands": [(self.region == "East").to_dict()]}]})
+        self.assertEqual(len(((self.revenue > 1) | (self.revenue < 0) | (self.revenue == 5)).operands), 3)
+
+    def test_invalid_use(self):
+        with self.assertRaises(TypeError):
+            (self.revenue > True).to_dict()
+        with self.assertRaises(TypeError):
+            (self.revenue > None).to_dict()
+        with self.assertRaises(TypeError):
+            (self.revenue > 1) & True
+        with self.assertRaises(TypeError):
+            bool(self.revenue > 1)
+
+    def test_incomplete_expressions_can_not_be_constructed(self):
+
+        class Incomplete(Expression):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestFilterColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.filter = Filter(attributes=[{"id": "A" * 32, "name": "Region"}, {"id": "B" * 32, "name": "City"}],
+                             metrics=[{"id": "D" * 32, "name": "Revenue"}],
+                             attribute_forms={"A" * 32: [{"id": "F1", "name": "DESC"}, {"id": "F0", "name": "ID"}],
+                                              "B" * 32: [{"id": "F2", "name": "ID"}, {"id": "F3", "name": "DESC"}]})
+
+    def test_column(self):
+        self.assertEqual(self.filter._column("Revenue").operand, REVENUE)
+        self.assertEqual(self.filter._column("Region").operand, REGION)
+        self.assertEqual(self.filter._column("City@ID").operand,
+                         {"type": "form", "attribute": {"id": "B" * 32}, "form": {"id": "F2"}})
+        for name in ("Country", "City@Name"):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                self.filter._column(name)
+
+    def test_view_filter(self):
+        self.assertNotIn("viewFilter", self.filter._filter_body())
+        self.filter.expression = self.filter._column("Revenue") > 5
+        self.assertEqual(self.filter._filter_body()["viewFilter"],
+                         {"operator": "Greater", "operands": [REVENUE, constant("5")]})
+
+    def test_select_columns(self):
+        self.filter._select_columns(["City@DESC", "Revenue", "City@ID", "Region"])
+        self.assertEqual(self.filter._requested_objects(),
+                         {"attributes": [{"id": "B" * 32, "forms": [{"id": "F3"}, {"id": "F2"}]},
+                                         {"id": "A" * 32, "forms": []}],
+                          "metrics": [{"id": "D" * 32}]})
+        with self.assertRaises(ValueError):
+            self.filter._select_columns(["City@Name"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import time
+import unittest
+from types import SimpleNamespace
+
+from mstrio.api.exceptions import MstrTimeoutError
+from mstrio.utils.paging import PageSizeController
+
+
+def response(status_code, body=None):
+    return SimpleNamespace(status_code=status_code, json=lambda: body or {})
+
+
+class TestPageSizeController(unittest.TestCase):
+
+    def test_pages_cover_total(self):
+        pages = PageSizeController.fixed(1050, 50, 200)
+        self.assertEqual(list(iter(pages.next_page, None)),
+                         [(50, 200), (250, 200), (450, 200), (650, 200), (850, 200)])
+
+    def test_fetched_pages_are_skipped(self):
+        pages = PageSizeController.fixed(1000, 0, 300, fetched=[(300, 300)])
+        self.assertEqual(list(iter(pages.next_page, None)), [(0, 300), (600, 300), (900, 100)])
+        self.assertEqual(pages.skipped, 300)
+
+    def test_limit_follows_target_bytes(self):
+        pages = PageSizeController(100000, 0, 1000, min_limit=10, max_limit=100000, target_bytes=10000,
+                                   target_seconds=float('inf'))
+        for _ in range(10):
+            offset, limit = pages.next_page()
+            pages.update(limit, 0.1, limit * 100)
+        self.assertEqual(pages.limit, 100)
+
+    def test_limit_changes_at_most_twice_per_page(self):
+        pages = PageSizeController(100000, 0, 1000, min_limit=10, max_limit=100000, target_bytes=10 ** 9,
+                                   target_seconds=float('inf'), bytes_per_row=1)
+        pages.update(1000, 0.1, 1000)
+        self.assertEqual(pages.limit, 2000)
+
+    def test_shrink_on_too_large_pages(self):
+        pages = PageSizeController(10000, 0, 1000, min_limit=100)
+        for error in (MstrTimeoutError({}), response(413), response(504),
+                      response(500, {'iServerCode': -2147206497})):
+            with self.subTest(error=error), self.assertWarns(UserWarning):
+                pages.limit = pages.max_limit = 1000
+                self.assertTrue(pages.shrink(1000, error))
+                self.assertEqual(pages.limit, 500)
+        self.assertFalse(pages.shrink(1000, response(500)))
+        pages.limit = 100
+        self.assertFalse(pages.shrink(100, response(504)))
+
+    def test_shrink_names_the_condition(self):
+        pages = PageSizeController(10000, 0, 1000, min_limit=100)
+        with self.assertWarnsRegex(UserWarning, "413"):
+            pages.shrink(1000, response(413))
+
+    def test_retried_page_is_split_in_balanced_parts(self):
+        pages = PageSizeController(10000, 0, 2655, min_limit=10)
+        offset, limit = pages.next_page()
+        with self.assertWarns(UserWarning):
+            self.assertTrue(pages.retry(offset, limit, response(504)))
+        self.assertEqual(pages.limit, 1327)
+        self.assertEqual([pages.next_page(), pages.next_page()], [(0, 1328), (1328, 1327)])
+
+    def test_small_page_does_not_collapse_limit(self):
+        pages = PageSizeController(100000, 0, 1000, min_limit=10, max_limit=1000, target_bytes=100000,
+                                   target_seconds=float('inf'))
+        pages.update(1000, 0.1, 50000)
+        self.assertEqual(pages.limit, 1000)
+        # a single row page consists mostly of the fixed overhead of a page
+        pages.update(1, 0.1, 20000)
+        self.assertGreater(pages.limit, 900)
+
+    def test_transient_errors_are_retried_after_backoff(self):
+        pages = PageSizeController(300, 0, 100, max_retries=2, retry_backoff=0.05)
+        page = pages.next_page()
+        with self.assertWarns(UserWarning):
+            self.assertTrue(pages.retry(*page, response(503)))
+        # the failed page is not handed out before its backoff passed, other pages are
+        self.assertEqual(pages.next_page(), (100, 100))
+        self.assertGreater(pages.retry_delay(), 0)
+        self.assertEqual(pages.next_page(), (200, 100))
+        self.assertIsNone(pages.next_page())
+        start = time.monotonic()
+        self.assertEqual(pages.next_page(block=True), page)
+        self.assertGreaterEqual(time.monotonic() - start, 0.03)
+        self.assertIsNone(pages.retry_delay())
+
+    def test_retries_are_limited(self):
+        pages = PageSizeController(100, 0, 100, max_retries=1, retry_backoff=0)
+        page = pages.next_page()
+        with self.assertWarns(UserWarning):
+            self.assertTrue(pages.retry(*page, response(502)))
+        self.assertEqual(pages.next_page(block=True), page)
+        self.assertFalse(pages.retry(*page, response(502)))
+
+    def test_permanent_errors_are_not_retried(self):
+        pages = PageSizeController(100, 0, 100)
+        self.assertFalse(pages.retry(0, 100, response(404)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from mstrio.utils.parser import ArrowParser, Parser
+
+ATTRIBUTES = [
+    {"name": "Region", "id": "A" * 32, "forms": [{"id": "F1", "name": "DESC", "dataType": "Char"}]},
+    {"name": "City", "id": "B" * 32, "forms": [{"id": "F2", "name": "ID", "dataType": "Integer"},
+                                              {"id": "F3", "name": "DESC", "dataType": "Char"}]},
+]
+METRICS = [{"name": "Revenue", "id": "D" * 32, "dataType": "double"},
+           {"name": "Units", "id": "E" * 32, "dataType": "integer"}]
+
+
+def page(rows, offset, total):
+    # JSON content of a cube instance page with `rows` of (region, city id, revenue, units)
+    regions = list(dict.fromkeys(row[0] for row in rows))
+    cities = list(dict.fromkeys(row[1] for row in rows))
+    elements = [[{"formValues": [region]} for region in regions],
+                [{"formValues": [city, "City " + city]} for city in cities]]
+    return {"instanceId": "I",
+            "definition": {"grid": {"rows": [dict(attribute, type="attribute", elements=els)
+                                             for attribute, els in zip(ATTRIBUTES, elements)],
+                                    "columns": [{"name": "Metrics", "type": "templateMetrics",
+                                                 "elements": METRICS}]}},
+            "data": {"paging": {"total": total, "current": len(rows), "offset": offset, "limit": len(rows)},
+                     "headers": {"rows": [[regions.index(row[0]), cities.index(row[1])] for row in rows]},
+                     "metricValues": {"raw": [[row[2], row[3]] for row in rows]}}}
+
+
+ROWS = [("East", "1", 1.5, 3), ("West", "2", 2.5, 4), ("East", "3", 3.5, 5),
+        ("North", "2", 4.5, 6), ("West", "1", 5.5, 7)]
+EXPECTED = pd.DataFrame({"Region": [row[0] for row in ROWS],
+                         "City@ID": [int(row[1]) for row in ROWS],
+                         "City@DESC": ["City " + row[1] for row in ROWS],
+                         "Revenue": [row[2] for row in ROWS],
+                         "Units": [row[3] for row in ROWS]})
+
+
+class TestParser(unittest.TestCase):
+
+    def parse(self, chunks, **kwargs):
+        first = page(ROWS[:chunks[0]], 0, len(ROWS))
+        parser = Parser(response=first, parse_cube=True, **kwargs)
+        offset = 0
+        for rows in chunks:
+            parser.parse(response=page(ROWS[offset:offset + rows], offset, len(ROWS)))
+            offset += rows
+        return parser.dataframe
+
+    def test_chunks_are_parsed_like_a_single_page(self):
+        pd.testing.assert_frame_equal(self.parse([5]), EXPECTED, check_dtype=False)
+        pd.testing.assert_frame_equal(self.parse([2, 2, 1]), self.parse([5]))
+
+    def test_columns_are_typed_by_data_types(self):
+        df = self.parse([3, 2])
+        self.assertEqual(df["City@ID"].dtype, np.int64)
+        self.assertEqual(df["Revenue"].dtype, np.float64)
+
+    def test_categorical(self):
+        df = self.parse([3, 2], categorical=True)
+        self.assertIsInstance(df["Region"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["Region"].tolist(), EXPECTED["Region"].tolist())
+
+    def test_big_integers_are_exact(self):
+        response = page([("East", "1", 1.5, 2 ** 53 + 1), ("West", "2", 2.5, 1)], 0, 2)
+        parser = Parser(response=response, parse_cube=True)
+        parser.parse(response=response)
+        self.assertEqual(parser.dataframe["Units"].tolist(), [2 ** 53 + 1, 1])
+
+    def test_downcast(self):
+        df = self.parse([3, 2], downcast=True)
+        self.assertEqual(df["Revenue"].dtype, np.float32)
+        np.testing.assert_allclose(df["Revenue"], EXPECTED["Revenue"])
+
+
+class TestTypedLabels(unittest.TestCase):
+
+    def typed(self, labels):
+        parser = Parser(response=page(ROWS, 0, len(ROWS)), parse_cube=True)
+        return parser._typed_labels(np.array(labels, dtype=object), 1)
+
+    def test_integral_labels_are_cast(self):
+        typed = self.typed(["1", "2"])
+        self.assertEqual(typed.dtype, np.int64)
+
+    def test_non_integral_labels_are_not_truncated(self):
+        self.assertEqual(self.typed(["1", "1.5", "Total"]).tolist(), [1, "1.5", "Total"])
+        self.assertEqual(self.typed([1.0, 1.5]).tolist(), [1, 1.5])
+
+
+class TestWriteParquet(unittest.TestCase):
+
+    def write(self, rows):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'cube.parquet')
+        parser = ArrowParser(response=page(rows[:3], 0, len(rows)), parse_cube=True)
+        parser.write_parquet(path, [parser.chunk_to_table(page(rows[offset:offset + 3], offset, len(rows)))
+                                    for offset in range(0, len(rows), 3)])
+        return pq.ParquetFile(path)
+
+    def test_integer_metrics_are_stored_as_integers(self):
+        rows = ROWS[:4] + [("West", "1", 5.5, 2 ** 53 + 1)]
+        file = self.write(rows)
+        self.assertEqual(file.schema_arrow.field("Units").type, pa.int64())
+        self.assertEqual(file.read().column("Units").to_pylist(), [row[3] for row in rows])
+
+    def test_integer_metrics_are_widened_for_non_integer_values(self):
+        rows = ROWS[:3] + [("North", "2", 4.5, 6.0), ("West", "1", 5.5, 7.5), ("East", "3", 6.5, 8)]
+        file = self.write(rows)
+        self.assertEqual(file.num_row_groups, 2)
+        self.assertEqual(file.schema_arrow.field("Units").type, pa.float64())
+        self.assertEqual(file.read().column("Units").to_pylist(), [row[3] for row in rows])
+        self.assertEqual(file.read().column("Region").to_pylist(), [row[0] for row in rows])
+        self.assertEqual(os.listdir(self.directory), ['cube.parquet'])
+
+
+
+if __name__ == '__main__':
+    unittest.main()